@@ -0,0 +1,368 @@
+# Benchmark harness for the search algorithms on synthetic graphs.
+#
+# For every graph family (see graph_generators.py) and size it times
+# Graph.dfs, bfs, greedy_search and a_star_search and the lab2 variants on
+# the same random start/goal pairs, taken from the largest connected
+# component. Per algorithm it reports:
+#  - wall time per query (mean, median, max), without a tracer
+#  - expansions per query, from a second run with a CountingTracer (of the
+#    lab2 functions only a_star and greedy of lab2_codev1/2 and
+#    lab2_codev3.greedy take a tracer, the others are left empty); greedy
+#    searches also get their expansions relative to a_star_search on the
+#    same queries, to pick the cheaper engine when the path need not be the
+#    shortest
+#  - peak memory of a query, from a third run under tracemalloc
+#  - found paths and their mean cost
+# Heuristic tables (straight line distance, manhattan distance on grids,
+# hop count on scale-free graphs) are built before the clock starts.
+#
+# The lab2 dfs/bfs copy the whole path on every push and lab2_codev1/2 do
+# not remember visited vertices, so they are exponential on larger graphs:
+# the lab2 variants only run up to --lab2-limit vertices and every query
+# runs under a --timeout (Unix only); after a timeout the algorithm is
+# skipped for the larger sizes of that family.
+#
+# Results are written as JSON with --output; --compare reads such a file
+# and reports algorithms that got slower than --tolerance allows (exit
+# status 1), so two versions can be checked against each other:
+#
+#   python benchmark.py --output before.json
+#   python benchmark.py --compare before.json
+#
+# usage: python benchmark.py [--families geometric,grid,scale_free,railway]
+#   [--sizes 1000,10000] [--queries 20] [--seed 0] [--timeout 5]
+#   [--lab2-limit 1000] [--output results.json] [--compare baseline.json]
+#   [--tolerance 0.25]
+import argparse
+import contextlib
+import json
+import math
+import platform
+import random
+import signal
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from pathfinding import lab2_codev1, lab2_codev2, lab2_codev3
+from pathfinding.graph_generators import (adjacency_lists, grid_graph, railway_graph, random_geometric_graph,
+                                          scale_free_graph)
+from pathfinding.tracer import CountingTracer
+
+FORMAT_VERSION = 1
+
+
+class Timeout(Exception):
+    pass
+
+
+# a family builds (graph, points, grid) for about `size` vertices
+def _geometric(size, seed):
+    graph, points = random_geometric_graph(size, seed)
+    return graph, points, None
+
+
+def _grid(size, seed):
+    side = max(2, round(math.sqrt(size / 0.8)))
+    graph, grid = grid_graph(size=side, density=0.2, seed=seed)
+    return graph, None, grid
+
+
+def _scale_free(size, seed):
+    graph, points = scale_free_graph(size, seed=seed)
+    return graph, points, None
+
+
+def _railway(size, seed):
+    graph, points = railway_graph(size, seed)
+    return graph, points, None
+
+
+FAMILIES = {
+    "geometric": _geometric,
+    "grid": _grid,
+    "scale_free": _scale_free,
+    "railway": _railway,
+}
+
+
+def _hop_counts(graph, goal):
+    hops = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        vertex = queue.popleft()
+        for neighbor in graph.vertices[vertex]:
+            if neighbor not in hops:
+                hops[neighbor] = hops[vertex] + 1
+                queue.append(neighbor)
+    return hops
+
+
+def _heuristic(graph, points, grid, goal):
+    if grid is not None:
+        return {(r, c): abs(r - goal[0]) + abs(c - goal[1]) for r, c in graph.vertices}
+    if points is not None:
+        return {vertex: math.dist(point, points[goal]) for vertex, point in points.items()}
+    # every edge costs at least 1
+    hops = _hop_counts(graph, goal)
+    return {vertex: hops.get(vertex, 0) for vertex in graph.vertices}
+
+
+def _largest_component(graph):
+    best = []
+    seen = set()
+    for vertex in graph.vertices:
+        if vertex in seen:
+            continue
+        component = [vertex]
+        seen.add(vertex)
+        for current in component:
+            for neighbor in graph.vertices[current]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    component.append(neighbor)
+        if len(component) > len(best):
+            best = component
+    return best
+
+
+# name -> (search(graph, lists, grid, start, goal, heuristic, tracer), takes
+# a tracer, runs on grids only)
+def _algorithms():
+    algorithms = {
+        "dfs": (lambda g, lists, grid, s, t, h, tracer: g.dfs(s, t, tracer=tracer), True, False),
+        "bfs": (lambda g, lists, grid, s, t, h, tracer: g.bfs(s, t, tracer=tracer), True, False),
+        "greedy_search": (lambda g, lists, grid, s, t, h, tracer: g.greedy_search(s, t, h, tracer=tracer),
+                          True, False),
+        "a_star_search": (lambda g, lists, grid, s, t, h, tracer: g.a_star_search(s, t, h, tracer=tracer),
+                          True, False),
+    }
+    for module in (lab2_codev1, lab2_codev2):
+        prefix = module.__name__.rpartition(".")[2] + "."
+        for name in ("dfs", "bfs"):
+            algorithms[prefix + name] = (
+                lambda g, lists, grid, s, t, h, tracer, search=getattr(module, name): search(lists, s, t),
+                False, False)
+        algorithms[prefix + "a_star"] = (
+            lambda g, lists, grid, s, t, h, tracer, search=module.a_star: search(lists, s, t, h, tracer),
+            True, False)
+        algorithms[prefix + "greedy"] = (
+            lambda g, lists, grid, s, t, h, tracer, search=module.greedy: search(lists, s, t, h, tracer),
+            True, False)
+    for name in ("dfs", "bfs", "a_star"):
+        algorithms["lab2_codev3." + name] = (
+            lambda g, lists, grid, s, t, h, tracer, search=getattr(lab2_codev3, name): search(grid, s, t),
+            False, True)
+    algorithms["lab2_codev3.greedy"] = (
+        lambda g, lists, grid, s, t, h, tracer: lab2_codev3.greedy(grid, s, t, h, tracer), True, True)
+    return algorithms
+
+
+def _is_greedy(name):
+    return name.endswith("greedy") or name.endswith("greedy_search")
+
+
+# expansions of the greedy searches relative to a_star_search on one graph
+def _compare_greedy(records, log):
+    a_star = next((r for r in records if r["algorithm"] == "a_star_search" and r.get("expansions")), None)
+    if a_star is None:
+        return
+    ratios = []
+    for record in records:
+        if _is_greedy(record["algorithm"]) and record.get("expansions") is not None:
+            record["expansions_vs_a_star"] = record["expansions"] / a_star["expansions"]
+            ratios.append("%s x%.3f" % (record["algorithm"], record["expansions_vs_a_star"]))
+    if ratios:
+        log("  greedy expansions vs A*: " + ", ".join(ratios))
+
+
+def _is_lab2(name):
+    return name.startswith("lab2_")
+
+
+@contextlib.contextmanager
+def _time_limit(seconds):
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def expired(signum, frame):
+        raise Timeout()
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _cost(graph, result):
+    if result is None:
+        return None
+    if isinstance(result, tuple):
+        return result[1]
+    return sum(graph.vertices[a][b] for a, b in zip(result, result[1:]))
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(search, takes_tracer, graph, lists, grid, queries, timeout):
+    record = {}
+    times = []
+    costs = []
+    for start_vertex, goal_vertex, heuristic in queries:
+        with _time_limit(timeout):
+            start = time.perf_counter()
+            result = search(graph, lists, grid, start_vertex, goal_vertex, heuristic, None)
+            times.append(time.perf_counter() - start)
+        cost = _cost(graph, result)
+        if cost is not None:
+            costs.append(cost)
+    record["mean_ms"] = sum(times) / len(times) * 1e3
+    record["p50_ms"] = _percentile(times, 0.5) * 1e3
+    record["max_ms"] = max(times) * 1e3
+    record["found"] = len(costs)
+    record["mean_cost"] = sum(costs) / len(costs) if costs else None
+
+    record["expansions"] = None
+    if takes_tracer:
+        expansions = 0
+        for start_vertex, goal_vertex, heuristic in queries:
+            tracer = CountingTracer()
+            search(graph, lists, grid, start_vertex, goal_vertex, heuristic, tracer)
+            expansions += tracer.expansions
+        record["expansions"] = expansions / len(queries)
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for start_vertex, goal_vertex, heuristic in queries:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            search(graph, lists, grid, start_vertex, goal_vertex, heuristic, None)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    record["peak_kib"] = peak / 1024
+    return record
+
+
+def run(families, sizes, queries, seed=0, timeout=5, lab2_limit=1000, log=print):
+    algorithms = _algorithms()
+    results = []
+    for family in families:
+        skipped = set()
+        for size in sizes:
+            graph, points, grid = FAMILIES[family](size, seed)
+            vertices = len(graph.vertices)
+            edges = sum(len(neighbors) for neighbors in graph.vertices.values()) // 2
+            lists = adjacency_lists(graph)
+            component = _largest_component(graph)
+            rng = random.Random(seed + 1)
+            pairs = [tuple(rng.sample(component, 2)) for _ in range(queries)]
+            cases = [(s, t, _heuristic(graph, points, grid, t)) for s, t in pairs]
+            log("%s: %d vertices, %d edges" % (family, vertices, edges))
+
+            records = []
+            for name, (search, takes_tracer, grid_only) in algorithms.items():
+                if grid_only and grid is None:
+                    continue
+                if name in skipped or (_is_lab2(name) and vertices > lab2_limit):
+                    continue
+                record = {"family": family, "size": size, "vertices": vertices, "edges": edges,
+                          "algorithm": name, "queries": queries}
+                try:
+                    record.update(measure(search, takes_tracer, graph, lists, grid, cases, timeout))
+                except Timeout:
+                    skipped.add(name)
+                    record["timeout"] = timeout
+                    log("  %-24s timed out after %ss" % (name, timeout))
+                    records.append(record)
+                    continue
+                records.append(record)
+                log("  %-24s %10.3f ms %12s expansions %10.1f KiB" % (
+                    name, record["mean_ms"],
+                    "-" if record["expansions"] is None else "%.1f" % record["expansions"],
+                    record["peak_kib"]))
+            _compare_greedy(records, log)
+            results.extend(records)
+    return results
+
+
+def report(results, settings):
+    return {
+        "format": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results,
+    }
+
+
+# Regressions of `results` against a baseline report: mean time more than
+# `tolerance` slower, a timeout that used to finish, or more expansions
+# (expansion counts are deterministic).
+def compare(results, baseline, tolerance=0.25):
+    previous = {(r["family"], r["size"], r["algorithm"]): r for r in baseline["results"]}
+    regressions = []
+    for record in results:
+        old = previous.get((record["family"], record["size"], record["algorithm"]))
+        if old is None or "mean_ms" not in old:
+            continue
+        label = "%s/%d %s" % (record["family"], record["size"], record["algorithm"])
+        if "mean_ms" not in record:
+            regressions.append("%s: timed out, took %.3f ms before" % (label, old["mean_ms"]))
+            continue
+        ratio = record["mean_ms"] / old["mean_ms"] if old["mean_ms"] else 1.0
+        if ratio > 1 + tolerance:
+            regressions.append("%s: %.3f ms -> %.3f ms (x%.2f)" % (label, old["mean_ms"], record["mean_ms"], ratio))
+        if (old.get("expansions") is not None and record.get("expansions") is not None
+                and record["expansions"] > old["expansions"]):
+            regressions.append("%s: %.1f -> %.1f expansions" % (label, old["expansions"], record["expansions"]))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms on synthetic graphs.")
+    parser.add_argument("--families", default=",".join(FAMILIES))
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=5)
+    parser.add_argument("--lab2-limit", type=int, default=1000)
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    options = parser.parse_args(arguments)
+
+    families = options.families.split(",")
+    for family in families:
+        if family not in FAMILIES:
+            parser.error("unknown family %r" % family)
+    sizes = [int(size) for size in options.sizes.split(",")]
+    settings = {"families": families, "sizes": sizes, "queries": options.queries, "seed": options.seed,
+                "timeout": options.timeout, "lab2_limit": options.lab2_limit}
+    results = run(families, sizes, options.queries, options.seed, options.timeout, options.lab2_limit)
+
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(report(results, settings), file, indent=2)
+    if options.compare:
+        with open(options.compare) as file:
+            regressions = compare(results, json.load(file), options.tolerance)
+        for regression in regressions:
+            print("regression: " + regression)
+        if regressions:
+            return 1
+        print("no regressions against %s" % options.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# Trading optimality for latency: Graph.a_star_search against
+# weighted_a_star_search and budgeted_a_star_search (ARA*) in dorian.py.
+#
+# Random geometric graph of `n` vertices, edge cost = euclidean length, the
+# heuristic is the straight-line distance to the goal (admissible). For
+# random start/goal pairs each mode reports the p50 and p99 latency, the
+# expansions per query and the path cost over the optimal one (mean and
+# worst); budgeted searches also how many queries got a path within the
+# budget and their mean proven bound.
+#
+# usage: python benchmark_anytime.py [n] [queries]
+import math
+import random
+import sys
+import time
+
+from pathfinding.graph_generators import random_geometric_graph
+from pathfinding.tracer import CountingTracer
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main(n=100000, queries=50):
+    graph, points = random_geometric_graph(n, seed=1)
+    rng = random.Random(0)
+    vertices = list(graph.vertices)
+    cases = []
+    while len(cases) < queries:
+        start, goal = rng.sample(vertices, 2)
+        heuristic = {vertex: math.dist(point, points[goal]) for vertex, point in points.items()}
+        optimal = graph.a_star_search(start, goal, heuristic)
+        if optimal is not None:
+            cases.append((start, goal, heuristic, optimal[1]))
+    print("random geometric graph: %d vertices, %d queries" % (len(vertices), len(cases)))
+
+    modes = [("a_star_search", lambda s, t, h, tracer: graph.a_star_search(s, t, h, tracer=tracer))]
+    for epsilon in (1.2, 1.5, 2.0, 3.0):
+        modes.append(("weighted epsilon %.1f" % epsilon,
+                      lambda s, t, h, tracer, epsilon=epsilon: graph.weighted_a_star_search(
+                          s, t, h, epsilon, tracer=tracer)))
+    for milliseconds in (2, 5, 20):
+        modes.append(("budgeted %d ms" % milliseconds,
+                      lambda s, t, h, tracer, milliseconds=milliseconds: graph.budgeted_a_star_search(
+                          s, t, h, deadline=time.time() + milliseconds / 1000, tracer=tracer)))
+
+    for label, search in modes:
+        times, ratios, bounds, expansions = [], [], [], 0
+        for start, goal, heuristic, optimal_cost in cases:
+            tracer = CountingTracer()
+            began = time.perf_counter()
+            result = search(start, goal, heuristic, tracer)
+            times.append(time.perf_counter() - began)
+            expansions += tracer.expansions
+            if result is not None:
+                ratios.append(result[1] / optimal_cost)
+                if len(result) == 3:
+                    bounds.append(result[2])
+                    assert result[1] <= result[2] * optimal_cost * (1 + 1e-9), label
+        line = "  %-22s p50 %7.2f ms  p99 %7.2f ms %9.1f expansions" % (
+            label, _percentile(times, 0.5) * 1e3, _percentile(times, 0.99) * 1e3, expansions / len(cases))
+        if ratios:
+            line += "   cost x%.3f mean x%.3f worst" % (sum(ratios) / len(ratios), max(ratios))
+        if bounds:
+            line += "   %d/%d answered, bound %.3f" % (len(bounds), len(cases), sum(bounds) / len(bounds))
+        print(line)
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
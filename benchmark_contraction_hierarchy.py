@@ -0,0 +1,59 @@
+# Query latency of a contraction hierarchy against Graph.a_star_search on
+# randomly sampled pairs of a random geometric graph (see
+# graph_generators.py, costs are euclidean distances).
+# A* uses the straight line distance to the goal as its heuristic; building
+# that table is not counted in its query time.
+#
+# usage: python benchmark_contraction_hierarchy.py [vertices] [queries]
+import math
+import random
+import sys
+import time
+
+from pathfinding.contraction_hierarchy import ContractionHierarchy
+from pathfinding.graph_generators import random_geometric_graph
+
+
+def main(n=20000, queries=200):
+    graph, points = random_geometric_graph(n)
+
+    start = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(graph)
+    build_time = time.perf_counter() - start
+    print("graph: %d vertices, %d edges" % (n, sum(len(v) for v in graph.vertices.values()) // 2))
+    print("preprocessing: %.2fs, %d shortcuts" % (build_time, hierarchy.number_of_shortcuts()))
+
+    rng = random.Random(1)
+    pairs = [tuple(rng.sample(range(n), 2)) for _ in range(queries)]
+    a_star_times = []
+    ch_times = []
+    mismatches = 0
+    for start_vertex, goal_vertex in pairs:
+        goal = points[goal_vertex]
+        heuristic = {v: math.dist(point, goal) for v, point in points.items()}
+
+        start = time.perf_counter()
+        expected = graph.a_star_search(start_vertex, goal_vertex, heuristic)
+        a_star_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = hierarchy.query(start_vertex, goal_vertex)
+        ch_times.append(time.perf_counter() - start)
+
+        if (expected is None) != (result is None) or (
+                expected is not None and abs(expected[1] - result[1]) > 1e-9):
+            mismatches += 1
+
+    print("%-8s %12s %12s %12s" % ("engine", "mean ms", "p50 ms", "p99 ms"))
+    for name, times in (("a_star", a_star_times), ("ch", ch_times)):
+        times.sort()
+        print("%-8s %12.3f %12.3f %12.3f" % (
+            name,
+            sum(times) / len(times) * 1e3,
+            times[len(times) // 2] * 1e3,
+            times[min(len(times) - 1, int(len(times) * 0.99))] * 1e3))
+    print("cost mismatches: %d" % mismatches)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
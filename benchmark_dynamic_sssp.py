@@ -0,0 +1,74 @@
+# Repairing a shortest path tree after random edge cost changes against
+# answering the same query with a fresh Graph.a_star_search.
+#
+# Every step changes the cost of one random edge of a random geometric graph
+# (see graph_generators.py): 10% of the steps close it, the others set it to
+# its euclidean length times a factor in [1, 3] (a closed edge is reopened
+# this way), so the straight line distance stays an admissible A* heuristic.
+# After each change the path from the source to a random goal is asked from
+# both engines. "dynamic" includes the repair of the tree, "a_star" the
+# search; building the heuristic table is not timed.
+#
+# usage: python benchmark_dynamic_sssp.py [vertices] [updates]
+import math
+import random
+import sys
+import time
+
+from pathfinding.dynamic_sssp import DynamicShortestPathTree
+from pathfinding.graph_generators import random_geometric_graph
+
+
+def main(n=20000, updates=500):
+    graph, points = random_geometric_graph(n)
+    rng = random.Random(1)
+    edges = [(u, v) for u in graph.vertices for v in graph.vertices[u] if u < v]
+    source = 0
+
+    start = time.perf_counter()
+    tree = DynamicShortestPathTree(graph, source)
+    print("graph: %d vertices, %d edges" % (n, len(edges)))
+    print("initial tree: %.1f ms" % ((time.perf_counter() - start) * 1e3))
+
+    dynamic_times = []
+    a_star_times = []
+    settled = 0
+    mismatches = 0
+    for _ in range(updates):
+        u, v = rng.choice(edges)
+        goal_vertex = rng.randrange(n)
+        goal = points[goal_vertex]
+        heuristic = {vertex: math.dist(point, goal) for vertex, point in points.items()}
+
+        start = time.perf_counter()
+        if rng.random() < 0.1:
+            if v in graph.vertices[u]:
+                graph.remove_edge(u, v)
+        else:
+            graph.add_edge(u, v, math.dist(points[u], points[v]) * rng.uniform(1, 3))
+        result = tree.path(goal_vertex)
+        dynamic_times.append(time.perf_counter() - start)
+        settled += tree.settled
+
+        start = time.perf_counter()
+        expected = graph.a_star_search(source, goal_vertex, heuristic)
+        a_star_times.append(time.perf_counter() - start)
+
+        if (expected is None) != (result is None) or (
+                expected is not None and abs(expected[1] - result[1]) > 1e-9):
+            mismatches += 1
+
+    print("%-8s %12s %12s %12s" % ("engine", "mean ms", "p50 ms", "p99 ms"))
+    for name, times in (("dynamic", dynamic_times), ("a_star", a_star_times)):
+        times.sort()
+        print("%-8s %12.3f %12.3f %12.3f" % (
+            name,
+            sum(times) / len(times) * 1e3,
+            times[len(times) // 2] * 1e3,
+            times[min(len(times) - 1, int(len(times) * 0.99))] * 1e3))
+    print("vertices re-settled per update: %.1f" % (settled / updates))
+    print("cost mismatches: %d" % mismatches)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,83 @@
+# Routing many agents to shared exits: one search per agent against one
+# flow field for all of them (GridEngine.route_batch in grid_engine.py).
+#
+# On random-obstacle and maze grids `agents` random free cells are routed to
+# the nearest of a few exits on the border. Per agent searches run to every
+# exit and keep the shortest path; they are timed on a sample of agents and
+# scaled up. "route_batch cold" includes building the field, "warm" reuses
+# the cached one (writing out the paths dominates both), "after set_blocked"
+# rebuilds it once a wall was added. "next_step" is one move for every
+# agent from the cached field, as a simulation tick would ask for it. All
+# engines must agree on the path lengths.
+#
+# usage: python benchmark_flow_field.py [size] [agents]
+import random
+import sys
+import time
+
+from pathfinding import lab2_codev3
+from pathfinding.graph_generators import maze_grid, random_grid
+from pathfinding.grid_engine import GridEngine
+
+
+def _exits(grid):
+    rows, cols = len(grid), len(grid[0])
+    border = [(0, c) for c in range(cols)] + [(rows - 1, c) for c in range(cols)] + \
+        [(r, 0) for r in range(rows)] + [(r, cols - 1) for r in range(rows)]
+    free = [cell for cell in border if grid[cell[0]][cell[1]] == 0]
+    return [free[0], free[len(free) // 3], free[2 * len(free) // 3]]
+
+
+def _per_agent(search, starts, exits):
+    lengths = []
+    for start in starts:
+        paths = [path for path in (search(start, goal) for goal in exits) if path is not None]
+        lengths.append(min(len(path) for path in paths) if paths else None)
+    return lengths
+
+
+def main(size=150, agents=5000):
+    for name, grid in (("random", random_grid(size, 0.25, seed=3)), ("maze", maze_grid(size, seed=3))):
+        engine = GridEngine(grid)
+        exits = _exits(grid)
+        rng = random.Random(0)
+        field = engine.flow_field(exits)
+        cells = [(r, c) for r in range(len(grid)) for c in range(len(grid[0])) if field.distance((r, c)) is not None]
+        starts = [rng.choice(cells) for _ in range(agents)]
+        sample = starts[:max(1, agents // 1000)]
+        print("%s grid %dx%d, %d agents, %d exits" % (name, len(grid), len(grid[0]), agents, len(exits)))
+
+        expected = None
+        for label, search in (("lab2 a_star per agent", lambda s, t: lab2_codev3.a_star(grid, s, t)),
+                              ("engine a_star per agent", engine.a_star)):
+            began = time.perf_counter()
+            lengths = _per_agent(search, sample, exits)
+            elapsed = (time.perf_counter() - began) * agents / len(sample)
+            expected = expected or lengths
+            assert lengths == expected, label
+            print("  %-24s %10.1f ms (estimated from %d agents)" % (label, elapsed * 1e3, len(sample)))
+
+        for label in ("route_batch cold", "route_batch warm"):
+            if label.endswith("cold"):
+                engine.fields.clear()
+            began = time.perf_counter()
+            paths = engine.route_batch(starts, exits)
+            print("  %-24s %10.1f ms" % (label, (time.perf_counter() - began) * 1e3))
+            assert [len(path) for path in paths[:len(sample)]] == expected, label
+
+        field = engine.flow_field(exits)
+        began = time.perf_counter()
+        for start in starts:
+            field.next_step(start)
+        print("  %-24s %10.1f ms" % ("next_step", (time.perf_counter() - began) * 1e3))
+
+        wall = paths[0][len(paths[0]) // 2]
+        began = time.perf_counter()
+        engine.set_blocked([wall])
+        paths = engine.route_batch(starts, exits)
+        print("  %-24s %10.1f ms" % ("after set_blocked", (time.perf_counter() - began) * 1e3))
+        assert all(path is None or wall not in path for path in paths)
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
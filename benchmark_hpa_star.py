@@ -0,0 +1,91 @@
+# HPA* (hpa_star.py) against plain A* on large grids.
+#
+# For random-obstacle (20%) and maze grids of each size it builds a
+# HierarchicalGrid, then routes random start/goal pairs at least half the
+# grid apart with a_star from lab2_codev3.py, GridEngine.a_star and
+# HierarchicalGrid.find_path. Per engine it reports the latency per query
+# (mean and max); for HPA* also the path length against the optimal one
+# (mean and worst ratio), the build time and the time to toggle one cell
+# with set_blocked() (the incremental cluster rebuild).
+#
+# usage: python benchmark_hpa_star.py [--sizes 512,1024] [--queries 20]
+#   [--cluster-size 32] [--toggles 20]
+import argparse
+import random
+import time
+
+from pathfinding import lab2_codev3
+from pathfinding.graph_generators import maze_grid, random_grid
+from pathfinding.grid_engine import GridEngine
+from pathfinding.hpa_star import HierarchicalGrid
+
+
+def _pairs(grid, count, rng):
+    rows, cols = len(grid), len(grid[0])
+    pairs = []
+    while len(pairs) < count:
+        start = (rng.randrange(rows), rng.randrange(cols))
+        goal = (rng.randrange(rows), rng.randrange(cols))
+        if (grid[start[0]][start[1]] == 0 and grid[goal[0]][goal[1]] == 0
+                and abs(start[0] - goal[0]) + abs(start[1] - goal[1]) >= (rows + cols) // 2):
+            pairs.append((start, goal))
+    return pairs
+
+
+def _timed(search, pairs):
+    times, paths = [], []
+    for start, goal in pairs:
+        began = time.perf_counter()
+        paths.append(search(start, goal))
+        times.append(time.perf_counter() - began)
+    return times, paths
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Compare HPA* with plain A* on large grids.")
+    parser.add_argument("--sizes", default="512,1024")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--cluster-size", type=int, default=32)
+    parser.add_argument("--toggles", type=int, default=20)
+    options = parser.parse_args(arguments)
+
+    for size in [int(size) for size in options.sizes.split(",")]:
+        for name, grid in (("random", random_grid(size, 0.2, seed=1)), ("maze", maze_grid(size, seed=1))):
+            rng = random.Random(size)
+            began = time.perf_counter()
+            hpa = HierarchicalGrid(grid, options.cluster_size)
+            build = time.perf_counter() - began
+            stats = hpa.stats()
+            print("%s %dx%d: HPA* build %.2f s, %d clusters, %d nodes, %d intra edges" % (
+                name, size, size, build, stats["clusters"], stats["nodes"], stats["intra_edges"]))
+
+            pairs = _pairs(grid, options.queries, rng)
+            engine = GridEngine(grid)
+            optimal = None
+            for label, search in (("lab2_codev3.a_star", lambda s, t: lab2_codev3.a_star(grid, s, t)),
+                                  ("GridEngine.a_star", engine.a_star),
+                                  ("HPA*", hpa.find_path)):
+                times, paths = _timed(search, pairs)
+                line = "  %-20s %9.2f ms mean %9.2f ms max" % (label, sum(times) / len(times) * 1e3,
+                                                               max(times) * 1e3)
+                if optimal is None:
+                    optimal = paths
+                else:
+                    ratios = [len(path) / len(best) for path, best in zip(paths, optimal) if best]
+                    assert all(ratio >= 1 for ratio in ratios)
+                    line += "   length x%.4f mean x%.4f worst" % (sum(ratios) / len(ratios), max(ratios))
+                print(line)
+
+            toggles = []
+            for _ in range(options.toggles):
+                cell = (rng.randrange(size), rng.randrange(size))
+                blocked = hpa.is_free(cell)
+                began = time.perf_counter()
+                hpa.set_blocked([cell], blocked)
+                toggles.append(time.perf_counter() - began)
+            print("  set_blocked %9.2f ms mean %9.2f ms max" % (sum(toggles) / len(toggles) * 1e3,
+                                                                max(toggles) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Import time of the pathfinding package, measured in fresh interpreters.
+#
+# Every statement runs `runs` times in a new `python -c`, timed inside the
+# child from just before the import to just after it, so interpreter
+# start-up is not counted. The package is byte-compiled first: the numbers
+# are for a warm __pycache__, as an installed package would have. For each
+# statement it reports the median and the slowest run, how many pathfinding
+# modules got loaded, and whether multiprocessing or NumPy came along.
+#
+# The core API (the first statement) must stay under --budget
+# milliseconds, otherwise the exit status is 1.
+#
+# usage: python benchmark_import.py [--runs 15] [--budget 15]
+import argparse
+import compileall
+import json
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    "from pathfinding import Graph",
+    "import pathfinding",
+    "from pathfinding import Graph, CountingTracer, QueryCache, DynamicShortestPathTree",
+    "from pathfinding import CSRGraph, load_binary",
+    "from pathfinding import Landmarks",
+    "from pathfinding import GridEngine",
+]
+
+CHILD = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, sorted(m for m in sys.modules if m.split('.')[0] == 'pathfinding'),
+                  'multiprocessing' in sys.modules, 'numpy' in sys.modules]))
+"""
+
+
+def measure(statement, runs):
+    root = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", CHILD.format(statement=statement)],
+                                cwd=root, capture_output=True, text=True, check=True).stdout
+        elapsed, modules, multiprocessing, numpy = json.loads(output)
+        times.append(elapsed)
+    times.sort()
+    return times[len(times) // 2], times[-1], modules, multiprocessing, numpy
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Measure the import time of the pathfinding package.")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=15, help="milliseconds allowed for the core API")
+    options = parser.parse_args(arguments)
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    compileall.compile_dir(os.path.join(root, "pathfinding"), quiet=1)
+
+    print("%-84s %8s %8s %8s  %s" % ("statement", "p50 ms", "max ms", "modules", "heavy"))
+    core = None
+    for statement in STATEMENTS:
+        try:
+            median, slowest, modules, multiprocessing, numpy = measure(statement, options.runs)
+        except subprocess.CalledProcessError as error:
+            # GridEngine needs NumPy
+            print("%-84s failed: %s" % (statement, error.stderr.strip().splitlines()[-1]))
+            continue
+        heavy = ", ".join(name for name, loaded in (("multiprocessing", multiprocessing), ("numpy", numpy))
+                          if loaded)
+        print("%-84s %8.2f %8.2f %8d  %s" % (statement, median * 1e3, slowest * 1e3, len(modules), heavy))
+        if core is None:
+            core = median
+    if core is None or core * 1e3 > options.budget:
+        print("core API import over budget (%.1f ms)" % options.budget)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
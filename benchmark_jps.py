@@ -0,0 +1,59 @@
+# Jump Point Search against plain A* on open, maze and random-obstacle grids.
+# Reports node expansions and wall time per query, averaged over random
+# start/goal pairs. "lab2 a_star" is a_star from lab2_codev3.py (4-connected,
+# wall time only), "a_star" is the A* in jump_point_search.py with the same
+# movement rules as JPS.
+#
+# usage: python benchmark_jps.py [size] [queries]
+import random
+import sys
+import time
+
+from pathfinding import lab2_codev3
+from pathfinding.graph_generators import maze_grid, open_grid, random_grid
+from pathfinding.jump_point_search import a_star, jump_point_search
+from pathfinding.tracer import CountingTracer
+
+
+def free_pairs(grid, count, seed=1):
+    rng = random.Random(seed)
+    cells = [(r, c) for r, row in enumerate(grid) for c, value in enumerate(row) if value == 0]
+    return [tuple(rng.sample(cells, 2)) for _ in range(count)]
+
+
+def measure(search, grid, pairs, **options):
+    expansions = 0
+    start = time.perf_counter()
+    for start_cell, goal_cell in pairs:
+        tracer = CountingTracer()
+        search(grid, start_cell, goal_cell, tracer=tracer, **options)
+        expansions += tracer.expansions
+    elapsed = time.perf_counter() - start
+    return expansions / len(pairs), elapsed / len(pairs)
+
+
+def main(size=256, queries=20):
+    grids = [
+        ("open", open_grid(size)),
+        ("maze", maze_grid(size)),
+        ("random", random_grid(size)),
+    ]
+    print("%-8s %-14s %12s %12s" % ("grid", "engine", "expansions", "ms/query"))
+    for name, grid in grids:
+        pairs = free_pairs(grid, queries)
+
+        start = time.perf_counter()
+        for start_cell, goal_cell in pairs:
+            lab2_codev3.a_star(grid, start_cell, goal_cell)
+        print("%-8s %-14s %12s %12.2f" % (name, "lab2 a_star", "-", (time.perf_counter() - start) / queries * 1e3))
+
+        for connectivity, corner_cutting in ((4, False), (8, False), (8, True)):
+            label = "%d%s" % (connectivity, "c" if corner_cutting else "")
+            for engine, search in (("a_star", a_star), ("jps", jump_point_search)):
+                expansions, elapsed = measure(search, grid, pairs,
+                                              connectivity=connectivity, corner_cutting=corner_cutting)
+                print("%-8s %-14s %12.1f %12.2f" % (name, engine + " " + label, expansions, elapsed * 1e3))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
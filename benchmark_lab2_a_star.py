@@ -0,0 +1,172 @@
+# A* of lab2_codev1 (best_first.a_star) on large DAGs and cyclic graphs.
+#
+# Every edge costs 1, as in the lab2 adjacency lists. Graph families, each
+# of about `n` nodes:
+#  - layered_dag: random layered DAG, edges go one or two layers ahead, the
+#    heuristic is the number of layers left halved (admissible)
+#  - grid_dag: grid with right and down moves only, manhattan heuristic
+#  - grid: random grid with 20% obstacles (cyclic), manhattan heuristic
+#  - scale_free: Barabási-Albert graph (cyclic), zero heuristic
+# For random start/goal pairs it reports time per query, expansions and
+# the peak memory of a query, next to Graph.a_star_search on the same unit
+# cost graph, and checks the path length against a breadth-first search.
+# The A* it replaced copied the path on every push and had no g-scores or
+# closed set; in benchmark.py it already timed out on 10^4 node graphs.
+#
+# usage: python benchmark_lab2_a_star.py [n] [queries]
+import math
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from pathfinding.dorian import Graph
+from pathfinding.graph_generators import adjacency_lists, grid_graph, scale_free_graph
+from pathfinding.lab2_codev1 import a_star
+from pathfinding.tracer import CountingTracer
+
+
+# a family builds (graph, pairs, heuristic_for(goal)) for about n nodes
+def layered_dag(n, queries, rng):
+    width = max(2, int(math.sqrt(n)))
+    layers = max(3, n // width)
+    edges = []
+    for layer in range(layers - 1):
+        for position in range(width):
+            vertex = layer * width + position
+            for _ in range(3):
+                edges.append((vertex, (layer + 1) * width + rng.randrange(width), 1))
+            if layer + 2 < layers:
+                edges.append((vertex, (layer + 2) * width + rng.randrange(width), 1))
+    graph = Graph.from_edges(edges, range(layers * width), directed=True)
+    pairs = [(rng.randrange(width), (layers - 1) * width + rng.randrange(width)) for _ in range(queries)]
+
+    def heuristic_for(goal):
+        goal_layer = goal // width
+        return lambda vertex: (goal_layer - vertex // width + 1) // 2
+    return graph, pairs, heuristic_for
+
+
+def grid_dag(n, queries, rng):
+    side = max(2, int(math.sqrt(n)))
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            if r + 1 < side:
+                edges.append(((r, c), (r + 1, c), 1))
+            if c + 1 < side:
+                edges.append(((r, c), (r, c + 1), 1))
+    graph = Graph.from_edges(edges, directed=True)
+    pairs = []
+    for _ in range(queries):
+        start = (rng.randrange(side // 4), rng.randrange(side // 4))
+        pairs.append((start, (rng.randrange(3 * side // 4, side), rng.randrange(3 * side // 4, side))))
+    return graph, pairs, _manhattan
+
+
+def grid(n, queries, rng):
+    graph, _ = grid_graph(size=max(2, round(math.sqrt(n / 0.8))), density=0.2, seed=rng.randrange(1 << 30))
+    component = _largest_component(graph)
+    return graph, [tuple(rng.sample(component, 2)) for _ in range(queries)], _manhattan
+
+
+def scale_free(n, queries, rng):
+    weighted, _ = scale_free_graph(n, seed=rng.randrange(1 << 30))
+    graph = Graph.from_edges((u, v, 1) for u in weighted.vertices for v in weighted.vertices[u] if u < v)
+    vertices = list(graph.vertices)
+    return graph, [tuple(rng.sample(vertices, 2)) for _ in range(queries)], lambda goal: _zero
+
+
+def _manhattan(goal):
+    return lambda cell: abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+
+def _zero(vertex):
+    return 0
+
+
+FAMILIES = {"layered_dag": layered_dag, "grid_dag": grid_dag, "grid": grid, "scale_free": scale_free}
+
+
+def _largest_component(graph):
+    best, seen = [], set()
+    for vertex in graph.vertices:
+        if vertex in seen:
+            continue
+        component = [vertex]
+        seen.add(vertex)
+        for current in component:
+            for neighbor in graph.vertices[current]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    component.append(neighbor)
+        if len(component) > len(best):
+            best = component
+    return best
+
+
+def _hops(lists, start, goal):
+    depth = {start: 0}
+    queue = deque([start])
+    while queue:
+        vertex = queue.popleft()
+        if vertex == goal:
+            return depth[vertex]
+        for neighbor in lists[vertex]:
+            if neighbor not in depth:
+                depth[neighbor] = depth[vertex] + 1
+                queue.append(neighbor)
+    return None
+
+
+def _table(graph, h):
+    return {vertex: h(vertex) for vertex in graph.vertices}
+
+
+def measure(name, search, cases):
+    times, expansions, peak = [], 0, 0
+    for start, goal, h, table in cases:
+        began = time.perf_counter()
+        search(start, goal, h, table, None)
+        times.append(time.perf_counter() - began)
+        tracer = CountingTracer()
+        search(start, goal, h, table, tracer)
+        expansions += tracer.expansions
+    tracemalloc.start()
+    for start, goal, h, table in cases:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        search(start, goal, h, table, None)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    print("  %-22s %10.2f ms %12.1f expansions %10.1f KiB" % (
+        name, sum(times) / len(times) * 1e3, expansions / len(cases), peak / 1024))
+
+
+def main(n=100000, queries=10):
+    rng = random.Random(0)
+    for family, build in FAMILIES.items():
+        graph, pairs, heuristic_for = build(n, queries, rng)
+        lists = adjacency_lists(graph)
+        edges = sum(len(neighbors) for neighbors in lists.values())
+        print("%s: %d nodes, %d arcs" % (family, len(lists), edges))
+        cases = []
+        for start, goal in pairs:
+            h = heuristic_for(goal)
+            cases.append((start, goal, h, _table(graph, h)))
+
+        wrong = 0
+        for start, goal, h, table in cases:
+            path = a_star(lists, start, goal, h)
+            hops = _hops(lists, start, goal)
+            if (path is None) != (hops is None) or (path is not None and len(path) - 1 != hops):
+                wrong += 1
+        measure("lab2_codev1.a_star", lambda s, t, h, table, tracer: a_star(lists, s, t, h, tracer), cases)
+        measure("Graph.a_star_search",
+                lambda s, t, h, table, tracer: graph.a_star_search(s, t, table, tracer=tracer), cases)
+        print("  paths not as short as the breadth-first one: %d of %d" % (wrong, len(cases)))
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
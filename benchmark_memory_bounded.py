@@ -0,0 +1,150 @@
+# Memory-bounded searches (memory_bounded.py) against A* (best_first.py) on
+# implicit state spaces, generated by a neighbors() callable on the fly:
+#  - puzzle: 15-puzzle positions scrambled by `moves` random moves, states
+#    are tuples of 16 tiles, manhattan distance heuristic
+#  - grid: an unbounded 4-connected grid, 25% of the cells blocked by a hash
+#    of their coordinates, goal `distance` cells away, manhattan heuristic
+# Per search it reports the time per query, expansions and the peak memory
+# of a query (tracemalloc). IDA* without a transposition table is left out
+# on the grid: with that many paths to every cell it is exponential there.
+# SMA* with barely enough memory thrashes, forgetting and regenerating the
+# same nodes: one of the grid queries below takes ~1800 times the
+# expansions of A* at 1000 nodes. Last, memory-starved SMA*: a goal farther
+# than max_nodes - 1 moves must come back None at once, one that cannot be
+# reached at all (a blocked cell) None within max_expansions.
+#
+# usage: python benchmark_memory_bounded.py [moves] [distance] [queries]
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+
+from pathfinding.best_first import a_star
+from pathfinding.memory_bounded import ida_star, sma_star
+from pathfinding.tracer import CountingTracer
+
+SIDE = 4
+SOLVED = tuple(range(1, SIDE * SIDE)) + (0,)
+
+
+def puzzle_moves(state):
+    blank = state.index(0)
+    row, col = divmod(blank, SIDE)
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        if 0 <= row + dr < SIDE and 0 <= col + dc < SIDE:
+            tile = blank + dr * SIDE + dc
+            moved = list(state)
+            moved[blank], moved[tile] = moved[tile], 0
+            yield tuple(moved)
+
+
+def puzzle_distance(state):
+    distance = 0
+    for position, tile in enumerate(state):
+        if tile:
+            distance += abs(position // SIDE - (tile - 1) // SIDE) + abs(position % SIDE - (tile - 1) % SIDE)
+    return distance
+
+
+def puzzle_cases(moves, queries, rng):
+    cases = []
+    for _ in range(queries):
+        state = previous = SOLVED
+        for _ in range(moves):
+            state, previous = rng.choice([move for move in puzzle_moves(state) if move != previous]), state
+        cases.append((puzzle_moves, state, SOLVED, puzzle_distance))
+    return cases
+
+
+def blocked(cell):
+    return zlib.crc32(repr(cell).encode()) % 4 == 0
+
+
+def grid_moves(cell):
+    r, c = cell
+    for neighbor in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+        if not blocked(neighbor):
+            yield neighbor
+
+
+def grid_cases(distance, queries, rng):
+    cases = []
+    while len(cases) < queries:
+        start = (rng.randrange(1 << 20), rng.randrange(1 << 20))
+        across = rng.randrange(distance + 1)
+        goal = (start[0] + across, start[1] + distance - across)
+        if blocked(start) or blocked(goal) or a_star(grid_moves, start, goal, _manhattan(goal)) is None:
+            continue
+        cases.append((grid_moves, start, goal, _manhattan(goal)))
+    return cases
+
+
+def _manhattan(goal):
+    return lambda cell: abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+
+def measure(name, search, cases):
+    times, expansions, peak, costs = [], 0, 0, []
+    for neighbors, start, goal, heuristic in cases:
+        began = time.perf_counter()
+        result = search(neighbors, start, goal, heuristic, None)
+        times.append(time.perf_counter() - began)
+        costs.append(result[1] if result is not None else None)
+        tracer = CountingTracer()
+        search(neighbors, start, goal, heuristic, tracer)
+        expansions += tracer.expansions
+    tracemalloc.start()
+    for neighbors, start, goal, heuristic in cases:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        search(neighbors, start, goal, heuristic, None)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    print("  %-24s %10.2f ms %12.1f expansions %10.1f KiB" % (
+        name, sum(times) / len(times) * 1e3, expansions / len(cases), peak / 1024))
+    return costs
+
+
+def main(moves=40, distance=100, queries=5):
+    rng = random.Random(0)
+    for family, build, steps in (("puzzle", puzzle_cases, moves), ("grid", grid_cases, distance)):
+        cases = build(steps, queries, rng)
+        print("%s: %d queries, %d moves from the goal" % (family, len(cases), steps))
+        searches = [("a_star", lambda n, s, t, h, tracer: a_star(n, s, t, h, tracer=tracer))]
+        if family == "puzzle":
+            searches.append(("ida_star", lambda n, s, t, h, tracer: ida_star(n, s, t, h, tracer=tracer)))
+        searches += [
+            ("ida_star table 2^12", lambda n, s, t, h, tracer: ida_star(n, s, t, h, table_size=1 << 12, tracer=tracer)),
+            ("ida_star table 2^16", lambda n, s, t, h, tracer: ida_star(n, s, t, h, table_size=1 << 16, tracer=tracer)),
+            ("sma_star 10^4 nodes", lambda n, s, t, h, tracer: sma_star(n, s, t, h, max_nodes=10000, tracer=tracer)),
+            ("sma_star 2000 nodes", lambda n, s, t, h, tracer: sma_star(n, s, t, h, max_nodes=2000, tracer=tracer)),
+        ]
+        optimal = None
+        for name, search in searches:
+            costs = measure(name, search, cases)
+            optimal = optimal or costs
+            assert all(cost is None or cost == best for cost, best in zip(costs, optimal)), name
+
+    starved(distance, queries, rng)
+
+
+def starved(distance, queries, rng):
+    print("memory-starved sma_star: goals %d moves away, %d nodes" % (distance, distance))
+    for neighbors, start, goal, heuristic in grid_cases(distance, queries, rng):
+        tracer = CountingTracer()
+        assert sma_star(neighbors, start, goal, heuristic, max_nodes=distance, tracer=tracer) is None
+        assert tracer.expansions == 0
+        walled = goal
+        while not blocked(walled):
+            walled = (walled[0] + 1, walled[1])
+        tracer = CountingTracer()
+        began = time.perf_counter()
+        assert sma_star(neighbors, start, walled, _manhattan(walled), max_nodes=10 * distance,
+                        max_expansions=20000, tracer=tracer) is None
+        print("  unreachable goal: None after %d expansions, %.2f ms" % (
+            tracer.expansions, (time.perf_counter() - began) * 1e3))
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,82 @@
+# Micro-benchmark of the previous list-scan PriorityQueue against the
+# indexed binary heap in PriorityQueue.py.
+# Each run fills the queue with n entries, applies decrease-keys to a tenth
+# of them and then pops. The list-scan queue is O(n) per pop, so for the
+# large sizes only a bounded number of pops is timed and the cost per
+# operation is reported.
+#
+# usage: python benchmark_priority_queue.py [max_exponent]
+import random
+import sys
+import time
+
+from pathfinding.PriorityQueue import PriorityQueue
+
+
+# The original implementation, kept here as the baseline.
+class ListPriorityQueue():
+    def __init__(self):
+        self.queue = []
+
+    def empty(self):
+        return len(self.queue) == 0
+
+    def put(self, data):
+        self.queue.append(data)
+
+    def get(self):
+        min_val = 0
+        for i in range(len(self.queue)):
+            if self.queue[i][0] < self.queue[min_val][0]:
+                min_val = i
+        item = self.queue[min_val]
+        del self.queue[min_val]
+        return item
+
+
+def run(queue, priorities, pops, decrease):
+    start = time.perf_counter()
+    for item, priority in enumerate(priorities):
+        queue.put((priority, item))
+    put_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for item in range(0, len(priorities), 10):
+        if decrease:
+            queue.decrease_key(item, priorities[item] - 1)
+        else:
+            # the list-scan queue has no decrease-key, searches pushed a duplicate
+            queue.put((priorities[item] - 1, item))
+    update_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(pops):
+        queue.get()
+    get_time = time.perf_counter() - start
+    return put_time, update_time, get_time
+
+
+def main(max_exponent=6):
+    random.seed(0)
+    print("%-10s %-8s %12s %12s %12s %8s" % ("n", "queue", "put us/op", "dec us/op", "get us/op", "pops"))
+    for exponent in range(3, max_exponent + 1):
+        n = 10 ** exponent
+        priorities = [random.random() for _ in range(n)]
+        updates = len(range(0, n, 10))
+        queues = [
+            ("list", ListPriorityQueue(), max(10, min(n, 10 ** 7 // n)), False),
+            ("heap", PriorityQueue(), n, True),
+            ("lazy", PriorityQueue(lazy=True), n, True),
+        ]
+        for name, queue, pops, decrease in queues:
+            put_time, update_time, get_time = run(queue, priorities, pops, decrease)
+            print("%-10d %-8s %12.3f %12.3f %12.3f %8d" % (
+                n, name,
+                put_time / n * 1e6,
+                update_time / updates * 1e6,
+                get_time / pops * 1e6,
+                pops))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 6)
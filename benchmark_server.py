@@ -0,0 +1,105 @@
+# Load test of the route server (pathfinding/server.py) on localhost.
+#
+# A QueryServer is started in this process over a random geometric graph
+# (see graph_generators.py) with an ALT heuristic, then `clients`
+# connections each send A* queries between random vertices back to back
+# over HTTP keep-alive, for every concurrency level and once without
+# batching (batch_size=1) and once with it. Per run it reports throughput,
+# the latency seen by the clients (p50/p95/p99) and the mean batch size
+# from /metrics. Finally a request with a tiny timeout and a request
+# cancelled with DELETE /route check that searches are stopped.
+#
+# usage: python benchmark_server.py [vertices] [requests per level]
+#   [--workers N] [--levels 1,8,64]
+import argparse
+import asyncio
+import random
+import time
+
+from pathfinding.graph_generators import random_geometric_graph
+from pathfinding.landmarks import Landmarks
+from pathfinding.server import QueryServer, fetch
+
+
+async def _client(server, pairs, latencies):
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    try:
+        for start, goal in pairs:
+            began = time.perf_counter()
+            status, _ = await fetch(reader, writer, "GET", "/route?start=%d&goal=%d" % (start, goal))
+            latencies.append(time.perf_counter() - began)
+            assert status in (200, 404), status
+    finally:
+        writer.close()
+
+
+async def _load(graph, heuristic, workers, batch_size, clients, requests, rng):
+    n = len(graph.vertices)
+    async with QueryServer(graph, heuristic, workers, batch_size=batch_size) as server:
+        # start the workers before the clock runs
+        await server.route(0, 1)
+        latencies = []
+        per_client = max(1, requests // clients)
+        began = time.perf_counter()
+        await asyncio.gather(*(_client(server, [(rng.randrange(n), rng.randrange(n)) for _ in range(per_client)],
+                                       latencies) for _ in range(clients)))
+        elapsed = time.perf_counter() - began
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        _, metrics = await fetch(reader, writer, "GET", "/metrics")
+        writer.close()
+    latencies.sort()
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1e3
+    return len(latencies) / elapsed, percentile(0.5), percentile(0.95), percentile(0.99), metrics["mean_batch"]
+
+
+async def _stopping(graph, workers):
+    n = len(graph.vertices)
+    # the delay keeps the request to cancel queued for a while
+    async with QueryServer(graph, None, workers, batch_delay=0.05) as server:
+        await server.route(0, 1)
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        began = time.perf_counter()
+        status, payload = await fetch(reader, writer, "GET", "/route?start=0&goal=%d&timeout=0.001&algorithm=dfs"
+                                      % (n - 1))
+        print("timeout 1 ms: %d %s after %.1f ms" % (status, payload, (time.perf_counter() - began) * 1e3))
+
+        control_reader, control_writer = await asyncio.open_connection(server.host, server.port)
+        request = asyncio.ensure_future(fetch(reader, writer, "POST", "/route",
+                                              {"start": 0, "goal": n - 1, "algorithm": "dfs", "id": "slow"}))
+        await asyncio.sleep(0.01)
+        _, cancelled = await fetch(control_reader, control_writer, "DELETE", "/route?id=slow")
+        status, payload = await request
+        print("cancel: %s -> %d %s" % (cancelled, status, payload))
+        _, metrics = await fetch(control_reader, control_writer, "GET", "/metrics")
+        print("timeouts %d, cancelled %d" % (metrics["timeouts"], metrics["cancelled"]))
+        writer.close()
+        control_writer.close()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Load test the route server on localhost.")
+    parser.add_argument("vertices", type=int, nargs="?", default=20000)
+    parser.add_argument("requests", type=int, nargs="?", default=2000)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--levels", default="1,8,64")
+    options = parser.parse_args(arguments)
+
+    graph, _ = random_geometric_graph(options.vertices)
+    heuristic = Landmarks.build(graph, k=8).heuristic
+    print("graph: %d vertices" % len(graph.vertices))
+    print("%8s %8s %12s %9s %9s %9s %10s" % ("clients", "batch", "queries/s", "p50 ms", "p95 ms", "p99 ms",
+                                             "mean batch"))
+    for clients in [int(level) for level in options.levels.split(",")]:
+        for batch_size in (1, 32):
+            rng = random.Random(clients)
+            throughput, p50, p95, p99, mean_batch = asyncio.run(
+                _load(graph, heuristic, options.workers, batch_size, clients, options.requests, rng))
+            print("%8d %8d %12.1f %9.2f %9.2f %9.2f %10.2f" % (clients, batch_size, throughput, p50, p95, p99,
+                                                                mean_batch))
+    asyncio.run(_stopping(graph, options.workers))
+
+
+if __name__ == "__main__":
+    main()
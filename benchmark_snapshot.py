@@ -0,0 +1,103 @@
+# Start-up from a snapshot (snapshot.py) against rebuilding from scratch.
+#
+# Two graphs: a random geometric graph of `n` vertices (named 0..n-1, the
+# names are not stored) and a grid graph of about `n` cells (tuple names,
+# looked up through the snapshot's hash index). For each it times the
+# rebuild (graph, 8 ALT landmarks, 4 shortest path trees, a heuristic table
+# and a GridEngine distance field of about `n` cells), saving the snapshot
+# and loading it with and without checksum verification. Then the cost of
+# using the mapped arrays: A* with the landmark heuristic on the snapshot
+# graph against the same search on Graph.freeze(). Last, `workers` spawned
+# worker processes each answer one query: given the graph pickled once per
+# worker (what graph_pool() does without fork) or the snapshot graph, which
+# is pickled as its path and mapped by the worker.
+#
+# usage: python benchmark_snapshot.py [n] [workers]
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pathfinding.graph_generators import grid_graph, random_geometric_graph, random_grid
+from pathfinding.grid_engine import GridEngine
+from pathfinding.landmarks import Landmarks
+from pathfinding.parallel import _set_graph, shared_graph
+from pathfinding.snapshot import load_snapshot, save_snapshot
+
+
+def _query(pair):
+    graph = shared_graph()
+    return graph.bfs(*pair) is not None
+
+
+def _timed(function, *arguments):
+    began = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - began
+
+
+def _best(function, *arguments, repeat=5):
+    return min(_timed(function, *arguments)[1] for _ in range(repeat))
+
+
+def _geometric(n):
+    return random_geometric_graph(n, seed=1)[0]
+
+
+def _grid(n):
+    return grid_graph(size=int(math.sqrt(n)), seed=1)[0]
+
+
+def _workers(graph, workers, pairs):
+    context = multiprocessing.get_context("spawn")
+    began = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_set_graph, initargs=(graph,)) as pool:
+        list(pool.map(_query, pairs[:workers]))
+    return time.perf_counter() - began
+
+
+def main(n=200000, workers=4):
+    directory = tempfile.mkdtemp()
+    side = int(math.sqrt(n))
+    for label, build in (("geometric", _geometric), ("grid", _grid)):
+        rng = random.Random(0)
+        graph, built = _timed(build, n)
+        frozen = graph.freeze()
+        names = list(graph.vertices)
+        landmarks, selected = _timed(Landmarks.build, graph, 8, "farthest", None, 1)
+        sources = rng.sample(names, 4)
+        trees, searched = _timed(lambda: {source: graph.shortest_path_tree(source) for source in sources})
+        goal = rng.choice(names)
+        heuristic = {vertex: landmarks.heuristic(goal)[vertex] for vertex in names}
+        engine = GridEngine(random_grid(side, 0.2, seed=1))
+        field, filled = _timed(engine.distance_field, (0, 0))
+        print("%s: %d vertices, %d directed edges" % (label, len(frozen), frozen.number_of_edges()))
+        print("  rebuild    %8.2f s  (graph %.2f s, landmarks %.2f s, trees %.2f s, field %.2f s)" % (
+            built + selected + searched + filled, built, selected, searched, filled))
+
+        path = os.path.join(directory, label + ".snap")
+        _, saved = _timed(save_snapshot, graph, path, {"goal": heuristic}, trees, landmarks, {"field": field})
+        print("  save       %8.2f s  %.1f MiB" % (saved, os.path.getsize(path) / 2 ** 20))
+        print("  load       %8.2f ms without verify, %.2f ms with verify" % (
+            _best(load_snapshot, path, False) * 1e3, _best(load_snapshot, path, True) * 1e3))
+
+        snapshot = load_snapshot(path)
+        pairs = [tuple(rng.sample(names, 2)) for _ in range(max(workers, 5))]
+        for name, searched_graph in (("freeze()", frozen), ("snapshot", snapshot.graph)):
+            total = 0
+            for start, target in pairs:
+                total += _timed(searched_graph.a_star_search, start, target, snapshot.landmarks.heuristic(target))[1]
+            print("  a_star on %-9s %8.2f ms per query" % (name, total / len(pairs) * 1e3))
+
+        print("  %d spawned workers: %.2f s with the graph pickled, %.2f s mapping the snapshot" % (
+            workers, _workers(graph, workers, pairs), _workers(snapshot.graph, workers, pairs)))
+        os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
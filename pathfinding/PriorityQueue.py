@@ -0,0 +1,146 @@
+# An indexed binary heap implementation of Priority Queue.
+# Elements are (priority, item, ...) tuples, as before. Every item is queued
+# at most once: putting an item that is already queued keeps the lower of
+# the two priorities (a decrease-key), so searches never hold duplicates.
+#
+# Two modes are supported:
+#  - indexed (default): the heap keeps a position index per item and
+#    decrease_key sifts the entry up in place, O(log n).
+#  - lazy (lazy=True): decrease_key marks the old entry as removed and pushes
+#    a new one; removed entries are skipped by get(). Cheaper per update,
+#    the heap may temporarily hold stale entries.
+# Ties on priority are broken by insertion order (first in, first out).
+import heapq
+from itertools import count
+
+REMOVED = object()
+
+
+class PriorityQueue():
+    def __init__(self, lazy=False):
+        self.lazy = lazy
+        # heap entries are [priority, sequence, data]
+        self.queue = []
+        # item -> heap entry (lazy) or heap position (indexed)
+        self.index = {}
+        self.counter = count()
+
+    def __str__(self):
+        return ' '.join([str(entry[2]) for entry in self.queue if entry[2] is not REMOVED])
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    # the queued items, in no particular order
+    def __iter__(self):
+        return iter(self.index)
+
+    # for checking if the queue is empty
+    def empty(self):
+        return len(self.index) == 0
+
+    # for inserting an element in the queue
+    def put(self, data):
+        item = data[1]
+        if item in self.index:
+            if data[0] < self.priority(item):
+                self._update(item, data)
+            return
+        entry = [data[0], next(self.counter), data]
+        if self.lazy:
+            self.index[item] = entry
+            heapq.heappush(self.queue, entry)
+        else:
+            self.queue.append(entry)
+            self.index[item] = len(self.queue) - 1
+            self._sift_up(len(self.queue) - 1)
+
+    # for popping an element based on Priority
+    def get(self):
+        if self.lazy:
+            while self.queue:
+                entry = heapq.heappop(self.queue)
+                if entry[2] is not REMOVED:
+                    del self.index[entry[2][1]]
+                    return entry[2]
+            raise IndexError("get from an empty priority queue")
+
+        if not self.queue:
+            raise IndexError("get from an empty priority queue")
+        entry = self.queue[0]
+        last = self.queue.pop()
+        if self.queue:
+            self.queue[0] = last
+            self.index[last[2][1]] = 0
+            self._sift_down(0)
+        del self.index[entry[2][1]]
+        return entry[2]
+
+    # the element get() would return, without removing it
+    def peek(self):
+        if self.lazy:
+            while self.queue and self.queue[0][2] is REMOVED:
+                heapq.heappop(self.queue)
+        if not self.queue:
+            raise IndexError("peek from an empty priority queue")
+        return self.queue[0][2]
+
+    # current priority of a queued item
+    def priority(self, item):
+        if self.lazy:
+            return self.index[item][0]
+        return self.queue[self.index[item]][0]
+
+    # lower the priority of a queued item
+    def decrease_key(self, item, new_priority):
+        if new_priority > self.priority(item):
+            raise ValueError("new priority is greater than the current priority")
+        data = self.queue[self.index[item]][2] if not self.lazy else self.index[item][2]
+        self._update(item, (new_priority,) + tuple(data[1:]))
+
+    def _update(self, item, data):
+        # the updated entry gets a fresh sequence number, so it ranks
+        # behind entries that already had the same priority
+        if self.lazy:
+            self.index[item][2] = REMOVED
+            entry = [data[0], next(self.counter), data]
+            self.index[item] = entry
+            heapq.heappush(self.queue, entry)
+        else:
+            position = self.index[item]
+            self.queue[position] = [data[0], next(self.counter), data]
+            self._sift_up(position)
+
+    def _sift_up(self, position):
+        queue, index = self.queue, self.index
+        entry = queue[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if queue[parent] <= entry:
+                break
+            queue[position] = queue[parent]
+            index[queue[position][2][1]] = position
+            position = parent
+        queue[position] = entry
+        index[entry[2][1]] = position
+
+    def _sift_down(self, position):
+        queue, index = self.queue, self.index
+        size = len(queue)
+        entry = queue[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and queue[child + 1] < queue[child]:
+                child += 1
+            if entry <= queue[child]:
+                break
+            queue[position] = queue[child]
+            index[queue[position][2][1]] = position
+            position = child
+        queue[position] = entry
+        index[entry[2][1]] = position
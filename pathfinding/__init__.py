@@ -0,0 +1,67 @@
+# Graph search algorithms of IS1 Lab 2.
+#
+#   from pathfinding import Graph, luxembourg_railway
+#   graph, heuristics = luxembourg_railway()
+#   path, total_cost = graph.a_star_search("Luxembourg", "Troisvierges", heuristics)
+#
+# Importing the package loads nothing: every name below and every submodule
+# (pathfinding.grid_engine, pathfinding.lab2_codev1, ...) is imported on
+# first use, so a service only pays for what it touches and NumPy or
+# multiprocessing are never loaded for a plain Graph search. The demos run
+# from the command line: python -m pathfinding --help
+import importlib
+
+# name -> submodule defining it. PriorityQueue, distance_matrix and
+# jump_point_search are left out: they share their module's name, and the
+# import system sets the package attribute to the module once it is loaded.
+_EXPORTS = {
+    "Graph": "dorian",
+    "luxembourg_railway": "dorian",
+    "Tracer": "tracer",
+    "CountingTracer": "tracer",
+    "PrintTracer": "tracer",
+    "QueryCache": "query_cache",
+    "CSRGraph": "csr_graph",
+    "read_edge_list": "graph_io",
+    "edge_list_to_csr": "graph_io",
+    "save_binary": "graph_io",
+    "load_binary": "graph_io",
+    "graph_pool": "parallel",
+    "ContractionHierarchy": "contraction_hierarchy",
+    "Landmarks": "landmarks",
+    "DynamicShortestPathTree": "dynamic_sssp",
+    "GridEngine": "grid_engine",
+    "QueryServer": "server",
+    "HierarchicalGrid": "hpa_star",
+    "ida_star": "memory_bounded",
+    "sma_star": "memory_bounded",
+    "save_snapshot": "snapshot",
+    "load_snapshot": "snapshot",
+    "all_paths": "path_enumeration",
+    "k_shortest_paths": "path_enumeration",
+}
+
+_SUBMODULES = {
+    "PriorityQueue", "best_first", "contraction_hierarchy", "csr_graph", "distance_matrix", "dorian",
+    "dynamic_sssp", "graph_generators", "graph_io", "grid_engine", "hpa_star", "jump_point_search",
+    "lab2_codev1", "lab2_codev2", "lab2_codev3", "landmarks", "memory_bounded", "parallel", "path_enumeration",
+    "query_cache", "server", "snapshot", "tracer",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    # later lookups find it without coming back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
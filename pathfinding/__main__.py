@@ -0,0 +1,38 @@
+# Command line entry point: runs the demos that used to run on import.
+#
+# usage: python -m pathfinding [demo ...]
+#   luxembourg    the Luxembourg railway searches of dorian.py
+#   lab2_codev1   the lab2 examples, one module each
+#   lab2_codev2
+#   lab2_codev3
+# Without arguments every demo runs.
+import argparse
+import importlib
+import sys
+
+DEMOS = {
+    "luxembourg": "dorian",
+    "lab2_codev1": "lab2_codev1",
+    "lab2_codev2": "lab2_codev2",
+    "lab2_codev3": "lab2_codev3",
+}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="python -m pathfinding", description="Run the search demos.")
+    parser.add_argument("demos", nargs="*", metavar="demo",
+                        help="one of %s (default: all)" % ", ".join(DEMOS))
+    options = parser.parse_args(arguments)
+    for demo in options.demos:
+        if demo not in DEMOS:
+            parser.error("unknown demo %r" % demo)
+    demos = options.demos or list(DEMOS)
+    for demo in demos:
+        if len(demos) > 1:
+            print("\n== %s ==" % demo)
+        importlib.import_module("." + DEMOS[demo], __package__).main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# Best-first search engines for the lab2 graph formats.
+# The graph is a `neighbors(node)` callable, so adjacency lists
+# (graph.__getitem__, lab2_codev1/2) and grids (lab2_codev3) share one
+# implementation. A heuristic is either a mapping (heuristic[node]) or a
+# callable (heuristic(node)). Heap entries are plain tuples with an insertion
+# counter as tie breaker, so nodes never have to be comparable.
+import heapq
+import math
+from itertools import count
+
+from .tracer import finish
+
+
+def estimator(heuristic):
+    return heuristic if callable(heuristic) else heuristic.__getitem__
+
+
+def reconstruct_path(parents, goal):
+    path = [goal]
+    parent = parents[goal]
+    while parent is not None:
+        path.append(parent)
+        parent = parents[parent]
+    return path[::-1]
+
+
+# Greedy best-first search: always expands the open node with the smallest
+# h(n) and ignores the cost so far, so it usually expands far fewer nodes
+# than A* but the path it returns is not necessarily the shortest. h(n) does
+# not depend on the way n was reached, so a node goes on the open list only
+# when it is first reached: `parents` is the closed set and the open list
+# together, every node is expanded at most once and the search is
+# O(E log V) and complete on finite graphs.
+def greedy_best_first(neighbors, start, goal, heuristic, tracer=None):
+    h = estimator(heuristic)
+    order = count()
+    open_list = [(h(start), next(order), start)]
+    parents = {start: None}
+    if tracer is not None:
+        tracer.start("greedy_best_first", start, goal)
+
+    while open_list:
+        node = heapq.heappop(open_list)[2]
+        if tracer is not None:
+            tracer.expand(node)
+        if node == goal:
+            return finish(tracer, reconstruct_path(parents, goal))
+
+        for neighbor in neighbors(node):
+            if neighbor not in parents:
+                parents[neighbor] = node
+                estimate = h(neighbor)
+                heapq.heappush(open_list, (estimate, next(order), neighbor))
+                if tracer is not None:
+                    tracer.push(neighbor, estimate)
+        if tracer is not None:
+            tracer.frontier(open_list)
+    return finish(tracer, None)
+
+
+# A* search: expands the open node with the smallest f(n) = g(n) + h(n),
+# where g(n) is the cheapest known cost from the start. `cost(node,
+# neighbor)` gives the edge costs, every edge costs 1 without it. Nodes keep
+# their g-score and a parent pointer instead of a copy of their path; an
+# improved node is pushed again and the outdated heap entry is skipped when
+# it comes up. Expanded nodes go to the closed set and are only reopened if
+# a cheaper way to them turns up, which needs an inconsistent heuristic.
+# Returns (path, cost), or None if the goal cannot be reached.
+def a_star(neighbors, start, goal, heuristic, cost=None, tracer=None):
+    h = estimator(heuristic)
+    order = count()
+    open_list = [(h(start), next(order), 0, start)]
+    g_scores = {start: 0}
+    parents = {start: None}
+    closed = set()
+    if tracer is not None:
+        tracer.start("a_star", start, goal)
+
+    while open_list:
+        _, _, g, node = heapq.heappop(open_list)
+        if node in closed or g > g_scores[node]:
+            continue
+        closed.add(node)
+        if tracer is not None:
+            tracer.expand(node)
+        if node == goal:
+            return finish(tracer, (reconstruct_path(parents, goal), g))
+
+        for neighbor in neighbors(node):
+            tentative = g + (1 if cost is None else cost(node, neighbor))
+            if tentative < g_scores.get(neighbor, math.inf):
+                g_scores[neighbor] = tentative
+                parents[neighbor] = node
+                closed.discard(neighbor)
+                priority = tentative + h(neighbor)
+                heapq.heappush(open_list, (priority, next(order), tentative, neighbor))
+                if tracer is not None:
+                    tracer.push(neighbor, priority)
+        if tracer is not None:
+            tracer.frontier(open_list)
+    return finish(tracer, None)
@@ -0,0 +1,293 @@
+# Contraction Hierarchies for repeated shortest path queries on a static,
+# undirected Graph.
+#
+# Preprocessing contracts the vertices one at a time, cheapest first (edge
+# difference plus the number of already contracted neighbors, updated
+# lazily). Contracting v adds a shortcut u-w of cost c(u,v) + c(v,w) for
+# every pair of remaining neighbors unless a local witness search finds a
+# path at most as short that avoids v. Each vertex keeps only its "upward"
+# edges, to vertices contracted after it, stored in CSR arrays.
+#
+# A query is a bidirectional Dijkstra that only follows upward edges from
+# both ends; shortcuts on the result are unpacked through their middle
+# vertex to give the path in the original graph.
+#
+#   ch = ContractionHierarchy.build(graph)
+#   ch.save("network.ch")
+#   ch = ContractionHierarchy.load("network.ch")
+#   path, total_cost = ch.query("Luxembourg", "Troisvierges")
+import heapq
+import pickle
+from array import array
+
+FORMAT_VERSION = 1
+
+
+class ContractionHierarchy:
+    def __init__(self, names, rank, offsets, targets, weights, middles):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        # rank[v] is the position of v in the contraction order
+        self.rank = rank
+        # upward edges of v: targets/weights/middles[offsets[v]:offsets[v + 1]],
+        # middle is -1 for an original edge, the bypassed vertex for a shortcut
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.middles = middles
+
+    @classmethod
+    def build(cls, graph, settle_limit=500):
+        # shortcuts and upward searches follow the edges both ways
+        if graph.directed:
+            raise ValueError("contraction hierarchies need an undirected graph")
+        names = list(graph.vertices)
+        ids = {name: i for i, name in enumerate(names)}
+        n = len(names)
+        costs = [cost for neighbors in graph.vertices.values() for cost in neighbors.values()]
+        typecode = 'q' if all(isinstance(cost, int) for cost in costs) else 'd'
+
+        # remaining graph: adjacency[u][v] = (cost, middle)
+        adjacency = [dict() for _ in range(n)]
+        for name, neighbors in graph.vertices.items():
+            u = ids[name]
+            for neighbor, cost in neighbors.items():
+                v = ids[neighbor]
+                if u != v and (v not in adjacency[u] or cost < adjacency[u][v][0]):
+                    adjacency[u][v] = (cost, -1)
+
+        contracted = bytearray(n)
+        contracted_neighbors = [0] * n
+        level = [0] * n
+        rank = array('q', [0]) * n
+        upward = [None] * n
+
+        def priority(v):
+            shortcuts = len(cls._shortcuts(adjacency, v, settle_limit))
+            return 2 * (shortcuts - len(adjacency[v])) + contracted_neighbors[v] + level[v]
+
+        queue = [(priority(v), v) for v in range(n)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            if contracted[v]:
+                continue
+            # lazy update: contract v only if it is still the cheapest
+            current = priority(v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            for u, w, cost in cls._shortcuts(adjacency, v, settle_limit):
+                if w not in adjacency[u] or cost < adjacency[u][w][0]:
+                    adjacency[u][w] = (cost, v)
+                    adjacency[w][u] = (cost, v)
+
+            upward[v] = adjacency[v]
+            for u in adjacency[v]:
+                del adjacency[u][v]
+                contracted_neighbors[u] += 1
+                level[u] = max(level[u], level[v] + 1)
+            adjacency[v] = {}
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array(typecode)
+        middles = array('q')
+        for v in range(n):
+            for u, (cost, middle) in upward[v].items():
+                targets.append(u)
+                weights.append(cost)
+                middles.append(middle)
+            offsets.append(len(targets))
+        return cls(names, rank, offsets, targets, weights, middles)
+
+    # shortcuts (u, w, cost) needed to contract v in the remaining graph
+    @staticmethod
+    def _shortcuts(adjacency, v, settle_limit):
+        neighbors = list(adjacency[v].items())
+        shortcuts = []
+        for i, (u, (cost_u, _)) in enumerate(neighbors):
+            targets = {}
+            for w, (cost_w, _) in neighbors[i + 1:]:
+                targets[w] = cost_u + cost_w
+            if not targets:
+                continue
+            witness = _witness_search(adjacency, u, v, targets, max(targets.values()), settle_limit)
+            for w, via in targets.items():
+                if witness.get(w, float("inf")) > via:
+                    shortcuts.append((u, w, via))
+        return shortcuts
+
+    def __len__(self):
+        return len(self.names)
+
+    def number_of_shortcuts(self):
+        return sum(1 for middle in self.middles if middle != -1)
+
+    def save(self, path):
+        data = {
+            "format": "contraction_hierarchy",
+            "version": FORMAT_VERSION,
+            "names": self.names,
+            "rank": self.rank,
+            "offsets": self.offsets,
+            "targets": self.targets,
+            "weights": self.weights,
+            "middles": self.middles,
+        }
+        with open(path, "wb") as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = pickle.load(file)
+        if data.get("format") != "contraction_hierarchy" or data.get("version") != FORMAT_VERSION:
+            raise ValueError("%s is not a version %d contraction hierarchy" % (path, FORMAT_VERSION))
+        return cls(data["names"], data["rank"], data["offsets"], data["targets"],
+                   data["weights"], data["middles"])
+
+    # cost of the shortest path, None if the goal is unreachable
+    def distance(self, start_vertex, goal_vertex):
+        result = self._search(self.ids[start_vertex], self.ids[goal_vertex])
+        return None if result is None else result[0]
+
+    # (path, total_cost) like Graph.a_star_search, None if unreachable
+    def query(self, start_vertex, goal_vertex):
+        start, goal = self.ids[start_vertex], self.ids[goal_vertex]
+        result = self._search(start, goal)
+        if result is None:
+            return None
+        total_cost, meeting, parents = result
+
+        # upward edges start -> meeting, then meeting -> goal, as
+        # (vertex the edge is left from, edge index)
+        steps = []
+        current = meeting
+        while current != start:
+            parent, k = parents[0][current]
+            steps.append((parent, k))
+            current = parent
+        steps.reverse()
+        current = meeting
+        while current != goal:
+            parent, k = parents[1][current]
+            steps.append((current, k))
+            current = parent
+
+        path = [start]
+        for tail, k in steps:
+            path.extend(self._unpack(tail, k)[1:])
+        return [self.names[v] for v in path], total_cost
+
+    def _search(self, start, goal):
+        if start == goal:
+            return 0, start, ({start: None}, {goal: None})
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances = ({start: 0}, {goal: 0})
+        # parents[side][v] = (previous vertex, upward edge index)
+        parents = ({start: None}, {goal: None})
+        queues = ([(0, start)], [(0, goal)])
+        settled = (set(), set())
+        best_cost = float("inf")
+        meeting = None
+
+        side = 0
+        while queues[0] or queues[1]:
+            # alternate between the searches, skipping an exhausted one
+            if not queues[side] or queues[side][0][0] >= best_cost:
+                queues[side].clear()
+                side = 1 - side
+                continue
+            distance, v = heapq.heappop(queues[side])
+            if v in settled[side]:
+                side = 1 - side
+                continue
+            settled[side].add(v)
+            other = distances[1 - side].get(v)
+            if other is not None and distance + other < best_cost:
+                best_cost = distance + other
+                meeting = v
+
+            side_distances = distances[side]
+            side_parents = parents[side]
+            for k in range(offsets[v], offsets[v + 1]):
+                u = targets[k]
+                candidate = distance + weights[k]
+                if candidate < side_distances.get(u, float("inf")):
+                    side_distances[u] = candidate
+                    side_parents[u] = (v, k)
+                    heapq.heappush(queues[side], (candidate, u))
+            side = 1 - side
+
+        if meeting is None:
+            return None
+        return best_cost, meeting, parents
+
+    # vertices of the original path behind upward edge k, starting at `tail`
+    def _unpack(self, tail, k):
+        path = [tail]
+        # stack of (from, to, edge index) still to expand, in reverse order
+        owner = self._edge_owner(k)
+        head = self.targets[k] if owner == tail else owner
+        stack = [(tail, head, k)]
+        while stack:
+            a, b, k = stack.pop()
+            middle = self.middles[k]
+            if middle == -1:
+                path.append(b)
+                continue
+            # both halves are upward edges of the middle vertex
+            stack.append((middle, b, self._find_edge(middle, b)))
+            stack.append((a, middle, self._find_edge(middle, a)))
+        return path
+
+    def _edge_owner(self, k):
+        # the vertex v with offsets[v] <= k < offsets[v + 1]
+        low, high = 0, len(self.offsets) - 1
+        while high - low > 1:
+            mid = (low + high) // 2
+            if self.offsets[mid] <= k:
+                low = mid
+            else:
+                high = mid
+        return low
+
+    def _find_edge(self, v, u):
+        for k in range(self.offsets[v], self.offsets[v + 1]):
+            if self.targets[k] == u:
+                return k
+        raise KeyError((self.names[v], self.names[u]))
+
+
+# Dijkstra from `source` in the remaining graph, avoiding `excluded`, until all
+# targets are settled, the distance passes `max_cost` or `settle_limit`
+# vertices are settled. Returns the distances found.
+def _witness_search(adjacency, source, excluded, targets, max_cost, settle_limit):
+    infinity = float("inf")
+    distances = {source: 0}
+    queue = [(0, source)]
+    settled = 0
+    remaining = len(targets)
+    while queue and settled < settle_limit:
+        distance, v = heapq.heappop(queue)
+        if distance > distances[v]:
+            continue
+        settled += 1
+        if v in targets:
+            remaining -= 1
+            if remaining == 0:
+                break
+        for u, (cost, _) in adjacency[v].items():
+            if u == excluded:
+                continue
+            candidate = distance + cost
+            if candidate <= max_cost and candidate < distances.get(u, infinity):
+                distances[u] = candidate
+                heapq.heappush(queue, (candidate, u))
+    return distances
@@ -0,0 +1,220 @@
+# Frozen, compressed-sparse-row representation of a Graph.
+# Vertex names are interned to integer ids 0..n-1. The neighbors of vertex u
+# are targets[offsets[u]:offsets[u + 1]] with the matching edge costs in
+# weights. All three are flat `array` buffers, so an edge costs 16 bytes
+# instead of a dict entry per direction.
+# The search methods take and return vertex names, like Graph, so a frozen
+# graph can be used wherever a Graph is searched.
+from array import array
+from collections import deque
+
+from .PriorityQueue import PriorityQueue
+from .tracer import finish
+
+
+class CSRGraph:
+    def __init__(self, names, offsets, targets, weights, ids=None, directed=None):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)} if ids is None else ids
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        # whether the edges were one-way in the graph this was built from (the
+        # arrays hold both directions of an undirected edge); None if unknown
+        self.directed = directed
+
+    @classmethod
+    def from_graph(cls, graph):
+        names = list(graph.vertices)
+        ids = {name: i for i, name in enumerate(names)}
+        costs = [cost for neighbors in graph.vertices.values() for cost in neighbors.values()]
+        # keep integer costs integral so total costs match Graph
+        typecode = 'q' if all(isinstance(cost, int) for cost in costs) else 'd'
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array(typecode, costs)
+        for name in names:
+            neighbors = graph.vertices[name]
+            targets.extend([ids[neighbor] for neighbor in neighbors])
+            offsets.append(len(targets))
+        return cls(names, offsets, targets, weights, directed=graph.directed)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, vertex):
+        return vertex in self.ids
+
+    def __str__(self):
+        result = ""
+        for name in self.names:
+            result += str(name) + " -> " + str(dict(self.neighbors(name))) + "\n"
+        return result
+
+    def number_of_edges(self):
+        return len(self.targets)
+
+    # (neighbor name, cost) pairs of a vertex
+    def neighbors(self, vertex):
+        u = self.ids[vertex]
+        names, targets, weights = self.names, self.targets, self.weights
+        for k in range(self.offsets[u], self.offsets[u + 1]):
+            yield names[targets[k]], weights[k]
+
+    def cost(self, vertex1, vertex2):
+        return self._edge_cost(self.ids[vertex1], self.ids[vertex2])
+
+    def dfs(self, start_vertex, goal_vertex, tracer=None):
+        offsets, targets, names = self.offsets, self.targets, self.names
+        start, goal = self.ids[start_vertex], self.ids[goal_vertex]
+        explored = bytearray(len(names))
+        stack = [start]
+        parents = {start: None}
+        if tracer is not None:
+            tracer.start("dfs", start_vertex, goal_vertex)
+        while stack:
+            current = stack.pop()
+            if explored[current]:
+                continue
+            explored[current] = 1
+            if tracer is not None:
+                tracer.expand(names[current])
+
+            if current == goal:
+                return finish(tracer, self.construct_path(start, goal, parents))
+
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                if not explored[neighbor]:
+                    parents[neighbor] = current
+                    stack.append(neighbor)
+                    if tracer is not None:
+                        tracer.push(names[neighbor])
+            if tracer is not None:
+                tracer.frontier(stack)
+        return finish(tracer, None)
+
+    def bfs(self, start_vertex, goal_vertex, tracer=None):
+        offsets, targets, names = self.offsets, self.targets, self.names
+        start, goal = self.ids[start_vertex], self.ids[goal_vertex]
+        explored = bytearray(len(names))
+        queue = deque([start])
+        parents = {start: None}
+        if tracer is not None:
+            tracer.start("bfs", start_vertex, goal_vertex)
+        while queue:
+            current = queue.popleft()
+            if explored[current]:
+                continue
+            explored[current] = 1
+            if tracer is not None:
+                tracer.expand(names[current])
+
+            if current == goal:
+                return finish(tracer, self.construct_path(start, goal, parents))
+
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                if not explored[neighbor]:
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+                    if tracer is not None:
+                        tracer.push(names[neighbor])
+            if tracer is not None:
+                tracer.frontier(queue)
+        return finish(tracer, None)
+
+    def greedy_search(self, start_vertex, goal_vertex, heuristic, tracer=None):
+        offsets, targets, names = self.offsets, self.targets, self.names
+        start, goal = self.ids[start_vertex], self.ids[goal_vertex]
+        explored = bytearray(len(names))
+        priorityQueue = PriorityQueue()
+        priorityQueue.put((heuristic[start_vertex], start))
+        parents = {start: None}
+        if tracer is not None:
+            tracer.start("greedy_search", start_vertex, goal_vertex)
+        while not priorityQueue.empty():
+            current = priorityQueue.get()[1]
+            if explored[current]:
+                continue
+            explored[current] = 1
+            if tracer is not None:
+                tracer.expand(names[current])
+
+            if current == goal:
+                return finish(tracer, self.construct_path(start, goal, parents))
+
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                if not explored[neighbor]:
+                    parents[neighbor] = current
+                    priorityQueue.put((heuristic[names[neighbor]], neighbor))
+                    if tracer is not None:
+                        tracer.push(names[neighbor], heuristic[names[neighbor]])
+            if tracer is not None:
+                tracer.frontier(priorityQueue)
+        return finish(tracer, None)
+
+    def a_star_search(self, start_vertex, goal_vertex, heuristic, tracer=None):
+        offsets, targets, weights, names = self.offsets, self.targets, self.weights, self.names
+        start, goal = self.ids[start_vertex], self.ids[goal_vertex]
+        explored = bytearray(len(names))
+        priorityQueue = PriorityQueue(lazy=True)
+        priorityQueue.put((0, start))
+        g_scores = {start: 0}
+        parents = {start: None}
+        if tracer is not None:
+            tracer.start("a_star_search", start_vertex, goal_vertex)
+        while not priorityQueue.empty():
+            current = priorityQueue.get()[1]
+            if tracer is not None:
+                tracer.expand(names[current])
+
+            if current == goal:
+                return finish(tracer, self.construct_path(start, goal, parents))
+
+            explored[current] = 1
+            current_g = g_scores[current]
+
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                if explored[neighbor]:
+                    continue
+
+                tentative_g_score = current_g + weights[k]
+
+                if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
+                    parents[neighbor] = current
+                    g_scores[neighbor] = tentative_g_score
+                    f_score = tentative_g_score + heuristic[names[neighbor]]
+                    if neighbor in priorityQueue:
+                        priorityQueue.decrease_key(neighbor, f_score)
+                    else:
+                        priorityQueue.put((f_score, neighbor))
+                    if tracer is not None:
+                        tracer.push(names[neighbor], f_score)
+            if tracer is not None:
+                tracer.frontier(priorityQueue)
+        return finish(tracer, None)
+
+    # start and goal are vertex ids here, the path is returned with names
+    def construct_path(self, start, goal, parents):
+        path = []
+        total_cost = 0
+        current = goal
+        while current != start:
+            path.append(self.names[current])
+            parent = parents[current]
+            total_cost += self._edge_cost(current, parent)
+            current = parent
+        path.append(self.names[start])
+        path.reverse()
+        return path, total_cost
+
+    def _edge_cost(self, u, v):
+        targets = self.targets
+        for k in range(self.offsets[u], self.offsets[u + 1]):
+            if targets[k] == v:
+                return self.weights[k]
+        raise KeyError((self.names[u], self.names[v]))
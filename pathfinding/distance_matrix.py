@@ -0,0 +1,50 @@
+# Many-to-many shortest path costs.
+# One Dijkstra per source, stopped as soon as every target is settled. With
+# workers > 1 the sources are split into one shard per worker and the shards
+# run in a process pool that shares the graph (see parallel.py), so the graph
+# is not pickled per task.
+from .parallel import graph_pool, shared_graph
+
+
+# matrix[i][j] is the cost from sources[i] to targets[j], inf if unreachable.
+# With predecessors=True, (matrix, trees) is returned where trees[i] is the
+# parents dict of the search from sources[i], usable with construct_path.
+def distance_matrix(graph, sources, targets, workers=1, predecessors=False):
+    import numpy as np
+
+    sources = list(sources)
+    targets = list(targets)
+    if workers == 1 or len(sources) <= 1:
+        rows = _distance_rows(graph, sources, targets, predecessors)
+    else:
+        shards = _shards(sources, workers)
+        with graph_pool(graph, len(shards)) as pool:
+            futures = [pool.submit(_distance_shard, shard, targets, predecessors) for shard in shards]
+            rows = [row for future in futures for row in future.result()]
+
+    matrix = np.full((len(sources), len(targets)), np.inf)
+    trees = []
+    for i, (distances, parents) in enumerate(rows):
+        matrix[i] = distances
+        trees.append(parents)
+    if predecessors:
+        return matrix, trees
+    return matrix
+
+
+def _shards(sources, workers):
+    size = -(-len(sources) // workers)
+    return [sources[i:i + size] for i in range(0, len(sources), size)]
+
+
+def _distance_rows(graph, sources, targets, predecessors):
+    rows = []
+    for source in sources:
+        distances, parents = graph.dijkstra(source, targets)
+        row = [distances.get(target, float("inf")) for target in targets]
+        rows.append((row, parents if predecessors else None))
+    return rows
+
+
+def _distance_shard(sources, targets, predecessors):
+    return _distance_rows(shared_graph(), sources, targets, predecessors)
@@ -0,0 +1,984 @@
+from .PriorityQueue import PriorityQueue
+from array import array
+from .query_cache import QueryCache, cached
+from .tracer import PrintTracer, SearchCancelled, finish
+from collections import deque
+from itertools import chain
+import time
+
+# csr_graph, graph_io and distance_matrix (which loads multiprocessing) are
+# imported by the methods using them, so importing Graph stays cheap
+NAN = float("nan")
+
+
+class Graph:
+    # With directed=True add_edge adds one-way edges unless called with
+    # directed=False. Edge costs live in the adjacency dicts: vertices maps
+    # a vertex to its outgoing {neighbor: cost} and incoming to its incoming
+    # {predecessor: cost}; an undirected graph stores every edge at both ends
+    # already, so there incoming is vertices itself.
+    def __init__(self, directed=False):
+        self.vertices = {}
+        self.directed = directed
+        self.incoming = {} if directed else self.vertices
+        # Extra per-edge attributes (time, distance, mode, ...) are columns:
+        # columns[name][edge_ids[vertex1, vertex2]], an array('d') for numbers
+        # and a list for anything else. Only edges given attributes get an
+        # id; both directions of an undirected edge share theirs.
+        self.edge_ids = {}
+        self.columns = {}
+        self.next_edge_id = 0
+        self.free_edge_ids = []
+        # bumped on every change, invalidates the query cache
+        self.version = 0
+        self.cache = None
+        # told about every edge change, see dynamic_sssp.py
+        self.observers = []
+
+    # bulk constructor from (vertex1, vertex2, cost) edges; unlike add_edge,
+    # endpoints that are not in the graph yet are added
+    @classmethod
+    def from_edges(cls, edges, vertices=(), directed=False):
+        graph = cls(directed)
+        adjacency = graph.vertices
+        incoming = graph.incoming
+        for vertex in vertices:
+            if vertex not in adjacency:
+                adjacency[vertex] = {}
+                incoming[vertex] = {}
+        for vertex1, vertex2, cost in edges:
+            if vertex1 not in adjacency:
+                adjacency[vertex1] = {}
+                incoming[vertex1] = {}
+            if vertex2 not in adjacency:
+                adjacency[vertex2] = {}
+                incoming[vertex2] = {}
+            adjacency[vertex1][vertex2] = cost
+            incoming[vertex2][vertex1] = cost
+        return graph
+
+    # Graph from a CSV/TSV edge list, read in chunks, see graph_io.py
+    @classmethod
+    def from_edge_list(cls, path, delimiter=None, skip_header=False, numeric_names=False, directed=False):
+        from .graph_io import read_edge_list
+        chunks = read_edge_list(path, delimiter, skip_header=skip_header, numeric_names=numeric_names)
+        return cls.from_edges((edge for chunk in chunks for edge in chunk), directed=directed)
+    
+    def add_vertex(self, vertex):
+        if vertex not in self.vertices:
+            self.vertices[vertex] = {}
+            self.incoming[vertex] = {}
+            self.version += 1
+    
+    # add_edge("Luxembourg", "Ettelbruck", 37, time=31, mode="rail");
+    # directed=None takes the direction of the graph
+    def add_edge(self, vertex1, vertex2, cost, directed=None, **attributes):
+        if vertex1 in self.vertices and vertex2 in self.vertices:
+            if directed is None:
+                directed = self.directed
+            elif directed and not self.directed:
+                raise ValueError("one-way edges need a Graph(directed=True)")
+            old_cost = self.vertices[vertex1].get(vertex2)
+            old_reverse_cost = self.vertices[vertex2].get(vertex1)
+            self.vertices[vertex1][vertex2] = cost
+            self.incoming[vertex2][vertex1] = cost
+            if not directed:
+                self.vertices[vertex2][vertex1] = cost
+                self.incoming[vertex1][vertex2] = cost
+            if attributes:
+                self.set_edge_attributes(vertex1, vertex2, directed, **attributes)
+            self.version += 1
+            self._notify(vertex1, vertex2, old_cost, cost)
+            if not directed and self.directed:
+                self._notify(vertex2, vertex1, old_reverse_cost, cost)
+    
+    # like add_edge; an edge (or vertex) that is not in the graph is ignored
+    def remove_edge(self, vertex1, vertex2, directed=None):
+        if vertex1 in self.vertices and vertex2 in self.vertices:
+            if directed is None:
+                directed = self.directed
+            elif directed and not self.directed:
+                raise ValueError("one-way edges need a Graph(directed=True)")
+            old_cost = self.vertices[vertex1].pop(vertex2, None)
+            old_reverse_cost = None
+            self.incoming[vertex2].pop(vertex1, None)
+            self._release_edge_id(vertex1, vertex2)
+            if not directed:
+                old_reverse_cost = self.vertices[vertex2].pop(vertex1, None)
+                self.incoming[vertex1].pop(vertex2, None)
+                self._release_edge_id(vertex2, vertex1)
+            if old_cost is None and old_reverse_cost is None:
+                return
+            self.version += 1
+            if old_cost is not None:
+                self._notify(vertex1, vertex2, old_cost, None)
+            if self.directed and old_reverse_cost is not None:
+                self._notify(vertex2, vertex1, old_reverse_cost, None)
+    
+    def remove_vertex(self, vertex):
+        self.remove_vertices((vertex,))
+
+    # Removes the vertices and their edges in O(total degree): every edge is
+    # also stored at its other end (in incoming for a directed graph), so
+    # the back references are found without scanning the graph.
+    def remove_vertices(self, vertices):
+        removed = {}
+        for vertex in vertices:
+            if vertex in self.vertices:
+                removed[vertex] = (self.vertices.pop(vertex),
+                                   self.incoming.pop(vertex) if self.directed else None)
+        if not removed:
+            return
+        self.version += 1
+        for vertex, (neighbors, predecessors) in removed.items():
+            for neighbor in neighbors:
+                self._release_edge_id(vertex, neighbor)
+                if not self.directed:
+                    self._release_edge_id(neighbor, vertex)
+                if neighbor not in removed:
+                    del self.incoming[neighbor][vertex]
+            if predecessors is not None:
+                for predecessor in predecessors:
+                    self._release_edge_id(predecessor, vertex)
+                    if predecessor not in removed:
+                        del self.vertices[predecessor][vertex]
+
+        # observers only see the graph once no removed edge is left in it;
+        # an undirected edge between two removed vertices is reported once
+        done = set()
+        for vertex, (neighbors, predecessors) in removed.items():
+            for neighbor, old_cost in neighbors.items():
+                if self.directed or neighbor not in done:
+                    self._notify(vertex, neighbor, old_cost, None)
+            if predecessors is not None:
+                for predecessor, old_cost in predecessors.items():
+                    if predecessor not in removed:
+                        self._notify(predecessor, vertex, old_cost, None)
+            done.add(vertex)
+
+    # Graph on the given vertices with the edges between them and their
+    # attributes, built in one pass; vertices that are not in this graph are
+    # ignored.
+    def subgraph(self, vertices):
+        keep = dict.fromkeys(vertex for vertex in vertices if vertex in self.vertices)
+        graph = type(self)(self.directed)
+        for vertex in keep:
+            graph.vertices[vertex] = {neighbor: cost for neighbor, cost in self.vertices[vertex].items()
+                                      if neighbor in keep}
+            if self.directed:
+                graph.incoming[vertex] = {predecessor: cost for predecessor, cost in self.incoming[vertex].items()
+                                          if predecessor in keep}
+        if self.edge_ids:
+            new_ids = {}
+            for (vertex1, vertex2), edge_id in self.edge_ids.items():
+                if vertex1 in keep and vertex2 in keep:
+                    graph.edge_ids[vertex1, vertex2] = new_ids.setdefault(edge_id, len(new_ids))
+            graph.next_edge_id = len(new_ids)
+            for name, column in self.columns.items():
+                values = [column[edge_id] for edge_id in new_ids]
+                graph.columns[name] = array('d', values) if isinstance(column, array) else values
+        return graph
+
+    # Sets attribute columns of an existing edge (both directions unless
+    # directed). Numbers go into array('d') columns, anything else turns the
+    # column into a list; edges without a value hold nan or None.
+    def set_edge_attributes(self, vertex1, vertex2, directed=None, **attributes):
+        directed = self.directed if directed is None else directed and self.directed
+        edge_id = self.edge_ids.get((vertex1, vertex2))
+        if edge_id is None:
+            edge_id = self._new_edge_id()
+            self.edge_ids[vertex1, vertex2] = edge_id
+        if not directed:
+            self.edge_ids[vertex2, vertex1] = edge_id
+        for name, value in attributes.items():
+            column = self.columns.get(name)
+            if column is None:
+                size = self.next_edge_id
+                column = array('d', [NAN]) * size if isinstance(value, (int, float)) else [None] * size
+                self.columns[name] = column
+            elif isinstance(column, array) and not isinstance(value, (int, float)):
+                column = [None if item != item else item for item in column]
+                self.columns[name] = column
+            column[edge_id] = value
+        self.version += 1
+
+    # {name: value} of the edge's attributes, empty if it has none
+    def edge_attributes(self, vertex1, vertex2):
+        edge_id = self.edge_ids.get((vertex1, vertex2))
+        if edge_id is None:
+            return {}
+        return {name: column[edge_id] for name, column in self.columns.items()}
+
+    def _new_edge_id(self):
+        if self.free_edge_ids:
+            edge_id = self.free_edge_ids.pop()
+            for column in self.columns.values():
+                column[edge_id] = NAN if isinstance(column, array) else None
+            return edge_id
+        edge_id = self.next_edge_id
+        self.next_edge_id += 1
+        for column in self.columns.values():
+            column.append(NAN if isinstance(column, array) else None)
+        return edge_id
+
+    def _release_edge_id(self, vertex1, vertex2):
+        edge_id = self.edge_ids.pop((vertex1, vertex2), None)
+        # the id is free once neither direction uses it
+        if edge_id is not None and self.edge_ids.get((vertex2, vertex1)) != edge_id:
+            self.free_edge_ids.append(edge_id)
+
+    # Turns a search's `weight` argument into None (the cost given to
+    # add_edge) or a function (vertex1, vertex2, cost) -> cost of the edge
+    # vertex1 -> vertex2: a column name reads that attribute column, a
+    # callable is used as is. Edges without a value in the column (no
+    # attributes, nan or None) weigh their cost; a value that is not a
+    # number is a ValueError.
+    def _weight(self, weight):
+        if weight is None or callable(weight):
+            return weight
+        column = self.columns[weight]
+        edge_ids = self.edge_ids
+
+        def column_weight(vertex1, vertex2, cost):
+            edge_id = edge_ids.get((vertex1, vertex2))
+            if edge_id is None:
+                return cost
+            value = column[edge_id]
+            if value is None or value != value:
+                return cost
+            if not isinstance(value, (int, float)):
+                raise ValueError("edge %r -> %r has a %r of %r, not a number" % (vertex1, vertex2, weight, value))
+            return value
+        return column_weight
+
+    # Observers get edge_changed(vertex1, vertex2, old_cost, new_cost) after
+    # every edge change, old_cost is None for a new edge and new_cost None
+    # for a removed one. On a directed graph each direction is reported on
+    # its own.
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def _notify(self, vertex1, vertex2, old_cost, new_cost):
+        for observer in self.observers:
+            observer.edge_changed(vertex1, vertex2, old_cost, new_cost)
+    
+    def __str__(self):
+        result = ""
+        for vertex in self.vertices:
+            result += str(vertex) + " -> " + str(self.vertices[vertex]) + "\n"
+        return result
+
+    # compact read-only copy for searching large graphs, see csr_graph.py
+    def freeze(self):
+        from .csr_graph import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    # the graph and precomputed artefacts in one file that other processes
+    # map in place, see snapshot.py
+    def save_snapshot(self, path, heuristics=None, trees=None, landmarks=None, arrays=None):
+        from .snapshot import save_snapshot
+        save_snapshot(self, path, heuristics, trees, landmarks, arrays)
+
+    @classmethod
+    def from_snapshot(cls, path):
+        from .snapshot import load_snapshot
+        return load_snapshot(path).to_graph()
+
+    # Remember search results until the graph changes, see query_cache.py.
+    # Searches run with a tracer bypass the cache.
+    def enable_cache(self, maxsize=1024, max_trees=16):
+        self.cache = QueryCache(maxsize, max_trees)
+        return self.cache
+
+    def disable_cache(self):
+        self.cache = None
+
+    # dijkstra() from start_vertex, kept in the query cache when enabled; a
+    # cached tree also answers a_star_search and the bidirectional searches
+    # from the same start vertex
+    def shortest_path_tree(self, start_vertex):
+        cache = self.cache
+        if cache is None:
+            return self.dijkstra(start_vertex)
+        cache.check_version(self.version)
+        tree = cache.get_tree(start_vertex)
+        if tree is None:
+            tree = self.dijkstra(start_vertex)
+            cache.put_tree(start_vertex, tree)
+        return tree
+
+    @cached("dfs")
+    def dfs(self, start_vertex, goal_vertex, tracer=None, weight=None):
+        explored = set()
+        stack = [start_vertex]
+        parents = {start_vertex: None}
+        if tracer is not None:
+            tracer.start("dfs", start_vertex, goal_vertex)
+        while stack:
+            current_vertex = stack.pop()
+
+            if current_vertex in explored:
+                continue
+
+            explored.add(current_vertex)
+            if tracer is not None:
+                tracer.expand(current_vertex)
+
+            if current_vertex == goal_vertex:
+                return finish(tracer, self.construct_path(start_vertex, goal_vertex, parents, weight))
+            
+            for neighbor in self.vertices[current_vertex]:
+                if neighbor not in explored:
+                    parents[neighbor] = current_vertex
+                    stack.append(neighbor)
+                    if tracer is not None:
+                        tracer.push(neighbor)
+            if tracer is not None:
+                tracer.frontier(stack)
+
+        return finish(tracer, None)
+    
+    @cached("bfs")
+    def bfs(self, start_vertex, goal_vertex, tracer=None, weight=None):
+        explored = set()
+        queue = deque([start_vertex])
+        parents = {start_vertex: None}
+        if tracer is not None:
+            tracer.start("bfs", start_vertex, goal_vertex)
+        while queue:
+            current_vertex = queue.popleft()
+
+            if current_vertex in explored:
+                continue
+
+            explored.add(current_vertex)
+            if tracer is not None:
+                tracer.expand(current_vertex)
+
+            if current_vertex == goal_vertex:
+                return finish(tracer, self.construct_path(start_vertex, goal_vertex, parents, weight))
+            
+            for neighbor in self.vertices[current_vertex]:
+                if neighbor not in explored:
+                    parents[neighbor] = current_vertex
+                    queue.append(neighbor)
+                    if tracer is not None:
+                        tracer.push(neighbor)
+            if tracer is not None:
+                tracer.frontier(queue)
+
+        return finish(tracer, None)
+
+    @cached("greedy_search", heuristics=1)
+    def greedy_search(self, start_vertex, goal_vertex, heuristic, tracer=None, weight=None):
+        explored = set()
+        priorityQueue = PriorityQueue()
+        priorityQueue.put((heuristic[start_vertex], start_vertex))
+        parents = {start_vertex: None}
+        if tracer is not None:
+            tracer.start("greedy_search", start_vertex, goal_vertex)
+
+        while not priorityQueue.empty():
+            current_vertex = priorityQueue.get()[1]
+
+            if current_vertex in explored:
+                continue
+
+            explored.add(current_vertex)
+            if tracer is not None:
+                tracer.expand(current_vertex)
+
+            if current_vertex == goal_vertex:
+                return finish(tracer, self.construct_path(start_vertex, goal_vertex, parents, weight))
+
+            for neighbor in self.vertices[current_vertex]:
+                if neighbor not in explored:
+                    parents[neighbor] = current_vertex
+                    priorityQueue.put((heuristic[neighbor], neighbor))
+                    if tracer is not None:
+                        tracer.push(neighbor, heuristic[neighbor])
+            if tracer is not None:
+                tracer.frontier(priorityQueue)
+        return finish(tracer, None)
+
+    @cached("a_star_search", heuristics=1, optimal=True)
+    def a_star_search(self, start_vertex, goal_vertex, heuristic, tracer=None, weight=None):
+        explored = set()
+        priorityQueue = PriorityQueue(lazy=True)
+        priorityQueue.put((0, start_vertex))
+        g_scores = {start_vertex: 0}
+        parents = {start_vertex: None}
+        weight_of = self._weight(weight)
+        if tracer is not None:
+            tracer.start("a_star_search", start_vertex, goal_vertex)
+
+        while not priorityQueue.empty():
+            current_vertex = priorityQueue.get()[1]
+
+            if tracer is not None:
+                tracer.expand(current_vertex)
+
+            if current_vertex == goal_vertex:
+                return finish(tracer, self.construct_path(start_vertex, goal_vertex, parents, weight))
+
+            explored.add(current_vertex)
+
+            for neighbor, cost in self.vertices[current_vertex].items():
+                if neighbor in explored:
+                    continue
+
+                if weight_of is not None:
+                    cost = weight_of(current_vertex, neighbor, cost)
+                tentative_g_score = g_scores[current_vertex] + cost
+
+                if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
+                    parents[neighbor] = current_vertex
+                    g_scores[neighbor] = tentative_g_score
+                    f_score = tentative_g_score + heuristic[neighbor]
+                    if neighbor in priorityQueue:
+                        priorityQueue.decrease_key(neighbor, f_score)
+                    else:
+                        priorityQueue.put((f_score, neighbor))
+                    if tracer is not None:
+                        tracer.push(neighbor, f_score)
+            if tracer is not None:
+                tracer.frontier(priorityQueue)
+        return finish(tracer, None)
+
+    # Weighted A*: f = g + epsilon * h, so the search heads for the goal and
+    # expands far fewer vertices. With an admissible heuristic the path costs
+    # at most epsilon times the optimum; epsilon=1 is plain A*. A search that
+    # passes its deadline (a time.time() value) or max_expansions before
+    # reaching the goal returns None.
+    def weighted_a_star_search(self, start_vertex, goal_vertex, heuristic, epsilon=1.5, tracer=None, weight=None,
+                               deadline=None, max_expansions=None):
+        result = None
+        for result in self.anytime_a_star_search(start_vertex, goal_vertex, heuristic, epsilon, epsilon, tracer=tracer,
+                                                 weight=weight, deadline=deadline, max_expansions=max_expansions):
+            pass
+        return result[:2] if result is not None else None
+
+    # Anytime repairing A* (ARA*): a weighted A* with epsilon, then again with
+    # epsilon lowered by step until final_epsilon, each round reusing the
+    # g-scores of the previous ones and reopening only the vertices whose
+    # g-score went down after they were expanded. Yields (path, total_cost,
+    # bound) after every round that found a cheaper path or a tighter bound,
+    # the cost being at most bound times the optimum (bound 1: optimal) for
+    # an admissible heuristic.
+    #
+    # Once the deadline (a time.time() value) or max_expansions is reached,
+    # or the tracer raises SearchCancelled (see DeadlineTracer), the search
+    # stops, yielding first the path of the unfinished round if it is better.
+    def anytime_a_star_search(self, start_vertex, goal_vertex, heuristic, epsilon=3.0, final_epsilon=1.0, step=0.5,
+                              tracer=None, weight=None, deadline=None, max_expansions=None):
+        infinity = float("inf")
+        g_scores = {start_vertex: 0}
+        parents = {start_vertex: None}
+        weight_of = self._weight(weight)
+        priorityQueue = PriorityQueue(lazy=True)
+        priorityQueue.put((epsilon * heuristic[start_vertex], start_vertex))
+        explored, inconsistent = set(), set()
+        expansions, exhausted = 0, False
+        best = None
+        if tracer is not None:
+            tracer.start("anytime_a_star_search", start_vertex, goal_vertex)
+
+        # lowest g + h over the open and inconsistent vertices, a lower bound
+        # of the optimal cost; the bound of a goal g-score is g / that
+        def bound_of(goal_g_score):
+            lower = min((g_scores[vertex] + heuristic[vertex] for vertex in chain(priorityQueue, inconsistent)),
+                        default=infinity)
+            if goal_g_score <= lower:
+                return 1.0
+            return goal_g_score / lower if lower > 0 else infinity
+
+        def out_of_budget():
+            return max_expansions is not None and expansions >= max_expansions or \
+                deadline is not None and time.time() > deadline
+
+        while True:
+            goal_h = epsilon * heuristic[goal_vertex]
+            try:
+                while not priorityQueue.empty() and \
+                        g_scores.get(goal_vertex, infinity) + goal_h > priorityQueue.peek()[0]:
+                    if out_of_budget():
+                        exhausted = True
+                        break
+                    current_vertex = priorityQueue.get()[1]
+                    expansions += 1
+                    if tracer is not None:
+                        tracer.expand(current_vertex)
+                    explored.add(current_vertex)
+
+                    for neighbor, cost in self.vertices[current_vertex].items():
+                        if weight_of is not None:
+                            cost = weight_of(current_vertex, neighbor, cost)
+                        tentative_g_score = g_scores[current_vertex] + cost
+
+                        if tentative_g_score < g_scores.get(neighbor, infinity):
+                            parents[neighbor] = current_vertex
+                            g_scores[neighbor] = tentative_g_score
+                            if neighbor in explored:
+                                inconsistent.add(neighbor)
+                                continue
+                            f_score = tentative_g_score + epsilon * heuristic[neighbor]
+                            priorityQueue.put((f_score, neighbor))
+                            if tracer is not None:
+                                tracer.push(neighbor, f_score)
+                    if tracer is not None:
+                        tracer.frontier(priorityQueue)
+            except SearchCancelled:
+                exhausted = True
+
+            goal_g_score = g_scores.get(goal_vertex)
+            if goal_g_score is None:
+                break
+            if exhausted:
+                if best is None or goal_g_score < best[1]:
+                    path, total_cost = self.construct_path(start_vertex, goal_vertex, parents, weight)
+                    bound = bound_of(goal_g_score)
+                    best = path, total_cost, bound if best is None else min(bound, best[2])
+                    yield best
+                break
+            bound = min(epsilon, bound_of(goal_g_score))
+            if best is None or goal_g_score < best[1] or bound < best[2]:
+                path, total_cost = self.construct_path(start_vertex, goal_vertex, parents, weight)
+                best = path, total_cost, bound
+                yield best
+            # reopening costs a pass over the open vertices, not worth
+            # starting once the budget is gone
+            if epsilon <= final_epsilon or bound <= 1 or out_of_budget():
+                break
+
+            epsilon = max(final_epsilon, epsilon - step)
+            reopened = PriorityQueue(lazy=True)
+            for vertex in chain(priorityQueue, inconsistent):
+                reopened.put((g_scores[vertex] + epsilon * heuristic[vertex], vertex))
+            priorityQueue, explored, inconsistent = reopened, set(), set()
+        finish(tracer, best)
+
+    # the best (path, total_cost, bound) anytime_a_star_search finds by the
+    # deadline (a time.time() value) or within max_expansions, None if it
+    # found no path by then
+    def budgeted_a_star_search(self, start_vertex, goal_vertex, heuristic, deadline=None, max_expansions=None,
+                               epsilon=3.0, step=0.5, tracer=None, weight=None):
+        result = None
+        for result in self.anytime_a_star_search(start_vertex, goal_vertex, heuristic, epsilon, 1.0, step,
+                                                 tracer=tracer, weight=weight, deadline=deadline,
+                                                 max_expansions=max_expansions):
+            pass
+        return result
+
+    # Shortest path tree from start_vertex: (distances, parents) of every
+    # settled vertex. With targets given the search stops as soon as all of
+    # them are settled; unreached targets are missing from distances.
+    def dijkstra(self, start_vertex, targets=None, tracer=None, weight=None):
+        distances = {}
+        priorityQueue = PriorityQueue(lazy=True)
+        priorityQueue.put((0, start_vertex))
+        g_scores = {start_vertex: 0}
+        parents = {start_vertex: None}
+        remaining = None if targets is None else set(targets)
+        weight_of = self._weight(weight)
+        if tracer is not None:
+            tracer.start("dijkstra", start_vertex, None)
+
+        while not priorityQueue.empty():
+            distance, current_vertex = priorityQueue.get()
+            distances[current_vertex] = distance
+            if tracer is not None:
+                tracer.expand(current_vertex)
+
+            if remaining is not None:
+                remaining.discard(current_vertex)
+                if not remaining:
+                    break
+
+            for neighbor, cost in self.vertices[current_vertex].items():
+                if neighbor in distances:
+                    continue
+
+                if weight_of is not None:
+                    cost = weight_of(current_vertex, neighbor, cost)
+                tentative_g_score = distance + cost
+
+                if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
+                    parents[neighbor] = current_vertex
+                    g_scores[neighbor] = tentative_g_score
+                    if neighbor in priorityQueue:
+                        priorityQueue.decrease_key(neighbor, tentative_g_score)
+                    else:
+                        priorityQueue.put((tentative_g_score, neighbor))
+                    if tracer is not None:
+                        tracer.push(neighbor, tentative_g_score)
+            if tracer is not None:
+                tracer.frontier(priorityQueue)
+
+        parents = {vertex: parents[vertex] for vertex in distances}
+        return finish(tracer, (distances, parents))
+
+    # costs between every source and every target as a NumPy matrix, see
+    # distance_matrix.py
+    def distance_matrix(self, sources, targets, workers=1, predecessors=False):
+        from .distance_matrix import distance_matrix
+        return distance_matrix(self, sources, targets, workers, predecessors)
+
+    # Bidirectional Dijkstra: a forward search from the start and a backward
+    # search from the goal, stopped once the two frontiers prove that the best
+    # meeting point found so far cannot be improved.
+    @cached("bidirectional_dijkstra", optimal=True)
+    def bidirectional_dijkstra(self, start_vertex, goal_vertex, tracer=None, weight=None):
+        return self._bidirectional_search(start_vertex, goal_vertex, None, "bidirectional_dijkstra", tracer, weight)
+
+    # Bidirectional A* with average potentials: heuristic estimates the cost to
+    # the goal, reverse_heuristic the cost to the start. Both searches use the
+    # potential p(v) = (heuristic[v] - reverse_heuristic[v]) / 2 (negated for the
+    # backward search), which is consistent whenever both heuristics are, so the
+    # usual bidirectional Dijkstra stopping rule stays exact.
+    @cached("bidirectional_a_star_search", heuristics=2, optimal=True)
+    def bidirectional_a_star_search(self, start_vertex, goal_vertex, heuristic, reverse_heuristic, tracer=None,
+                                    weight=None):
+        def potential(vertex):
+            return (heuristic[vertex] - reverse_heuristic[vertex]) / 2
+        return self._bidirectional_search(start_vertex, goal_vertex, potential, "bidirectional_a_star_search",
+                                          tracer, weight)
+
+    def _bidirectional_search(self, start_vertex, goal_vertex, potential, algorithm, tracer, weight):
+        if tracer is not None:
+            tracer.start(algorithm, start_vertex, goal_vertex)
+        if start_vertex == goal_vertex:
+            return finish(tracer, ([start_vertex], 0))
+
+        # index 0 is the forward search, index 1 the backward one; the backward
+        # search follows edges in reverse and its potential is the negated
+        # forward potential
+        sign = (1, -1)
+        adjacency = (self.vertices, self.incoming)
+        weight_of = self._weight(weight)
+        queues = (PriorityQueue(lazy=True), PriorityQueue(lazy=True))
+        g_scores = ({start_vertex: 0}, {goal_vertex: 0})
+        parents = ({start_vertex: None}, {goal_vertex: None})
+        explored = (set(), set())
+        potentials = {}
+
+        def key(side, vertex, g_score):
+            if potential is None:
+                return g_score
+            if vertex not in potentials:
+                potentials[vertex] = potential(vertex)
+            return g_score + sign[side] * potentials[vertex]
+
+        queues[0].put((key(0, start_vertex, 0), start_vertex))
+        queues[1].put((key(1, goal_vertex, 0), goal_vertex))
+        best_cost = float("inf")
+        meeting_vertex = None
+
+        while not queues[0].empty() and not queues[1].empty():
+            top_forward = queues[0].peek()[0]
+            top_backward = queues[1].peek()[0]
+            if top_forward + top_backward >= best_cost:
+                break
+
+            side = 0 if top_forward <= top_backward else 1
+            other = 1 - side
+            current_vertex = queues[side].get()[1]
+            explored[side].add(current_vertex)
+            if tracer is not None:
+                tracer.expand(current_vertex)
+
+            for neighbor, cost in adjacency[side][current_vertex].items():
+                if neighbor in explored[side]:
+                    continue
+
+                if weight_of is not None:
+                    cost = (weight_of(current_vertex, neighbor, cost) if side == 0
+                            else weight_of(neighbor, current_vertex, cost))
+                tentative_g_score = g_scores[side][current_vertex] + cost
+
+                if neighbor not in g_scores[side] or tentative_g_score < g_scores[side][neighbor]:
+                    parents[side][neighbor] = current_vertex
+                    g_scores[side][neighbor] = tentative_g_score
+                    f_score = key(side, neighbor, tentative_g_score)
+                    if neighbor in queues[side]:
+                        queues[side].decrease_key(neighbor, f_score)
+                    else:
+                        queues[side].put((f_score, neighbor))
+                    if tracer is not None:
+                        tracer.push(neighbor, f_score)
+
+                    if neighbor in g_scores[other]:
+                        total = tentative_g_score + g_scores[other][neighbor]
+                        if total < best_cost:
+                            best_cost = total
+                            meeting_vertex = neighbor
+            if tracer is not None:
+                tracer.frontier(queues[side])
+
+        if meeting_vertex is None:
+            return finish(tracer, None)
+
+        path, total_cost = self.construct_path(start_vertex, meeting_vertex, parents[0], weight)
+        current_vertex = meeting_vertex
+        while current_vertex != goal_vertex:
+            parent_vertex = parents[1][current_vertex]
+            cost = self.vertices[current_vertex][parent_vertex]
+            total_cost += cost if weight_of is None else weight_of(current_vertex, parent_vertex, cost)
+            path.append(parent_vertex)
+            current_vertex = parent_vertex
+        return finish(tracer, (path, total_cost))
+
+    def construct_path(self, start_vertex, goal_vertex, parents, weight=None):
+        weight_of = self._weight(weight)
+        path = []
+        total_cost = 0
+        current_vertex = goal_vertex
+        while current_vertex != start_vertex:
+            path.append(current_vertex)
+            parent_vertex = parents[current_vertex]
+            cost = self.vertices[parent_vertex][current_vertex]
+            total_cost+= cost if weight_of is None else weight_of(parent_vertex, current_vertex, cost)
+            current_vertex = parent_vertex
+        path.append(start_vertex)
+        path.reverse()
+        return path, total_cost
+
+def luxembourg_railway():
+    graph = Graph()
+
+    cities = [
+        "Luxembourg", "Ettelbruck", "Diekirch", "Wasserbillig", "Differdange", "Esch-sur-Alzette",
+        "Rodange", "Pétange", "Schifflange", "Bettembourg", "Mersch", "Troisvierges"
+    ]
+
+    for city in cities:
+        graph.add_vertex(city)
+
+    connections = [
+        ("Luxembourg", "Ettelbruck", 37),
+        ("Luxembourg", "Wasserbillig", 34),
+        ("Luxembourg", "Bettembourg", 17),
+        ("Ettelbruck", "Diekirch", 10),
+        ("Ettelbruck", "Mersch", 24),
+        ("Mersch", "Luxembourg", 19),
+        ("Wasserbillig", "Diekirch", 35),
+        ("Wasserbillig", "Bettembourg", 31),
+        ("Diekirch", "Troisvierges", 46),
+        ("Bettembourg", "Esch-sur-Alzette", 13),
+        ("Esch-sur-Alzette", "Schifflange", 4),
+        ("Esch-sur-Alzette", "Differdange", 16),
+        ("Esch-sur-Alzette", "Pétange", 17),
+        ("Pétange", "Rodange", 4),
+        ("Differdange", "Rodange", 12),
+        ("Differdange", "Pétange", 13),
+        ("Schifflange", "Bettembourg", 11),
+    ]
+
+    for connection in connections:
+        graph.add_edge(connection[0], connection[1], connection[2])
+
+    heuristics = {
+        "Luxembourg": 93,
+        "Ettelbruck": 56,
+        "Diekirch": 46,
+        "Wasserbillig": 81,
+        "Differdange": 141,
+        "Esch-sur-Alzette": 125,
+        "Rodange": 146,
+        "Pétange": 142,
+        "Schifflange": 123,
+        "Bettembourg": 112,
+        "Mersch": 80,
+        "Troisvierges": 0,
+    }
+
+    return graph, heuristics
+
+def test1_luxembourg_railway():
+    graph, heuristics = luxembourg_railway()
+    start_station = "Esch-sur-Alzette"
+
+    print("\nLuxembourg Railway Test\nEsch-sur-Alzette to Troisvierges")
+    print("\nDFS:")
+    path_dfs, total_cost = graph.dfs(start_station, "Troisvierges", tracer=PrintTracer())
+    print("Path: ", path_dfs)
+    print("Total cost:", total_cost)
+
+    print("\nBFS:")
+    path_bfs, total_cost = graph.bfs(start_station, "Troisvierges", tracer=PrintTracer())
+    print("Path: ", path_bfs)
+    print("Total cost:", total_cost)
+
+    print("\nGreedy Search:")
+    path_greedy, total_cost = graph.greedy_search(start_station, "Troisvierges", heuristics, tracer=PrintTracer())
+    print("Path: ", path_greedy)
+    print("Total cost:", total_cost)
+
+    print("\nA* Search:")
+    path_a_star, total_cost = graph.a_star_search(start_station, "Troisvierges", heuristics, tracer=PrintTracer())
+    print("Path: ", path_a_star)
+    print("Total cost:", total_cost)
+
+def test2_luxembourg_railway():
+    graph, heuristics = luxembourg_railway()
+    start_station = "Luxembourg"
+
+    print("\nLuxembourg Railway Test 2\nLuxembourg to Troisvierges")
+    print("\nDFS:")
+    path_dfs, total_cost = graph.dfs(start_station, "Troisvierges", tracer=PrintTracer())
+    print("Path: ", path_dfs)
+    print("Total cost:", total_cost)
+
+    print("\nBFS:")
+    path_bfs, total_cost = graph.bfs(start_station, "Troisvierges", tracer=PrintTracer())
+    print("Path: ", path_bfs)
+    print("Total cost:", total_cost)
+
+    print("\nGreedy Search:")
+    path_greedy, total_cost = graph.greedy_search(start_station, "Troisvierges", heuristics, tracer=PrintTracer())
+    print("Path: ", path_greedy)
+    print("Total cost:", total_cost)
+
+    print("\nA* Search:")
+    path_a_star, total_cost = graph.a_star_search(start_station, "Troisvierges", heuristics, tracer=PrintTracer())
+    print("Path: ", path_a_star)
+    print("Total cost:", total_cost)
+
+def test3_luxembourg_railway():
+    graph, heuristics = luxembourg_railway()
+    start_station = "Bettembourg"
+
+    print("\nLuxembourg Railway Test 3\nBettembourg to Troisvierges")
+    print("\nDFS:")
+    path_dfs, total_cost = graph.dfs(start_station, "Troisvierges", tracer=PrintTracer())
+    print("Path: ", path_dfs)
+    print("Total cost:", total_cost)
+
+    print("\nBFS:")
+    path_bfs, total_cost = graph.bfs(start_station, "Troisvierges", tracer=PrintTracer())
+    print("Path: ", path_bfs)
+    print("Total cost:", total_cost)
+
+    print("\nGreedy Search:")
+    path_greedy, total_cost = graph.greedy_search(start_station, "Troisvierges", heuristics, tracer=PrintTracer())
+    print("Path: ", path_greedy)
+    print("Total cost:", total_cost)
+
+    print("\nA* Search:")
+    path_a_star, total_cost = graph.a_star_search(start_station, "Troisvierges", heuristics, tracer=PrintTracer())
+    print("Path: ", path_a_star)
+    print("Total cost:", total_cost)
+
+def check_symmetric(graph):
+    for vertex, neighbors in graph.vertices.items():
+        for neighbor, cost in neighbors.items():
+            assert neighbor in graph.vertices, (vertex, neighbor)
+            assert graph.vertices[neighbor].get(vertex) == cost, (vertex, neighbor)
+
+def test4_remove_vertices():
+    graph, heuristics = luxembourg_railway()
+
+    print("\nRemove Vertices Test")
+    graph.remove_vertex("Luxembourg")
+    assert "Luxembourg" not in graph.vertices
+    check_symmetric(graph)
+
+    graph.remove_vertices(["Esch-sur-Alzette", "Pétange", "Nowhere"])
+    assert "Esch-sur-Alzette" not in graph.vertices and "Pétange" not in graph.vertices
+    assert graph.vertices["Rodange"] == {"Differdange": 12}
+    check_symmetric(graph)
+
+    subgraph = graph.subgraph(["Ettelbruck", "Diekirch", "Mersch", "Troisvierges", "Luxembourg"])
+    assert sorted(subgraph.vertices) == ["Diekirch", "Ettelbruck", "Mersch", "Troisvierges"]
+    assert subgraph.vertices["Ettelbruck"] == {"Diekirch": 10, "Mersch": 24}
+    check_symmetric(subgraph)
+    check_symmetric(graph)
+    print(subgraph)
+
+def test5_directed_edges():
+    graph, heuristics = luxembourg_railway()
+    for city, neighbors in graph.vertices.items():
+        for neighbor, cost in neighbors.items():
+            graph.set_edge_attributes(city, neighbor, time=cost * 0.5 if "Luxembourg" in (city, neighbor) else cost)
+
+    print("\nDirected Edges Test")
+    path, total_cost = graph.a_star_search("Luxembourg", "Troisvierges", heuristics)
+    print("Path: ", path, "Total cost:", total_cost)
+    path, total_time = graph.bidirectional_dijkstra("Luxembourg", "Troisvierges", weight="time")
+    print("Fastest: ", path, "Total time:", total_time)
+    assert total_time <= total_cost
+
+    one_way = Graph(directed=True)
+    for city in graph.vertices:
+        one_way.add_vertex(city)
+    for city, neighbors in graph.vertices.items():
+        for neighbor, cost in neighbors.items():
+            one_way.add_edge(city, neighbor, cost, **graph.edge_attributes(city, neighbor))
+    one_way.remove_edge("Ettelbruck", "Diekirch")
+    assert "Diekirch" not in one_way.vertices["Ettelbruck"] and "Ettelbruck" in one_way.vertices["Diekirch"]
+
+    path, total_cost = one_way.a_star_search("Luxembourg", "Troisvierges", heuristics)
+    print("One way Ettelbruck <- Diekirch: ", path, "Total cost:", total_cost)
+    assert one_way.bidirectional_dijkstra("Luxembourg", "Troisvierges")[1] == total_cost
+    print("Back: ", one_way.a_star_search("Troisvierges", "Luxembourg", {city: 0 for city in graph.vertices}))
+
+def test6_anytime_search():
+    graph, heuristics = luxembourg_railway()
+
+    print("\nAnytime Search Test\nEsch-sur-Alzette to Troisvierges")
+    path, optimal_cost = graph.a_star_search("Esch-sur-Alzette", "Troisvierges", heuristics)
+    path, total_cost = graph.weighted_a_star_search("Esch-sur-Alzette", "Troisvierges", heuristics, epsilon=2.0)
+    print("Weighted A* (epsilon 2): ", path, "Total cost:", total_cost)
+    assert total_cost <= 2.0 * optimal_cost
+
+    for path, total_cost, bound in graph.anytime_a_star_search("Esch-sur-Alzette", "Troisvierges", heuristics):
+        print("ARA*: ", path, "Total cost:", total_cost, "Bound: %.3f" % bound)
+        assert total_cost <= bound * optimal_cost
+    assert total_cost == optimal_cost and bound == 1
+
+    assert graph.budgeted_a_star_search("Esch-sur-Alzette", "Troisvierges", heuristics, max_expansions=1) is None
+    path, total_cost, bound = graph.budgeted_a_star_search("Esch-sur-Alzette", "Troisvierges", heuristics,
+                                                           max_expansions=6)
+    print("ARA* within 6 expansions: ", path, "Total cost:", total_cost, "Bound: %.3f" % bound)
+    assert total_cost <= bound * optimal_cost
+
+
+def test7_snapshot():
+    import os
+    import tempfile
+    from .snapshot import load_snapshot
+    graph, heuristics = luxembourg_railway()
+
+    print("\nSnapshot Test\nLuxembourg to Troisvierges")
+    path = os.path.join(tempfile.mkdtemp(), "railway.snap")
+    graph.save_snapshot(path, heuristics={"Troisvierges": heuristics},
+                        trees={"Luxembourg": graph.shortest_path_tree("Luxembourg")})
+    snapshot = load_snapshot(path)
+    path_found, total_cost = snapshot.graph.a_star_search("Luxembourg", "Troisvierges",
+                                                          snapshot.heuristics["Troisvierges"])
+    print("A* on the mapped snapshot: ", path_found, "Total cost:", total_cost)
+    assert (path_found, total_cost) == graph.a_star_search("Luxembourg", "Troisvierges", heuristics)
+
+    restored = snapshot.to_graph()
+    assert restored.vertices == graph.vertices
+    print("Restored graph, cached tree: ", restored.a_star_search("Luxembourg", "Rodange", heuristics))
+    assert restored.cache.tree_hits == 1
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+
+def main():
+    test1_luxembourg_railway()
+    test2_luxembourg_railway()
+    test3_luxembourg_railway()
+    test4_remove_vertices()
+    test5_directed_edges()
+    test6_anytime_search()
+    test7_snapshot()
+
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,129 @@
+# Shortest path tree from one source, kept up to date while the graph changes.
+#
+#   tree = DynamicShortestPathTree(graph, "Luxembourg")
+#   graph.remove_edge("Ettelbruck", "Diekirch")     # the tree repairs itself
+#   path, total_cost = tree.path("Troisvierges")
+#
+# The tree registers itself as an observer of the Graph and is told about
+# every edge insertion, deletion and cost change (Graph.add_observer), on
+# undirected and directed graphs. A change only costs work in the region
+# whose distances actually change:
+#  - cheaper or new edge (u, v): if it improves v, Dijkstra runs from v and
+#    only continues through vertices that get a shorter distance
+#  - dearer or removed tree edge (u, v): the subtree below v is the only
+#    part that can get longer; its distances are dropped, each vertex of it
+#    is seeded with its best edge from outside the subtree and Dijkstra
+#    re-settles the subtree alone
+#  - dearer or removed edge outside the tree: nothing to do
+# `settled` counts the vertices re-settled by the last change.
+from .PriorityQueue import PriorityQueue
+
+INFINITY = float("inf")
+
+
+class DynamicShortestPathTree:
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.distances, self.parents = graph.dijkstra(source)
+        self.children = {vertex: set() for vertex in self.distances}
+        for vertex, parent in self.parents.items():
+            if parent is not None:
+                self.children[parent].add(vertex)
+        self.settled = 0
+        graph.add_observer(self)
+
+    # stop following the graph's changes
+    def close(self):
+        self.graph.remove_observer(self)
+
+    def __contains__(self, vertex):
+        return vertex in self.distances
+
+    def distance(self, vertex):
+        return self.distances.get(vertex, INFINITY)
+
+    # (path, total_cost) from the source, None if goal is unreachable
+    def path(self, goal):
+        if goal not in self.distances:
+            return None
+        return self.graph.construct_path(self.source, goal, self.parents)
+
+    # observer callback; old_cost is None for a new edge, new_cost None for a
+    # removed one
+    def edge_changed(self, vertex1, vertex2, old_cost, new_cost):
+        self.settled = 0
+        if old_cost is not None and (new_cost is None or new_cost > old_cost):
+            if vertex2 in self.distances and self.parents[vertex2] == vertex1:
+                self._increase(vertex2)
+            elif (not self.graph.directed and vertex1 in self.distances
+                  and self.parents[vertex1] == vertex2):
+                self._increase(vertex1)
+        if new_cost is not None and (old_cost is None or new_cost < old_cost):
+            self._decrease(vertex1, vertex2, new_cost)
+
+    def _set(self, vertex, distance, parent):
+        old_parent = self.parents.get(vertex)
+        if old_parent is not None and old_parent in self.children:
+            self.children[old_parent].discard(vertex)
+        self.distances[vertex] = distance
+        self.parents[vertex] = parent
+        self.children[parent].add(vertex)
+        if vertex not in self.children:
+            self.children[vertex] = set()
+
+    # a vertex being removed from the graph has no edges left
+    def _neighbors(self, vertex):
+        return self.graph.vertices.get(vertex, {}).items()
+
+    def _predecessors(self, vertex):
+        return self.graph.incoming.get(vertex, {}).items()
+
+    def _decrease(self, vertex1, vertex2, cost):
+        queue = PriorityQueue(lazy=True)
+        edges = ((vertex1, vertex2),) if self.graph.directed else ((vertex1, vertex2), (vertex2, vertex1))
+        for u, v in edges:
+            if u in self.distances and self.distances[u] + cost < self.distance(v):
+                self._set(v, self.distances[u] + cost, u)
+                queue.put((self.distances[v], v))
+        self._propagate(queue)
+
+    def _increase(self, root):
+        affected = [root]
+        for vertex in affected:
+            affected.extend(self.children[vertex])
+        for vertex in affected:
+            parent = self.parents.pop(vertex)
+            if parent in self.children:
+                self.children[parent].discard(vertex)
+            del self.distances[vertex]
+        for vertex in affected:
+            self.children[vertex] = set()
+
+        # the rest of the tree is still exact: seed every affected vertex with
+        # its best edge from outside the subtree
+        queue = PriorityQueue(lazy=True)
+        for vertex in affected:
+            best, best_parent = INFINITY, None
+            for predecessor, cost in self._predecessors(vertex):
+                if predecessor in self.distances and self.distances[predecessor] + cost < best:
+                    best, best_parent = self.distances[predecessor] + cost, predecessor
+            if best_parent is not None:
+                self._set(vertex, best, best_parent)
+                queue.put((best, vertex))
+        self._propagate(queue)
+        # whatever was not reached is now disconnected from the source
+        for vertex in affected:
+            if vertex not in self.distances:
+                del self.children[vertex]
+
+    # Dijkstra over the vertices whose distance went down
+    def _propagate(self, queue):
+        while not queue.empty():
+            distance, vertex = queue.get()
+            self.settled += 1
+            for neighbor, cost in self._neighbors(vertex):
+                candidate = distance + cost
+                if candidate < self.distance(neighbor):
+                    self._set(neighbor, candidate, vertex)
+                    queue.put((candidate, neighbor))
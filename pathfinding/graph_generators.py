@@ -0,0 +1,160 @@
+# Synthetic inputs for the benchmarks. Everything is seeded, so the same
+# arguments always give the same graph.
+#
+# Graphs (dorian.Graph), returned as (graph, points) where points maps every
+# vertex to its (x, y) position, or None when the graph has no geometry:
+#  - random_geometric_graph: points in the unit square joined when closer
+#    than a radius that gives about `degree` neighbors, euclidean costs
+#  - grid_graph: the free cells of a grid as vertices (row, col), unit
+#    costs between 4-connected free neighbors; points are the cells
+#  - scale_free_graph: Barabasi-Albert preferential attachment, hubs with
+#    very high degree, random integer costs, no geometry
+#  - railway_graph: stations in a plane joined like a rail network, a
+#    spanning tree of short links plus a few loops, integer km costs that
+#    are never below the straight line distance (like luxembourg_railway)
+#
+# Grids (lists of rows, 0 = free, 1 = obstacle, as in lab2_codev3.py):
+# open_grid, random_grid (obstacle density), maze_grid (one cell corridors).
+import math
+import random
+
+from .dorian import Graph
+
+
+def random_geometric_graph(n, seed=0, degree=8):
+    rng = random.Random(seed)
+    radius = math.sqrt(degree / (math.pi * n))
+    points = {i: (rng.random(), rng.random()) for i in range(n)}
+    cells = {}
+    for i, (x, y) in points.items():
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+    edges = []
+    for i, (x, y) in points.items():
+        cx, cy = int(x / radius), int(y / radius)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in cells.get((cx + dx, cy + dy), []):
+                    distance = math.dist(points[i], points[j])
+                    if i < j and distance < radius:
+                        edges.append((i, j, distance))
+    return Graph.from_edges(edges, points), points
+
+
+def open_grid(size):
+    return [[0] * size for _ in range(size)]
+
+
+def random_grid(size, density=0.2, seed=0):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+
+
+# perfect maze carved by a randomized depth-first search, corridors one cell wide
+def maze_grid(size, seed=0):
+    rng = random.Random(seed)
+    grid = [[1] * size for _ in range(size)]
+    grid[0][0] = 0
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc, dr, dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 <= row + dr < size and 0 <= col + dc < size and grid[row + dr][col + dc] == 1]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col, dr, dc = rng.choice(options)
+        grid[row + dr // 2][col + dc // 2] = 0
+        grid[next_row][next_col] = 0
+        stack.append((next_row, next_col))
+    return grid
+
+
+# Graph of a grid's free cells; with size given a random_grid(size, density)
+# is generated first. Returns (graph, grid).
+def grid_graph(grid=None, size=None, density=0.2, seed=0):
+    if grid is None:
+        grid = random_grid(size, density, seed)
+    rows, cols = len(grid), len(grid[0]) if grid else 0
+    free = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] != 1]
+    edges = []
+    for r, c in free:
+        if r + 1 < rows and grid[r + 1][c] != 1:
+            edges.append(((r, c), (r + 1, c), 1))
+        if c + 1 < cols and grid[r][c + 1] != 1:
+            edges.append(((r, c), (r, c + 1), 1))
+    return Graph.from_edges(edges, free), grid
+
+
+def scale_free_graph(n, m=2, seed=0, max_cost=10):
+    rng = random.Random(seed)
+    # every vertex appears in `ends` once per incident edge, so a uniform
+    # pick from it is a pick proportional to degree
+    ends = []
+    edges = []
+    for vertex in range(min(n, m + 1)):
+        for other in range(vertex):
+            edges.append((vertex, other, rng.randint(1, max_cost)))
+            ends += (vertex, other)
+    for vertex in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(ends))
+        for target in targets:
+            edges.append((vertex, target, rng.randint(1, max_cost)))
+            ends += (vertex, target)
+    return Graph.from_edges(edges, range(n)), None
+
+
+# Stations spread over a square of `size` km, linked to nearby stations by
+# the spanning tree of the shortest candidate links (Kruskal over each
+# station's `nearest` closest neighbors), plus `loops` of the remaining
+# candidates as extra connections.
+def railway_graph(n, seed=0, size=None, nearest=4, loops=0.15):
+    rng = random.Random(seed)
+    size = size if size is not None else 3 * math.sqrt(n)
+    points = {i: (rng.uniform(0, size), rng.uniform(0, size)) for i in range(n)}
+
+    cell = size / max(1, math.sqrt(n / 4))
+    cells = {}
+    for i, (x, y) in points.items():
+        cells.setdefault((int(x / cell), int(y / cell)), []).append(i)
+    candidates = set()
+    for i, (x, y) in points.items():
+        cx, cy = int(x / cell), int(y / cell)
+        ring = 1
+        while True:
+            near = [j for dx in range(-ring, ring + 1) for dy in range(-ring, ring + 1)
+                    for j in cells.get((cx + dx, cy + dy), []) if j != i]
+            if len(near) >= nearest or ring * cell > size:
+                break
+            ring += 1
+        near.sort(key=lambda j: math.dist(points[i], points[j]))
+        for j in near[:nearest]:
+            candidates.add((min(i, j), max(i, j)))
+
+    candidates = sorted(candidates, key=lambda edge: math.dist(points[edge[0]], points[edge[1]]))
+    parents = list(range(n))
+
+    def root(vertex):
+        while parents[vertex] != vertex:
+            parents[vertex] = parents[parents[vertex]]
+            vertex = parents[vertex]
+        return vertex
+
+    edges = []
+    extra = []
+    for i, j in candidates:
+        cost = math.ceil(math.dist(points[i], points[j]))
+        a, b = root(i), root(j)
+        if a != b:
+            parents[a] = b
+            edges.append((i, j, cost))
+        else:
+            extra.append((i, j, cost))
+    edges += rng.sample(extra, int(len(extra) * loops))
+    return Graph.from_edges(edges, points), points
+
+
+# {vertex: [neighbors]} of a Graph, the input of lab2_codev1/2
+def adjacency_lists(graph):
+    return {vertex: list(neighbors) for vertex, neighbors in graph.vertices.items()}
@@ -0,0 +1,231 @@
+# Bulk graph loading.
+#
+# Edge lists: one edge per line, "source<delimiter>target[<delimiter>cost]",
+# comma separated (.csv) or tab separated (.tsv and anything else), a
+# missing cost counts as 1. read_edge_list() streams them in chunks, so a
+# file is never held in memory as a whole:
+#
+#   graph = Graph.from_edges(edge for chunk in read_edge_list("network.csv") for edge in chunk)
+#
+# Binary CSR files hold a CSRGraph (see csr_graph.py) as raw little-endian
+# arrays. load_binary() maps the file with mmap and uses the arrays in place,
+# nothing is parsed or copied, so start-up does not depend on the graph
+# size (vertex names named 0..n-1 are not even stored). edge_list_to_csr()
+# builds the CSR arrays straight from an edge list, without the
+# dict-of-dicts Graph in between:
+#
+#   save_binary(edge_list_to_csr("network.csv"), "network.csrg")
+#   graph = load_binary("network.csrg")      # a CSRGraph
+#
+# usage: python -m pathfinding.graph_io [--numeric-names] network.csv network.csrg
+import csv
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from .csr_graph import CSRGraph
+
+MAGIC = b"CSRG"
+FORMAT_VERSION = 1
+# magic, version, weight typecode, identity names flag, directed flag, vertices,
+# edges, names bytes
+HEADER = struct.Struct("<4sIccc5xqqq")
+# directed flag: files written before it existed have 0 there
+DIRECTED_FLAGS = {None: b"\0", False: b"\1", True: b"\2"}
+
+
+def _number(text):
+    # padded fields (" 3", "3\r") stay integers
+    text = text.strip()
+    if text.lstrip("-").isdigit():
+        return int(text)
+    return float(text)
+
+
+def _delimiter(path, delimiter):
+    if delimiter is not None:
+        return delimiter
+    return "," if str(path).endswith(".csv") else "\t"
+
+
+# Yields lists of up to chunk_size (source, target, cost) tuples. Vertex
+# names are kept as strings unless numeric_names is set.
+def read_edge_list(path, delimiter=None, chunk_size=100000, skip_header=False, numeric_names=False):
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file, delimiter=_delimiter(path, delimiter))
+        if skip_header:
+            next(reader, None)
+        chunk = []
+        for row in reader:
+            if not row or row[0].startswith("#"):
+                continue
+            source, target = row[0], row[1]
+            if numeric_names:
+                source, target = int(source), int(target)
+            chunk.append((source, target, _number(row[2]) if len(row) > 2 else 1))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+# CSRGraph from a stream of (source, target, cost) edges, each edge stored in
+# both directions as Graph.add_edge does. Neighbors keep the input order.
+# With numeric_names the names are taken as the vertex ids: the graph has
+# vertices 0..max name and needs no name table.
+def edges_to_csr(edges, directed=False, numeric_names=False):
+    ids = {}
+    names = []
+    sources = array('q')
+    targets = array('q')
+    # integer costs stay integral until the first one that is not
+    costs = array('q')
+    for source, target, cost in edges:
+        if not numeric_names:
+            if source not in ids:
+                ids[source] = len(names)
+                names.append(source)
+            if target not in ids:
+                ids[target] = len(names)
+                names.append(target)
+            source, target = ids[source], ids[target]
+        sources.append(source)
+        targets.append(target)
+        try:
+            costs.append(cost)
+        except (TypeError, OverflowError):
+            costs = array('d', costs)
+            costs.append(cost)
+    if numeric_names:
+        n = max(max(sources, default=-1), max(targets, default=-1)) + 1
+        names, ids = range(n), IdentityIds(n)
+    else:
+        n, ids = len(names), None
+    # an undirected edge is sorted in a second pass the other way round,
+    # instead of doubling the edge arrays
+    passes = [(sources, targets)] if directed else [(sources, targets), (targets, sources)]
+
+    # counting sort of the edges by source vertex
+    offsets = array('q', [0]) * (n + 1)
+    for tails, _ in passes:
+        for source in tails:
+            offsets[source + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    positions = offsets[:-1]
+    sorted_targets = array('q', [0]) * offsets[n]
+    sorted_weights = array(costs.typecode, [0]) * offsets[n]
+    for tails, heads in passes:
+        for source, target, cost in zip(tails, heads, costs):
+            position = positions[source]
+            sorted_targets[position] = target
+            sorted_weights[position] = cost
+            positions[source] = position + 1
+    return CSRGraph(names, offsets, sorted_targets, sorted_weights, ids, directed)
+
+
+def edge_list_to_csr(path, delimiter=None, skip_header=False, numeric_names=False, directed=False):
+    chunks = read_edge_list(path, delimiter, skip_header=skip_header, numeric_names=numeric_names)
+    return edges_to_csr((edge for chunk in chunks for edge in chunk), directed, numeric_names)
+
+
+# names 0..n-1 need no table: the name is the id
+class IdentityIds:
+    def __init__(self, n):
+        self.n = n
+
+    def __getitem__(self, vertex):
+        if isinstance(vertex, int) and 0 <= vertex < self.n:
+            return vertex
+        raise KeyError(vertex)
+
+    def __contains__(self, vertex):
+        return isinstance(vertex, int) and 0 <= vertex < self.n
+
+    def get(self, vertex, default=None):
+        return vertex if vertex in self else default
+
+    def __len__(self):
+        return self.n
+
+
+def _typecode(buffer):
+    return buffer.typecode if isinstance(buffer, array) else buffer.format
+
+
+def save_binary(graph, path):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_graph(graph)
+    n, m = len(graph.names), len(graph.targets)
+    identity = all(name == i and isinstance(name, int) for i, name in enumerate(graph.names))
+    names = b"" if identity else json.dumps(list(graph.names)).encode("utf-8")
+    names += b"\0" * (-len(names) % 8)
+    typecode = _typecode(graph.weights)
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, typecode.encode(), b"\1" if identity else b"\0",
+                               DIRECTED_FLAGS[graph.directed], n, m, len(names)))
+        file.write(names)
+        for buffer in (graph.offsets, graph.targets, graph.weights):
+            file.write(buffer if sys.byteorder == "little" else _little_endian(buffer))
+
+
+# JSON turns tuple names (grid cells) into lists, which are not hashable
+def _tuples(value):
+    if isinstance(value, list):
+        return tuple(_tuples(item) for item in value)
+    return value
+
+
+def _little_endian(buffer):
+    copy = array(_typecode(buffer), buffer)
+    copy.byteswap()
+    return copy
+
+
+def load_binary(path):
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, typecode, identity, directed, n, m, names_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("%s is not a version %d CSR graph file" % (path, FORMAT_VERSION))
+    if sys.byteorder != "little":
+        raise ValueError("binary CSR graphs can only be mapped on little-endian machines")
+
+    view = memoryview(data)
+    position = HEADER.size
+    if identity == b"\1":
+        names = range(n)
+        ids = IdentityIds(n)
+    else:
+        names = [_tuples(name) for name in
+                 json.loads(bytes(view[position:position + names_size]).rstrip(b"\0").decode("utf-8"))]
+        ids = None
+    position += names_size
+    offsets = view[position:position + 8 * (n + 1)].cast('q')
+    position += 8 * (n + 1)
+    targets = view[position:position + 8 * m].cast('q')
+    position += 8 * m
+    weights = view[position:position + 8 * m].cast(typecode.decode())
+    directed = {flag: value for value, flag in DIRECTED_FLAGS.items()}[directed]
+    return CSRGraph(names, offsets, targets, weights, ids, directed)
+
+
+def main(arguments):
+    numeric_names = "--numeric-names" in arguments
+    arguments = [argument for argument in arguments if argument != "--numeric-names"]
+    if len(arguments) != 2:
+        print("usage: python -m pathfinding.graph_io [--numeric-names] edges.csv graph.csrg")
+        return 1
+    source, destination = arguments
+    graph = edge_list_to_csr(source, numeric_names=numeric_names)
+    save_binary(graph, destination)
+    print("%d vertices, %d directed edges written to %s" % (len(graph), graph.number_of_edges(), destination))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,284 @@
+# NumPy backed pathfinding on the grids used in lab2_codev3.py
+# (lists of rows, 0 = free cell, 1 = obstacle, 4-connected moves).
+#
+# The grid is stored once as a uint8 occupancy array and padded with a ring
+# of obstacles, so a cell is a single flat index and its neighbors are
+# index - width, index + width, index - 1 and index + 1 with no bounds checks.
+#  - BFS expands the whole frontier at once (a vectorized wavefront) and
+#    records parent pointers in an int32 array instead of per-node paths.
+#  - A* keeps the flat index encoding, with g-scores and parents in int32
+#    arrays and plain ints on the heap.
+#  - Flow fields route many agents to the same goals: one BFS seeded from
+#    every goal at once gives each cell its distance to the nearest goal and
+#    its next step towards it (moves are symmetric, so the BFS parent of a
+#    cell is that step). Routing an agent is then a walk along the pointers
+#    with no search, and a batch of agents walks in lock step. The engine
+#    keeps the last `max_fields` fields per goal set until obstacles change
+#    through set_blocked().
+#
+#   engine = GridEngine(grid)
+#   distances = engine.distance_field((0, 0))    # int32 rows x cols, -1 = unreachable
+#   path = engine.a_star((0, 0), (4, 4))         # [(0, 0), ..., (4, 4)]
+#   field = engine.flow_field([(4, 4), (0, 4)])  # cached until set_blocked()
+#   field.next_step((2, 2))                      # (3, 2) or None
+#   paths = engine.route_batch(starts, [(4, 4), (0, 4)])
+import heapq
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+
+class GridEngine:
+    def __init__(self, grid, max_fields=16):
+        # a copy: obstacles change through set_blocked() only
+        self.occupancy = np.array(grid, dtype=np.uint8)
+        self.rows, self.cols = self.occupancy.shape
+        self.width = self.cols + 2
+        self.size = (self.rows + 2) * self.width
+        padded = np.ones((self.rows + 2, self.width), dtype=np.uint8)
+        padded[1:-1, 1:-1] = self.occupancy
+        # free[index] is True for a free cell, the padding is blocked
+        self.free = (padded == 0).ravel()
+        # same order as neighbors() in lab2_codev3: up, down, left, right
+        self.offsets = np.array([-self.width, self.width, -1, 1], dtype=np.intp)
+        # bumped by every obstacle change
+        self.version = 0
+        self.max_fields = max_fields
+        self.fields = OrderedDict()
+        self.field_hits = 0
+        self.field_misses = 0
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def cell(self, index):
+        row, col = divmod(int(index), self.width)
+        return row - 1, col - 1
+
+    def is_free(self, cell):
+        row, col = cell
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.occupancy[row, col] == 0
+
+    # Blocks (or with blocked=False frees) the given cells. Cached flow
+    # fields are dropped, paths computed before may run through new walls.
+    def set_blocked(self, cells, blocked=True):
+        value = 1 if blocked else 0
+        for row, col in cells:
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                raise IndexError("cell %r is outside the grid" % ((row, col),))
+            self.occupancy[row, col] = value
+            self.free[self.index((row, col))] = not blocked
+        self.version += 1
+        self.fields.clear()
+
+    # BFS from the sources over the whole reachable grid, or until `goal` is
+    # reached. Returns flat int32 arrays over the padded grid: the distances
+    # (-1 where a cell was not reached, -2 for obstacles) and, if asked for,
+    # the parent pointers (-1 where there is none).
+    def _wavefront(self, sources, goal=None, with_parents=False):
+        distances = np.where(self.free, -1, -2).astype(np.int32)
+        parents = np.full(self.size, -1, dtype=np.int32) if with_parents else None
+        sources = [source for source in sources if self.is_free(source)]
+        if not sources:
+            return distances, parents
+
+        frontier = np.unique(np.array([self.index(source) for source in sources], dtype=np.intp))
+        goal_index = None if goal is None else self.index(goal)
+        distances[frontier] = 0
+        distance = 0
+        while frontier.size:
+            if goal_index is not None and distances[goal_index] >= 0:
+                break
+            distance += 1
+            reached = []
+            # one direction at a time: the cells reached from one direction
+            # are distinct, and cells already reached from an earlier
+            # direction fail the distance check, so there are no duplicates
+            for offset in self.offsets:
+                candidates = frontier + offset
+                candidates = candidates[distances[candidates] == -1]
+                distances[candidates] = distance
+                if with_parents:
+                    parents[candidates] = candidates - offset
+                reached.append(candidates)
+            frontier = np.concatenate(reached)
+        return distances, parents
+
+    # BFS distance from source (one cell or several, then to the nearest of
+    # them) to every cell, int32 rows x cols, -1 = unreachable
+    def distance_field(self, source):
+        distances, _ = self._wavefront(_cells(source))
+        field = distances.reshape(self.rows + 2, self.width)[1:-1, 1:-1]
+        return np.maximum(field, -1)
+
+    # The flow field towards the nearest of `goals` (one cell or several),
+    # from the cache while the obstacles have not changed since it was built.
+    def flow_field(self, goals):
+        key = tuple(sorted(set(_cells(goals))))
+        field = self.fields.get(key)
+        if field is not None:
+            self.field_hits += 1
+            self.fields.move_to_end(key)
+            return field
+        self.field_misses += 1
+        distances, parents = self._wavefront(key, with_parents=True)
+        field = FlowField(self, key, distances, parents)
+        self.fields[key] = field
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return field
+
+    # paths from every start to its nearest goal, None where there is none
+    def route_batch(self, starts, goals):
+        return self.flow_field(goals).routes(starts)
+
+    def bfs(self, start, goal):
+        if not self.is_free(goal):
+            return None
+        distances, parents = self._wavefront([start], goal, with_parents=True)
+        goal_index = self.index(goal)
+        if distances[goal_index] < 0:
+            return None
+        return self._path(parents, goal_index)
+
+    def a_star(self, start, goal):
+        if not self.is_free(start) or not self.is_free(goal):
+            return None
+        width = self.width
+        free = self.free.tobytes()
+        start_index, goal_index = self.index(start), self.index(goal)
+        goal_row, goal_col = divmod(goal_index, width)
+        offsets = [int(offset) for offset in self.offsets]
+        g_scores = array('i', [-1]) * self.size
+        parents = array('i', [-1]) * self.size
+        closed = bytearray(self.size)
+
+        g_scores[start_index] = 0
+        row, col = divmod(start_index, width)
+        open_set = [(abs(row - goal_row) + abs(col - goal_col), 0, start_index)]
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue
+            if current == goal_index:
+                return self._path(parents, goal_index)
+            closed[current] = 1
+            tentative_g = g + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if not free[neighbor] or closed[neighbor]:
+                    continue
+                if g_scores[neighbor] < 0 or tentative_g < g_scores[neighbor]:
+                    g_scores[neighbor] = tentative_g
+                    parents[neighbor] = current
+                    row, col = divmod(neighbor, width)
+                    h = abs(row - goal_row) + abs(col - goal_col)
+                    heapq.heappush(open_set, (tentative_g + h, tentative_g, neighbor))
+        return None
+
+    def _path(self, parents, index):
+        path = []
+        while index >= 0:
+            path.append(self.cell(index))
+            index = int(parents[index])
+        path.reverse()
+        return path
+
+
+# one cell or an iterable of cells -> list of (row, col) int tuples
+def _cells(cells):
+    if len(cells) == 2 and isinstance(cells[0], (int, np.integer)):
+        cells = [cells]
+    return [(int(row), int(col)) for row, col in cells]
+
+
+# Distances to the nearest goal and next steps towards it for every cell of
+# an engine's grid, from GridEngine.flow_field(). `distances` and
+# `next_steps` are flat int32 arrays over the padded grid (see
+# GridEngine.index): -1 (-2 on obstacles) where no goal can be reached, and
+# for goals next_steps is -1 too.
+class FlowField:
+    def __init__(self, engine, goals, distances, next_steps):
+        self.engine = engine
+        self.goals = goals
+        self.version = engine.version
+        self.distances = distances
+        self.next_steps = next_steps
+
+    # true once the engine's obstacles changed after the field was built
+    @property
+    def stale(self):
+        return self.version != self.engine.version
+
+    # int32 rows x cols, -1 = unreachable
+    def distance_field(self):
+        engine = self.engine
+        field = self.distances.reshape(engine.rows + 2, engine.width)[1:-1, 1:-1]
+        return np.maximum(field, -1)
+
+    def distance(self, cell):
+        if not self.engine.is_free(cell):
+            return None
+        distance = int(self.distances[self.engine.index(cell)])
+        return distance if distance >= 0 else None
+
+    # the neighbor one step closer to the nearest goal, None on a goal or
+    # where no goal can be reached
+    def next_step(self, cell):
+        if not self.engine.is_free(cell):
+            return None
+        index = int(self.next_steps[self.engine.index(cell)])
+        return self.engine.cell(index) if index >= 0 else None
+
+    def route(self, start):
+        return self.routes([start])[0]
+
+    # Follows the pointers from all starts at once, one step per round. The
+    # starts are sorted longest path first, so the agents still walking in a
+    # round are a prefix and every round stores only their positions: the
+    # memory is that of the paths returned.
+    def routes(self, starts):
+        engine = self.engine
+        # a start off the grid or on an obstacle becomes the padding cell 0
+        indices = np.array([engine.index(start) if engine.is_free(start) else 0 for start in starts],
+                           dtype=np.intp)
+        lengths = self.distances[indices]
+        paths = [None] * indices.size
+        order = np.argsort(-lengths, kind="stable")
+        lengths = lengths[order]
+        reachable = int(np.count_nonzero(lengths >= 0))
+        if not reachable:
+            return paths
+
+        walking = np.searchsorted(-lengths[:reachable], -np.arange(1, int(lengths[0]) + 1), side="right")
+        current = indices[order[:reachable]]
+        rounds = [current]
+        for count in walking.tolist():
+            current = self.next_steps[current[:count]]
+            rounds.append(current)
+        offsets = np.cumsum([0] + [len(positions) for positions in rounds[:-1]])
+        steps = np.concatenate(rounds)
+        rows = steps // engine.width - 1
+        cols = steps % engine.width - 1
+        for j, (start, length) in enumerate(zip(order[:reachable].tolist(), lengths[:reachable].tolist())):
+            positions = offsets[:length + 1] + j
+            paths[start] = list(zip(rows[positions].tolist(), cols[positions].tolist()))
+        return paths
+
+
+# Drop-in replacements for the functions in lab2_codev3.py
+def bfs(grid, start, goal):
+    return GridEngine(grid).bfs(start, goal)
+
+
+def a_star(grid, start, goal):
+    return GridEngine(grid).a_star(start, goal)
+
+
+def bfs_distance_field(grid, source):
+    return GridEngine(grid).distance_field(source)
+
+
+def route_batch(grid, starts, goals):
+    return GridEngine(grid).route_batch(starts, goals)
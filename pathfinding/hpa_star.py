@@ -0,0 +1,346 @@
+# Hierarchical path-finding A* (HPA*) on the grids used in lab2_codev3.py
+# (0 = free cell, 1 = obstacle, 4-connected moves of cost 1).
+#
+# The grid is cut into square clusters of `cluster_size` cells. Along every
+# border between two clusters each maximal run of cells that are free on
+# both sides is an entrance: a run shorter than ENTRANCE_SPLIT cells gets
+# one transition in its middle, a longer one a transition at each end. The
+# two cells of a transition are nodes of the abstract graph, joined by an
+# edge of cost 1; within a cluster every pair of nodes is joined by its
+# shortest distance inside the cluster. The intra-cluster distances are
+# computed for all clusters at once: one BFS wavefront (as in
+# grid_engine.py) per node slot, seeded with the i-th node of every cluster
+# and never crossing a cluster border.
+#
+# A query connects start and goal to the nodes of their clusters, runs A*
+# on the abstract graph and refines only the clusters on the chosen route
+# with a local A*. Paths are near optimal (within a few percent on random
+# grids), queries touch a few clusters instead of the whole map.
+# set_blocked() toggles cells and rebuilds only the borders and clusters
+# they touch.
+#
+#   hpa = HierarchicalGrid(grid, cluster_size=32)
+#   path = hpa.find_path((0, 0), (999, 999))      # [(0, 0), ..., (999, 999)]
+#   hpa.set_blocked([(10, 12)])                   # or blocked=False to free it
+import heapq
+
+import numpy as np
+
+from .grid_engine import GridEngine
+
+# entrances at least this wide get a transition at both ends
+ENTRANCE_SPLIT = 6
+
+RIGHT, DOWN = 0, 1
+
+
+class HierarchicalGrid:
+    def __init__(self, grid, cluster_size=32):
+        self.engine = GridEngine(grid)
+        engine = self.engine
+        self.rows, self.cols, self.width = engine.rows, engine.cols, engine.width
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+        self.clusters = self.cluster_rows * self.cluster_cols
+        # cluster id of every cell of the padded grid, -1 on the padding
+        ids = np.full((self.rows + 2, self.width), -1, dtype=np.int32)
+        ids[1:-1, 1:-1] = ((np.arange(self.rows) // cluster_size)[:, None] * self.cluster_cols
+                           + (np.arange(self.cols) // cluster_size)[None, :])
+        self.cluster_of = ids.ravel()
+        self.free = bytearray(engine.free.tobytes())
+        self.offsets = [int(offset) for offset in engine.offsets]
+        # distances of _wavefront(), -1 between calls
+        self.scratch = np.full(engine.size, -1, dtype=np.int32)
+
+        # (cluster, RIGHT or DOWN) -> [(node on this side, node on the other)]
+        self.entrances = {}
+        # node -> partners across borders, node -> {node in its cluster: cost}
+        self.inter = {}
+        self.intra = {}
+        # cluster -> sorted list of its nodes
+        self.nodes = [[] for _ in range(self.clusters)]
+        for cluster in range(self.clusters):
+            for side in (RIGHT, DOWN):
+                self._scan(cluster, side)
+        for cluster in range(self.clusters):
+            self.nodes[cluster] = self._cluster_nodes(cluster)
+        self._connect(range(self.clusters))
+
+    def index(self, cell):
+        return self.engine.index(cell)
+
+    def cell(self, index):
+        return self.engine.cell(index)
+
+    def is_free(self, cell):
+        return self.engine.is_free(cell)
+
+    # (first row, end row, first col, end col) of a cluster
+    def _bounds(self, cluster):
+        row, col = divmod(cluster, self.cluster_cols)
+        size = self.cluster_size
+        return (row * size, min(self.rows, (row + 1) * size),
+                col * size, min(self.cols, (col + 1) * size))
+
+    def _neighbor(self, cluster, side):
+        row, col = divmod(cluster, self.cluster_cols)
+        if side == RIGHT:
+            return cluster + 1 if col + 1 < self.cluster_cols else None
+        return cluster + self.cluster_cols if row + 1 < self.cluster_rows else None
+
+    # Finds the transitions of one border and replaces its old ones in
+    # self.inter.
+    def _scan(self, cluster, side):
+        for a, b in self.entrances.pop((cluster, side), ()):
+            for node, partner in ((a, b), (b, a)):
+                partners = self.inter[node]
+                partners.discard(partner)
+                if not partners:
+                    del self.inter[node]
+        if self._neighbor(cluster, side) is None:
+            return
+
+        first_row, end_row, first_col, end_col = self._bounds(cluster)
+        if side == RIGHT:
+            line = [self.index((row, end_col - 1)) for row in range(first_row, end_row)]
+            step = 1
+        else:
+            line = [self.index((end_row - 1, col)) for col in range(first_col, end_col)]
+            step = self.width
+        free = self.free
+        both = np.array([free[i] and free[i + step] for i in line] + [False], dtype=bool)
+        changes = np.flatnonzero(np.diff(np.concatenate(([False], both))))
+        transitions = []
+        for start, end in zip(changes[::2].tolist(), changes[1::2].tolist()):
+            if end - start < ENTRANCE_SPLIT:
+                positions = [(start + end - 1) // 2]
+            else:
+                positions = [start, end - 1]
+            for position in positions:
+                a = line[position]
+                transitions.append((a, a + step))
+                self.inter.setdefault(a, set()).add(a + step)
+                self.inter.setdefault(a + step, set()).add(a)
+        self.entrances[(cluster, side)] = transitions
+
+    def _cluster_nodes(self, cluster):
+        nodes = set()
+        for side in (RIGHT, DOWN):
+            nodes.update(a for a, _ in self.entrances.get((cluster, side), ()))
+        row, col = divmod(cluster, self.cluster_cols)
+        if col > 0:
+            nodes.update(b for _, b in self.entrances.get((cluster - 1, RIGHT), ()))
+        if row > 0:
+            nodes.update(b for _, b in self.entrances.get((cluster - self.cluster_cols, DOWN), ()))
+        return sorted(nodes)
+
+    # BFS from every source at once, each one confined to its own cluster
+    # (so at most one source per cluster). Returns the distances, -1 where
+    # a cell was not reached, and the reached cells; the caller resets
+    # them to -1 with _release().
+    def _wavefront(self, sources):
+        distances = self.scratch
+        free, cluster_of = self.engine.free, self.cluster_of
+        frontier = np.array(sources, dtype=np.intp)
+        distances[frontier] = 0
+        reached = [frontier]
+        distance = 0
+        while frontier.size:
+            distance += 1
+            clusters = cluster_of[frontier]
+            found = []
+            for offset in self.offsets:
+                candidates = frontier + offset
+                keep = free[candidates] & (distances[candidates] == -1) & (cluster_of[candidates] == clusters)
+                candidates = candidates[keep]
+                distances[candidates] = distance
+                found.append(candidates)
+            frontier = np.concatenate(found)
+            reached.append(frontier)
+        return distances, reached
+
+    def _release(self, reached):
+        for cells in reached:
+            self.scratch[cells] = -1
+
+    # (Re)computes the intra-cluster edges of the given clusters.
+    def _connect(self, clusters):
+        clusters = [cluster for cluster in clusters if self.nodes[cluster]]
+        for cluster in clusters:
+            for node in self.nodes[cluster]:
+                self.intra[node] = {}
+        slot = 0
+        while clusters:
+            sources = [self.nodes[cluster][slot] for cluster in clusters]
+            distances, reached = self._wavefront(sources)
+            for cluster, source in zip(clusters, sources):
+                edges = self.intra[source]
+                for node in self.nodes[cluster]:
+                    distance = int(distances[node])
+                    if distance > 0:
+                        edges[node] = distance
+            self._release(reached)
+            slot += 1
+            clusters = [cluster for cluster in clusters if len(self.nodes[cluster]) > slot]
+
+    # Blocks (or with blocked=False frees) the given cells, then rebuilds the
+    # borders that run through them and the clusters whose nodes changed.
+    def set_blocked(self, cells, blocked=True):
+        cells = [tuple(cell) for cell in cells]
+        self.engine.set_blocked(cells, blocked)
+        size = self.cluster_size
+        borders = set()
+        clusters = set()
+        for row, col in cells:
+            self.free[self.index((row, col))] = 0 if blocked else 1
+            cluster = (row // size) * self.cluster_cols + col // size
+            clusters.add(cluster)
+            if col % size == size - 1:
+                borders.add((cluster, RIGHT))
+            if col % size == 0 and col > 0:
+                borders.add((cluster - 1, RIGHT))
+            if row % size == size - 1:
+                borders.add((cluster, DOWN))
+            if row % size == 0 and row > 0:
+                borders.add((cluster - self.cluster_cols, DOWN))
+        for cluster, side in borders:
+            self._scan(cluster, side)
+            clusters.add(cluster)
+            neighbor = self._neighbor(cluster, side)
+            if neighbor is not None:
+                clusters.add(neighbor)
+        for cluster in clusters:
+            for node in self.nodes[cluster]:
+                self.intra.pop(node, None)
+            self.nodes[cluster] = self._cluster_nodes(cluster)
+        self._connect(clusters)
+
+    def _heuristic(self, index, goal):
+        row, col = divmod(index, self.width)
+        goal_row, goal_col = divmod(goal, self.width)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    # A* between two cells of one cluster (or of the box around both of
+    # their clusters, when `box` is true) that stays in that area
+    def _local_path(self, start, goal, box=False):
+        if start == goal:
+            return [start]
+        first_row, end_row, first_col, end_col = self._bounds(int(self.cluster_of[start]))
+        if box:
+            other = self._bounds(int(self.cluster_of[goal]))
+            first_row, end_row = min(first_row, other[0]), max(end_row, other[1])
+            first_col, end_col = min(first_col, other[2]), max(end_col, other[3])
+        width, free = self.width, self.free
+        low, high = first_col + 1, end_col + 1
+        top, bottom = first_row + 1, end_row + 1
+        # ties on f are broken towards the larger g (stored negated)
+        open_set = [(self._heuristic(start, goal), 0, start)]
+        g_scores = {start: 0}
+        parents = {start: None}
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            g = -g
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                return path[::-1]
+            if g > g_scores[current]:
+                continue
+            for offset in self.offsets:
+                neighbor = current + offset
+                if not free[neighbor]:
+                    continue
+                row, col = divmod(neighbor, width)
+                if not (top <= row < bottom and low <= col < high):
+                    continue
+                if neighbor not in g_scores or g + 1 < g_scores[neighbor]:
+                    g_scores[neighbor] = g + 1
+                    parents[neighbor] = current
+                    heapq.heappush(open_set, (g + 1 + self._heuristic(neighbor, goal), -g - 1, neighbor))
+        return None
+
+    # distances from a cell to the nodes of its cluster it can reach
+    def _attach(self, index):
+        distances, reached = self._wavefront([index])
+        edges = {node: int(distances[node]) for node in self.nodes[int(self.cluster_of[index])]
+                 if distances[node] >= 0}
+        self._release(reached)
+        return edges
+
+    # The abstract route from start to goal as a list of nodes, start and
+    # goal included, or None.
+    def _abstract_route(self, start, goal):
+        # temporary edges of start and goal to the nodes of their clusters
+        from_start, to_goal = self._attach(start), self._attach(goal)
+
+        # ties on f are broken towards the larger g (stored negated)
+        open_set = [(self._heuristic(start, goal), 0, start)]
+        g_scores = {start: 0}
+        parents = {start: None}
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            g = -g
+            if current == goal:
+                route = []
+                while current is not None:
+                    route.append(current)
+                    current = parents[current]
+                return route[::-1]
+            if g > g_scores[current]:
+                continue
+            # start and goal may be nodes themselves
+            edges = list(self.intra.get(current, {}).items())
+            edges.extend((partner, 1) for partner in self.inter.get(current, ()))
+            if current == start:
+                edges.extend(from_start.items())
+            if current in to_goal:
+                edges.append((goal, to_goal[current]))
+            for neighbor, cost in edges:
+                tentative = g + cost
+                if neighbor not in g_scores or tentative < g_scores[neighbor]:
+                    g_scores[neighbor] = tentative
+                    parents[neighbor] = current
+                    heapq.heappush(open_set, (tentative + self._heuristic(neighbor, goal), -tentative, neighbor))
+        return None
+
+    # Cells from start to goal, None if there is no path. When start and
+    # goal are in the same or in touching clusters a local search over
+    # those clusters is tried first: the detour through the transitions
+    # costs most on short paths.
+    def find_path(self, start, goal):
+        if not self.is_free(start) or not self.is_free(goal):
+            return None
+        start, goal = self.index(start), self.index(goal)
+        path = None
+        start_row, start_col = divmod(int(self.cluster_of[start]), self.cluster_cols)
+        goal_row, goal_col = divmod(int(self.cluster_of[goal]), self.cluster_cols)
+        if abs(start_row - goal_row) <= 1 and abs(start_col - goal_col) <= 1:
+            path = self._local_path(start, goal, box=True)
+        if path is None:
+            route = self._abstract_route(start, goal)
+            if route is None:
+                return None
+            path = [start]
+            for a, b in zip(route, route[1:]):
+                if b in self.inter.get(a, ()):
+                    path.append(b)
+                else:
+                    path.extend(self._local_path(a, b)[1:])
+        return [self.cell(index) for index in path]
+
+    def stats(self):
+        return {
+            "clusters": self.clusters,
+            "nodes": sum(len(nodes) for nodes in self.nodes),
+            "inter_edges": sum(len(partners) for partners in self.inter.values()) // 2,
+            "intra_edges": sum(len(edges) for edges in self.intra.values()),
+        }
+
+
+# Drop-in replacement for a_star in lab2_codev3.py (builds the hierarchy,
+# so only worth it for one-off use on small grids)
+def hpa_star(grid, start, goal, cluster_size=32):
+    return HierarchicalGrid(grid, cluster_size).find_path(start, goal)
@@ -0,0 +1,350 @@
+# Jump Point Search on the grids used in lab2_codev3.py (0 = free, 1 = obstacle).
+#
+# JPS is A* on uniform-cost grids with symmetric paths pruned: from a node
+# the search only continues in its "natural" directions and jumps straight
+# ahead until it meets the goal or a cell with a forced neighbor (a
+# neighbor that is only optimally reachable through this cell). Only those
+# jump points are pushed on the open list, so open corridors and rooms are
+# crossed in one expansion.
+#
+# connectivity=4 uses the 4-connected variant (straight moves only, vertical
+# jumps also scan sideways for jump points). connectivity=8 allows diagonal
+# moves costing sqrt(2):
+#  - corner_cutting=False: a diagonal move needs both orthogonal cells free
+#  - corner_cutting=True: one free orthogonal cell is enough, squeezing
+#    between two diagonal obstacles is never allowed
+#
+# jump_point_search(grid, start, goal) returns the full list of cells from
+# start to goal, like a_star in lab2_codev3.py. a_star here is the plain A*
+# with the same movement rules, used as the baseline in benchmark_jps.py.
+# Cells are flat indices into a grid padded with a ring of obstacles, as in
+# grid_engine.py.
+import heapq
+import math
+
+from .tracer import finish
+
+SQRT2 = math.sqrt(2)
+# maps a grid value to 1 for a free cell (anything but 1), 0 for an obstacle
+FREE_CELLS = bytes(0 if value == 1 else 1 for value in range(256))
+
+
+class _Grid:
+    def __init__(self, grid, connectivity, corner_cutting):
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity must be 4 or 8")
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.width = self.cols + 2
+        free = bytearray((self.rows + 2) * self.width)
+        for row, cells in enumerate(grid):
+            base = (row + 1) * self.width + 1
+            free[base:base + self.cols] = bytes(map(int, cells)).translate(FREE_CELLS)
+        self.free = free
+        self.connectivity = connectivity
+        self.corner_cutting = corner_cutting
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def cell(self, index):
+        row, col = divmod(index, self.width)
+        return row - 1, col - 1
+
+    def is_free(self, cell):
+        row, col = cell
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.free[self.index(cell)]
+
+    # can we move from index one step in direction (dr, dc)?
+    def can_move(self, index, dr, dc):
+        free, width = self.free, self.width
+        if not free[index + dr * width + dc]:
+            return False
+        if dr == 0 or dc == 0:
+            return True
+        if self.connectivity == 4:
+            return False
+        if self.corner_cutting:
+            return free[index + dr * width] or free[index + dc]
+        return free[index + dr * width] and free[index + dc]
+
+    def directions(self):
+        if self.connectivity == 4:
+            return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        return [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+    def heuristic(self, index, goal):
+        row, col = divmod(index, self.width)
+        goal_row, goal_col = divmod(goal, self.width)
+        dr, dc = abs(row - goal_row), abs(col - goal_col)
+        if self.connectivity == 4:
+            return dr + dc
+        return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def jump_point_search(grid, start, goal, connectivity=4, corner_cutting=False, tracer=None):
+    board = _Grid(grid, connectivity, corner_cutting)
+    if not board.is_free(start) or not board.is_free(goal):
+        return None
+    start_index, goal_index = board.index(start), board.index(goal)
+    width = board.width
+    if tracer is not None:
+        tracer.start("jump_point_search", start, goal)
+
+    # ties on f are broken towards the larger g (stored negated)
+    open_set = [(board.heuristic(start_index, goal_index), 0, start_index)]
+    g_scores = {start_index: 0}
+    parents = {start_index: None}
+    closed = set()
+    while open_set:
+        _, g, current = heapq.heappop(open_set)
+        g = -g
+        if current in closed:
+            continue
+        if tracer is not None:
+            tracer.expand(board.cell(current))
+        if current == goal_index:
+            return finish(tracer, _expand_path(board, parents, goal_index))
+        closed.add(current)
+
+        parent = parents[current]
+        if parent is None:
+            directions = [(dr, dc) for dr, dc in board.directions() if board.can_move(current, dr, dc)]
+        else:
+            parent_row, parent_col = divmod(parent, width)
+            row, col = divmod(current, width)
+            directions = _pruned_directions(board, current, _sign(row - parent_row), _sign(col - parent_col))
+
+        for dr, dc in directions:
+            jump_point = _jump(board, current, dr, dc, goal_index)
+            if jump_point is None or jump_point in closed:
+                continue
+            tentative_g = g + _octile(board, current, jump_point)
+            if jump_point not in g_scores or tentative_g < g_scores[jump_point]:
+                g_scores[jump_point] = tentative_g
+                parents[jump_point] = current
+                f_score = tentative_g + board.heuristic(jump_point, goal_index)
+                heapq.heappush(open_set, (f_score, -tentative_g, jump_point))
+                if tracer is not None:
+                    tracer.push(board.cell(jump_point), f_score)
+        if tracer is not None:
+            tracer.frontier(open_set)
+    return finish(tracer, None)
+
+
+# the directions worth following from index when it was entered moving (dr, dc)
+def _pruned_directions(board, index, dr, dc):
+    free, width = board.free, board.width
+    result = []
+
+    def at(a, b):
+        return free[index + a * width + b]
+
+    if board.connectivity == 4:
+        if dr != 0:
+            candidates = [(0, -1), (0, 1), (dr, 0)]
+        else:
+            candidates = [(-1, 0), (1, 0), (0, dc)]
+        return [(a, b) for a, b in candidates if at(a, b)]
+
+    if board.corner_cutting:
+        if dr != 0 and dc != 0:
+            if at(0, dc):
+                result.append((0, dc))
+            if at(dr, 0):
+                result.append((dr, 0))
+            if at(0, dc) or at(dr, 0):
+                result.append((dr, dc))
+            if not at(-dr, 0) and at(0, dc):
+                result.append((-dr, dc))
+            if not at(0, -dc) and at(dr, 0):
+                result.append((dr, -dc))
+        elif dr != 0:
+            if at(dr, 0):
+                result.append((dr, 0))
+                if not at(0, 1):
+                    result.append((dr, 1))
+                if not at(0, -1):
+                    result.append((dr, -1))
+        else:
+            if at(0, dc):
+                result.append((0, dc))
+                if not at(1, 0):
+                    result.append((1, dc))
+                if not at(-1, 0):
+                    result.append((-1, dc))
+    else:
+        if dr != 0 and dc != 0:
+            if at(0, dc):
+                result.append((0, dc))
+            if at(dr, 0):
+                result.append((dr, 0))
+            if at(0, dc) and at(dr, 0):
+                result.append((dr, dc))
+        elif dr != 0:
+            ahead, left, right = at(dr, 0), at(0, -1), at(0, 1)
+            if ahead:
+                result.append((dr, 0))
+                if left:
+                    result.append((dr, -1))
+                if right:
+                    result.append((dr, 1))
+            if left:
+                result.append((0, -1))
+            if right:
+                result.append((0, 1))
+        else:
+            ahead, up, down = at(0, dc), at(-1, 0), at(1, 0)
+            if ahead:
+                result.append((0, dc))
+                if up:
+                    result.append((-1, dc))
+                if down:
+                    result.append((1, dc))
+            if up:
+                result.append((-1, 0))
+            if down:
+                result.append((1, 0))
+    return [(a, b) for a, b in result if board.can_move(index, a, b)]
+
+
+# Follow direction (dr, dc) from index; return the first jump point or None.
+def _jump(board, index, dr, dc, goal):
+    if not board.can_move(index, dr, dc):
+        return None
+    index += dr * board.width + dc
+    if dr != 0 and dc != 0:
+        return _jump_diagonal(board, index, dr, dc, goal)
+    return _jump_straight(board, index, dr, dc, goal)
+
+
+def _jump_straight(board, index, dr, dc, goal):
+    free, width = board.free, board.width
+    step = dr * width + dc
+    four = board.connectivity == 4
+    cutting = board.corner_cutting
+    while True:
+        if index == goal:
+            return index
+        if dr != 0:
+            # moving vertically, the sides are left/right
+            side_a, side_b = index - 1, index + 1
+            behind_a, behind_b = side_a - step, side_b - step
+        else:
+            side_a, side_b = index - width, index + width
+            behind_a, behind_b = side_a - step, side_b - step
+        if cutting and not four:
+            # a free cell diagonally ahead next to a blocked side cell
+            if (free[side_a + step] and not free[side_a]) or (free[side_b + step] and not free[side_b]):
+                return index
+        else:
+            # a free side cell whose cell behind is blocked
+            if (free[side_a] and not free[behind_a]) or (free[side_b] and not free[behind_b]):
+                return index
+        if four and dr != 0:
+            # vertical moves stop where a horizontal jump finds something
+            if (_jump(board, index, 0, -1, goal) is not None
+                    or _jump(board, index, 0, 1, goal) is not None):
+                return index
+        if not free[index + step]:
+            return None
+        index += step
+
+
+def _jump_diagonal(board, index, dr, dc, goal):
+    free, width = board.free, board.width
+    cutting = board.corner_cutting
+    while True:
+        if index == goal:
+            return index
+        if cutting:
+            if ((free[index - dr * width + dc] and not free[index - dr * width])
+                    or (free[index + dr * width - dc] and not free[index - dc])):
+                return index
+        if (_jump(board, index, dr, 0, goal) is not None
+                or _jump(board, index, 0, dc, goal) is not None):
+            return index
+        if not board.can_move(index, dr, dc):
+            return None
+        index += dr * width + dc
+
+
+def _octile(board, a, b):
+    row_a, col_a = divmod(a, board.width)
+    row_b, col_b = divmod(b, board.width)
+    dr, dc = abs(row_a - row_b), abs(col_a - col_b)
+    return max(dr, dc) + (SQRT2 - 1) * min(dr, dc) if dr and dc else dr + dc
+
+
+# parents only link jump points, fill in the straight/diagonal runs between them
+def _expand_path(board, parents, goal):
+    jump_points = []
+    index = goal
+    while index is not None:
+        jump_points.append(index)
+        index = parents[index]
+    jump_points.reverse()
+
+    width = board.width
+    path = [board.cell(jump_points[0])]
+    for a, b in zip(jump_points, jump_points[1:]):
+        row_a, col_a = divmod(a, width)
+        row_b, col_b = divmod(b, width)
+        step = _sign(row_b - row_a) * width + _sign(col_b - col_a)
+        index = a
+        while index != b:
+            index += step
+            path.append(board.cell(index))
+    return path
+
+
+# Plain A* with the same movement rules, for comparison.
+def a_star(grid, start, goal, connectivity=4, corner_cutting=False, tracer=None):
+    board = _Grid(grid, connectivity, corner_cutting)
+    if not board.is_free(start) or not board.is_free(goal):
+        return None
+    start_index, goal_index = board.index(start), board.index(goal)
+    moves = [(dr, dc, dr * board.width + dc, SQRT2 if dr and dc else 1) for dr, dc in board.directions()]
+    if tracer is not None:
+        tracer.start("a_star", start, goal)
+
+    # ties on f are broken towards the larger g (stored negated)
+    open_set = [(board.heuristic(start_index, goal_index), 0, start_index)]
+    g_scores = {start_index: 0}
+    parents = {start_index: None}
+    closed = set()
+    while open_set:
+        _, g, current = heapq.heappop(open_set)
+        g = -g
+        if current in closed:
+            continue
+        if tracer is not None:
+            tracer.expand(board.cell(current))
+        if current == goal_index:
+            path = []
+            while current is not None:
+                path.append(board.cell(current))
+                current = parents[current]
+            return finish(tracer, path[::-1])
+        closed.add(current)
+        for dr, dc, step, cost in moves:
+            if not board.can_move(current, dr, dc):
+                continue
+            neighbor = current + step
+            if neighbor in closed:
+                continue
+            tentative_g = g + cost
+            if neighbor not in g_scores or tentative_g < g_scores[neighbor]:
+                g_scores[neighbor] = tentative_g
+                parents[neighbor] = current
+                f_score = tentative_g + board.heuristic(neighbor, goal_index)
+                heapq.heappush(open_set, (f_score, -tentative_g, neighbor))
+                if tracer is not None:
+                    tracer.push(board.cell(neighbor), f_score)
+        if tracer is not None:
+            tracer.frontier(open_set)
+    return finish(tracer, None)
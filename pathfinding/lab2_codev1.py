@@ -47,42 +47,29 @@ def bfs(graph, start, goal):
 
 
 ## A Search*
-# Time complexity: O(b^d), where b is the branching factor and d is the depth of the solution. However, it can be much better if the heuristic is well-designed.
-# Space complexity: O(b^d), as it needs to store all the nodes at a given depth. Again, it can be better if the heuristic is well-designed.
+# Time complexity: O(E log V), as a node is only pushed again when a cheaper way to it is found (see best_first.py). However, it can be much better if the heuristic is well-designed.
+# Space complexity: O(V), for the g-scores, the parent pointers and the frontier. Again, it can be better if the heuristic is well-designed.
 # Completeness: Complete, as long as the heuristic is admissible (never overestimates the cost to reach the goal) and consistent (satisfies the triangle inequality).
 # Optimality: Optimal if the heuristic is admissible and consistent.
-import heapq
-from functools import total_ordering
+# Every edge costs 1; the heuristic can be a dictionary or a function of the node.
+from .best_first import a_star as a_star_search
 
-@total_ordering
-class PriorityNode:
-    def __init__(self, priority, node, path):
-        self.priority = priority
-        self.node = node
-        self.path = path
-
-    def __lt__(self, other):
-        return self.priority < other.priority
-
-def a_star(graph, start, goal, heuristic):
-    open_set = [PriorityNode(heuristic[start], start, [start])]
-
-    while open_set:
-        current = heapq.heappop(open_set)
-        if current.node == goal:
-            return current.path
-        for neighbor in graph[current.node]:
-            if neighbor not in current.path:
-                heapq.heappush(open_set, PriorityNode(heuristic[neighbor], neighbor, current.path + [neighbor]))
+def a_star(graph, start, goal, heuristic, tracer=None):
+    result = a_star_search(graph.__getitem__, start, goal, heuristic, tracer=tracer)
+    return result[0] if result is not None else None
 
 
 ## Greedy Search
-# Time complexity: O(b^m), where b is the branching factor and m is the maximum depth of the search tree. It can be better if the heuristic is well-designed.
-# Space complexity: O(bm), as we need to store the path in memory. Again, it can be better if the heuristic is well-designed.
-# Completeness: Not complete, as it might get stuck in an infinite loop if the goal is not in the explored path. However, it can be complete under certain conditions with a well-designed heuristic.
+# Greedy best-first search orders the frontier by the heuristic alone (see best_first.py).
+# Time complexity: O(E log V), as every node is expanded at most once. It can be much better if the heuristic is well-designed.
+# Space complexity: O(V), for the parent pointers and the frontier.
+# Completeness: Complete on finite graphs, as nodes that were already reached are never pushed again.
 # Optimality: Not optimal, as it does not guarantee the shortest path. It can be optimal if the heuristic is perfect (returns the exact cost to reach the goal).
-def greedy(graph, start, goal, heuristic):
-    return a_star(graph, start, goal, {node: 0 for node in graph})
+# The heuristic can be a dictionary or a function of the node.
+from .best_first import greedy_best_first
+
+def greedy(graph, start, goal, heuristic, tracer=None):
+    return greedy_best_first(graph.__getitem__, start, goal, heuristic, tracer)
 
 
 # For A* search and Greedy search, we need a heuristic function.
@@ -99,8 +86,13 @@ heuristic = {
     'I': 0
 }
 
-start, goal = 'A', 'I'
-print("DFS:", dfs(graph, start, goal))
-print("BFS:", bfs(graph, start, goal))
-print("A*:", a_star(graph, start, goal, heuristic))
-print("Greedy:", greedy(graph, start, goal, heuristic))
\ No newline at end of file
+def main():
+    start, goal = 'A', 'I'
+    print("DFS:", dfs(graph, start, goal))
+    print("BFS:", bfs(graph, start, goal))
+    print("A*:", a_star(graph, start, goal, heuristic))
+    print("Greedy:", greedy(graph, start, goal, heuristic))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
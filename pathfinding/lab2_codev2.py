@@ -0,0 +1,109 @@
+graph = {
+    'A': ['B', 'C'],
+    'B': ['D', 'E'],
+    'C': ['F', 'G'],
+    'D': [],
+    'E': ['H'],
+    'F': [],
+    'G': ['I'],
+    'H': [],
+    'I': []
+}
+
+# DFS with generator function for DFS that yields paths as they are found.
+def dfs_paths(graph, start, goal):
+    stack = [(start, [start])]
+    while stack:
+        node, path = stack.pop()
+        if node == goal:
+            yield path
+        for neighbor in graph[node]:
+            if neighbor not in path:
+                stack.append((neighbor, path + [neighbor]))
+
+def dfs(graph, start, goal):
+    return next(dfs_paths(graph, start, goal), None)
+
+
+# BFS with generator function for BFS that yields paths as they are found.
+from collections import deque
+
+def bfs_paths(graph, start, goal):
+    queue = deque([(start, [start])])
+    while queue:
+        node, path = queue.popleft()
+        if node == goal:
+            yield path
+        for neighbor in graph[node]:
+            if neighbor not in path:
+                queue.append((neighbor, path + [neighbor]))
+
+def bfs(graph, start, goal):
+    return next(bfs_paths(graph, start, goal), None)
+
+
+# A* keeps the g-score and a parent pointer of every node instead of a copy of its path,
+# and a closed set to avoid expanding the same node multiple times (see best_first.py).
+from .best_first import a_star as a_star_search
+
+def a_star(graph, start, goal, heuristic, tracer=None):
+    result = a_star_search(graph.__getitem__, start, goal, heuristic, tracer=tracer)
+    return result[0] if result is not None else None
+
+
+# Greedy Search orders the frontier by the heuristic alone and keeps parent pointers
+# instead of paths (see best_first.py); the heuristic can be a dictionary or a function.
+from .best_first import greedy_best_first
+
+def greedy(graph, start, goal, heuristic, tracer=None):
+    return greedy_best_first(graph.__getitem__, start, goal, heuristic, tracer)
+
+
+# For A* search and Greedy search, we need a heuristic function.
+# Here's a simple heuristic function for the sample graph
+heuristic = {
+    'A': 3,
+    'B': 2,
+    'C': 2,
+    'D': 2,
+    'E': 1,
+    'F': 1,
+    'G': 1,
+    'H': 0,
+    'I': 0
+}
+
+## DFS and BFS use generator functions, which allows for more efficient memory usage when
+#  multiple solutions are required; each path still copies the one before it, so they stay
+#  exponential in the worst case. A* and Greedy search run on best_first.py, as in lab2_codev1:
+#  parent pointers instead of path copies make them O(E log V), for A* with a consistent
+#  heuristic (an inconsistent one can reopen closed nodes).
+
+
+# all_paths streams every simple path, depth-first, breadth-first or cheapest first
+# (see path_enumeration.py); the three orders give the same paths under a depth limit.
+from .path_enumeration import all_paths
+
+cyclic_graph = {
+    'A': ['B', 'C'],
+    'B': ['A', 'C', 'D'],
+    'C': ['A', 'B', 'D'],
+    'D': ['B', 'C']
+}
+
+
+def main():
+    start, goal = 'A', 'I'
+    print("DFS:", dfs(graph, start, goal))
+    print("BFS:", bfs(graph, start, goal))
+    print("A*:", a_star(graph, start, goal, heuristic))
+    print("Greedy:", greedy(graph, start, goal, heuristic))
+    print("All paths A -> D:", list(all_paths(cyclic_graph, 'A', 'D', order="bfs")))
+    for max_depth in range(4):
+        paths = set(all_paths(cyclic_graph, 'A', 'D', order="dfs", max_depth=max_depth))
+        assert paths == set(all_paths(cyclic_graph, 'A', 'D', order="bfs", max_depth=max_depth))
+        assert paths == set(all_paths(cyclic_graph, 'A', 'D', order="shortest", max_depth=max_depth))
+
+
+if __name__ == "__main__":
+    main()
@@ -103,19 +103,29 @@ def a_star(grid, start, goal):
     return None
 
 # greedy search
-def greedy(grid, start, goal):
-    zero_cost_heuristic = {(i, j): 0 for i in range(len(grid)) for j in range(len(grid[0]))}
-    return a_star(grid, start, goal)
+# orders the frontier by the heuristic alone (see best_first.py),
+# by default the Manhattan distance to the goal
+from .best_first import greedy_best_first
 
+def greedy(grid, start, goal, heuristic=None, tracer=None):
+    if heuristic is None:
+        heuristic = lambda cell: manhattan_distance(cell, goal)
+    return greedy_best_first(lambda cell: neighbors(grid, cell), start, goal, heuristic, tracer)
 
 
-start, goal = (0, 0), (4, 4)
-print("DFS:", dfs(grid, start, goal))
-print("BFS:", bfs(grid, start, goal))
-print("A*:", a_star(grid, start, goal))
-print("Greedy:", greedy(grid, start, goal))
-
 ## note that DFS and BFS are not guaranteed to find the shortest path in this problem,
 # as they do not consider the heuristic distance to the goal.
 # The A* search algorithm and Greedy search algorithm are more suitable
-# for this type of problem, as they are guided by a heuristic function to efficiently explore the grid.
\ No newline at end of file
+# for this type of problem, as they are guided by a heuristic function to efficiently explore the grid.
+
+
+def main():
+    start, goal = (0, 0), (4, 4)
+    print("DFS:", dfs(grid, start, goal))
+    print("BFS:", bfs(grid, start, goal))
+    print("A*:", a_star(grid, start, goal))
+    print("Greedy:", greedy(grid, start, goal))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# ALT heuristics (A*, Landmarks, Triangle inequality) for undirected graphs.
+# Distances d(L, v) from a few landmark vertices L give, for any goal t, the
+# lower bound h(v) = max over L of |d(L, t) - d(L, v)|, which is admissible
+# and consistent, so it can replace the hand written heuristic dicts:
+#
+#   landmarks = Landmarks.build(graph, k=8)
+#   path, total_cost = graph.a_star_search(start, goal, landmarks.heuristic(goal))
+#
+# Landmark selection strategies:
+#  - "farthest": each landmark is the vertex farthest from the ones chosen so
+#    far; the selection searches are reused as distance tables
+#  - "avoid": grows a shortest path tree from a random root and descends into
+#    the subtree where the current landmarks give the worst bounds
+#  - "random": uniformly random vertices
+# Distance tables that are not a by-product of the selection are computed in
+# a process pool, one Dijkstra per landmark.
+import random
+from array import array
+
+from .parallel import graph_pool, shared_graph
+
+INFINITY = float("inf")
+
+
+class Landmarks:
+    def __init__(self, names, landmarks, distances, ids=None):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)} if ids is None else ids
+        self.landmarks = landmarks
+        # distances[l * len(names) + i] = d(landmarks[l], names[i])
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph, k=8, strategy="farthest", workers=None, seed=None):
+        # one table per landmark bounds both directions only if edges are two-way
+        if graph.directed:
+            raise ValueError("ALT landmarks need an undirected graph")
+        names = list(graph.vertices)
+        rng = random.Random(seed)
+        k = min(k, len(names))
+        tables = {}
+
+        if strategy == "farthest":
+            landmarks = _select_farthest(graph, names, k, rng, tables)
+        elif strategy == "avoid":
+            landmarks = _select_avoid(graph, names, k, rng, tables)
+        elif strategy == "random":
+            landmarks = rng.sample(names, k)
+        else:
+            raise ValueError("unknown landmark strategy %r" % (strategy,))
+
+        missing = [landmark for landmark in landmarks if landmark not in tables]
+        if missing:
+            tables.update(_distance_tables(graph, missing, workers))
+
+        distances = array('d')
+        for landmark in landmarks:
+            table = tables[landmark]
+            distances.extend([table.get(name, INFINITY) for name in names])
+        return cls(names, landmarks, distances)
+
+    # heuristic for `goal`, usable wherever a heuristic dict is expected
+    def heuristic(self, goal):
+        return LandmarkHeuristic(self, goal)
+
+    # lower bound on the distance between two vertices
+    def lower_bound(self, vertex1, vertex2):
+        n = len(self.names)
+        i, j = self.ids[vertex1], self.ids[vertex2]
+        distances = self.distances
+        best = 0
+        for offset in range(0, len(distances), n):
+            a, b = distances[offset + i], distances[offset + j]
+            if a == INFINITY or b == INFINITY:
+                # different components only bound the distance if one is reachable
+                if a != b:
+                    return INFINITY
+                continue
+            if abs(a - b) > best:
+                best = abs(a - b)
+        return best
+
+
+class LandmarkHeuristic:
+    def __init__(self, landmarks, goal):
+        self.landmarks = landmarks
+        self.goal = goal
+        n = len(landmarks.names)
+        j = landmarks.ids[goal]
+        self.goal_distances = [landmarks.distances[offset + j]
+                               for offset in range(0, len(landmarks.distances), n)]
+        self.cache = {}
+
+    def __getitem__(self, vertex):
+        if vertex in self.cache:
+            return self.cache[vertex]
+        landmarks = self.landmarks
+        n = len(landmarks.names)
+        i = landmarks.ids[vertex]
+        distances = landmarks.distances
+        best = 0
+        for l, goal_distance in enumerate(self.goal_distances):
+            distance = distances[l * n + i]
+            if distance == INFINITY or goal_distance == INFINITY:
+                if distance != goal_distance:
+                    best = INFINITY
+                    break
+                continue
+            if abs(goal_distance - distance) > best:
+                best = abs(goal_distance - distance)
+        self.cache[vertex] = best
+        return best
+
+    def __call__(self, vertex):
+        return self[vertex]
+
+
+def _select_farthest(graph, names, k, rng, tables):
+    landmarks = []
+    # distance to the closest landmark chosen so far
+    closest = {}
+    candidate = rng.choice(names)
+    while len(landmarks) < k:
+        distances = graph.dijkstra(candidate)[0]
+        if not landmarks:
+            # the first search only locates a peripheral vertex
+            candidate = max(distances, key=distances.get)
+            distances = graph.dijkstra(candidate)[0]
+        landmarks.append(candidate)
+        tables[candidate] = distances
+        for name in names:
+            # unreached vertices (other components) are the farthest of all
+            distance = distances.get(name, INFINITY)
+            if distance < closest.get(name, INFINITY):
+                closest[name] = distance
+        for landmark in landmarks:
+            closest[landmark] = -1
+        candidate = max(names, key=lambda name: closest.get(name, INFINITY))
+        if closest.get(candidate, INFINITY) <= 0:
+            break
+    return landmarks
+
+
+def _select_avoid(graph, names, k, rng, tables):
+    landmarks = []
+    while len(landmarks) < k:
+        root = rng.choice(names)
+        distances, parents = graph.dijkstra(root)
+
+        # weight: how much the current landmarks underestimate d(root, v)
+        weight = {}
+        for vertex, distance in distances.items():
+            bound = 0
+            for landmark in landmarks:
+                a = tables[landmark].get(root, INFINITY)
+                b = tables[landmark].get(vertex, INFINITY)
+                if a != INFINITY and b != INFINITY and abs(a - b) > bound:
+                    bound = abs(a - b)
+            weight[vertex] = distance - bound
+
+        # subtree sizes; subtrees holding a landmark get size 0 so the next
+        # landmark avoids them
+        children = {vertex: [] for vertex in distances}
+        for vertex, parent in parents.items():
+            if parent is not None:
+                children[parent].append(vertex)
+        order = [root]
+        for vertex in order:
+            order.extend(children[vertex])
+        size = {}
+        holds = {}
+        for vertex in reversed(order):
+            holds[vertex] = vertex in tables or any(holds[child] for child in children[vertex])
+            size[vertex] = 0 if holds[vertex] else weight[vertex] + sum(size[child] for child in children[vertex])
+
+        # descend from the root along the heaviest child to a leaf
+        vertex = root
+        while children[vertex]:
+            child = max(children[vertex], key=size.get)
+            if size[child] <= 0:
+                break
+            vertex = child
+        if vertex in tables:
+            # every subtree already holds a landmark, fall back to a random one
+            remaining = [name for name in names if name not in tables]
+            if not remaining:
+                break
+            vertex = rng.choice(remaining)
+        landmarks.append(vertex)
+        tables[vertex] = graph.dijkstra(vertex)[0]
+    return landmarks
+
+
+def _distance_tables(graph, landmarks, workers):
+    if workers == 1 or len(landmarks) == 1:
+        return {landmark: graph.dijkstra(landmark)[0] for landmark in landmarks}
+    with graph_pool(graph, workers) as pool:
+        return dict(zip(landmarks, pool.map(_distance_table, landmarks)))
+
+
+def _distance_table(landmark):
+    return shared_graph().dijkstra(landmark)[0]
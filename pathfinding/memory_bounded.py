@@ -0,0 +1,290 @@
+# Memory-bounded searches for state spaces too large to hold: grids
+# generated on the fly, puzzle states, ... As in best_first.py the space is
+# a `neighbors(state)` callable, states only need to be hashable, the
+# heuristic is a mapping or a callable (admissible for optimal paths) and
+# `cost(state, neighbor)` gives the edge costs, 1 without it. Both searches
+# return (path, cost), or None if the goal cannot be reached.
+#
+# ida_star: iterative deepening A*. Depth-first searches bounded by f = g + h,
+#   the bound raised to the smallest f that exceeded it until the goal is
+#   within it. Memory is the current path, O(depth), plus the optional
+#   transposition table; the price is re-expanding the states of earlier
+#   iterations, and on graphs with many paths to a state (grids) the same
+#   state within an iteration, unless the table catches it.
+# sma_star: simplified memory-bounded A*. A best-first search holding at most
+#   `max_nodes` search nodes: when memory is full the worst leaf (highest f,
+#   shallowest) is forgotten and its f is backed up into its parent, which
+#   regenerates it once everything else looks worse. Parents keep the f of
+#   every forgotten child, which is what makes a memory-starved search end,
+#   so memory is max_nodes nodes plus as many f-values per node as it has
+#   successors. Optimal if the optimal path fits in memory (it has at most
+#   max_nodes states). When it does not, or the goal cannot be reached, the
+#   search only ends after trying every path that fits, which takes time
+#   exponential in max_nodes; with barely enough memory it also spends many
+#   times the expansions of A* regenerating nodes. Under unit costs the
+#   admissible heuristic bounds the length of a path, so queries whose goal
+#   is farther than max_nodes - 1 moves return None at once and branches
+#   that cannot reach it within memory are dropped, but otherwise only a
+#   budget keeps a memory-starved search short.
+#
+# Both searches take a deadline (a time.time() value) and max_expansions,
+# and return None once either is reached, like budgeted_a_star_search of
+# dorian.py.
+#
+# With table_size > 0 a TranspositionTable remembers the cheapest g seen for
+# up to `table_size` states, least recently used ones are dropped, and
+# states reached again at no lower cost are pruned (ida_star clears it each
+# iteration). A smaller table only prunes less, the paths stay optimal.
+#
+#   path, cost = ida_star(puzzle_moves, scrambled, solved, manhattan, table_size=1 << 16)
+#   path, cost = sma_star(grid_moves, start, goal, manhattan, max_nodes=100000, max_expansions=10 ** 6)
+import heapq
+import math
+import time
+from collections import OrderedDict
+from itertools import count
+
+from .best_first import estimator
+from .tracer import finish
+
+
+def _budget(deadline, max_expansions):
+    def out_of_budget(expansions):
+        return max_expansions is not None and expansions >= max_expansions or \
+            deadline is not None and time.time() > deadline
+    return out_of_budget
+
+
+class TranspositionTable:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+
+    # the cheapest g the state was reached at, math.inf if unknown
+    def lookup(self, state):
+        best = self.entries.get(state)
+        if best is None:
+            return math.inf
+        self.entries.move_to_end(state)
+        self.hits += 1
+        return best
+
+    def store(self, state, g):
+        entries = self.entries
+        entries[state] = g
+        entries.move_to_end(state)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+
+def ida_star(neighbors, start, goal, heuristic, cost=None, table_size=0, tracer=None, deadline=None,
+             max_expansions=None):
+    h = estimator(heuristic)
+    table = TranspositionTable(table_size) if table_size else None
+    out_of_budget = _budget(deadline, max_expansions)
+    expansions = 0
+    bound = h(start)
+    if tracer is not None:
+        tracer.start("ida_star", start, goal)
+        tracer.expand(start)
+    if start == goal:
+        return finish(tracer, ([start], 0))
+
+    path = [start]
+    on_path = {start}
+    while True:
+        exceeded = math.inf
+        if table is not None:
+            # entries of the last iteration were reached under a lower bound
+            table.clear()
+        # one successor iterator and g per state of the path
+        stack = [(iter(neighbors(start)), 0)]
+        while stack:
+            successors, g = stack[-1]
+            for neighbor in successors:
+                if neighbor in on_path:
+                    continue
+                tentative = g + (1 if cost is None else cost(path[-1], neighbor))
+                estimate = tentative + h(neighbor)
+                if estimate > bound:
+                    exceeded = min(exceeded, estimate)
+                    continue
+                if table is not None:
+                    if table.lookup(neighbor) <= tentative:
+                        continue
+                    table.store(neighbor, tentative)
+                if out_of_budget(expansions):
+                    return finish(tracer, None)
+                expansions += 1
+                if tracer is not None:
+                    tracer.expand(neighbor)
+                if neighbor == goal:
+                    path.append(neighbor)
+                    return finish(tracer, (path, tentative))
+                path.append(neighbor)
+                on_path.add(neighbor)
+                stack.append((iter(neighbors(neighbor)), tentative))
+                if tracer is not None:
+                    tracer.frontier(stack)
+                break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+        if exceeded == math.inf:
+            return finish(tracer, None)
+        bound = exceeded
+        path, on_path = [start], {start}
+
+
+class _Node:
+    __slots__ = ("state", "parent", "g", "f", "depth", "children", "forgotten", "expanded", "alive")
+
+    def __init__(self, state, parent, g, f, depth):
+        self.state = state
+        self.parent = parent
+        self.g = g
+        self.f = f
+        self.depth = depth
+        # created when needed, most nodes are leaves
+        self.children = None
+        # state -> f of the children that were forgotten
+        self.forgotten = None
+        self.expanded = False
+        self.alive = True
+
+
+def sma_star(neighbors, start, goal, heuristic, cost=None, max_nodes=100000, table_size=0, tracer=None,
+             deadline=None, max_expansions=None):
+    if max_nodes < 2:
+        raise ValueError("max_nodes must be at least 2")
+    h = estimator(heuristic)
+    table = TranspositionTable(table_size) if table_size else None
+    out_of_budget = _budget(deadline, max_expansions)
+    expansions = 0
+    order = count()
+    root = _Node(start, None, 0, h(start), 0)
+    # the cheapest node of every state in memory
+    resident = {start: root}
+    nodes = 1
+    # open nodes by (f, deepest first), leaves by (f, shallowest first)
+    # descending; outdated entries are skipped when they come up
+    open_list = [(root.f, 0, next(order), root)]
+    leaves = []
+    if tracer is not None:
+        tracer.start("sma_star", start, goal)
+    if cost is None and start != goal and h(start) + 1 > max_nodes:
+        # even the shortest path has more states than fit in memory
+        return finish(tracer, None)
+
+    while open_list:
+        f, _, _, node = heapq.heappop(open_list)
+        if not node.alive or f != node.f or node.expanded and not node.forgotten:
+            continue
+        if f == math.inf or out_of_budget(expansions):
+            break
+        expansions += 1
+        if tracer is not None:
+            tracer.expand(node.state)
+        if node.state == goal:
+            path, total_cost = [], node.g
+            while node is not None:
+                path.append(node.state)
+                node = node.parent
+            return finish(tracer, (path[::-1], total_cost))
+
+        if not node.expanded:
+            node.expanded = True
+            node.children = []
+            successors = [(neighbor, None) for neighbor in neighbors(node.state)]
+        else:
+            # bring back the forgotten children that look best, with the f
+            # they had when they were forgotten
+            lowest = min(node.forgotten.values())
+            successors = [(state, estimate) for state, estimate in node.forgotten.items() if estimate == lowest]
+            for state, _ in successors:
+                del node.forgotten[state]
+        for neighbor, estimate in successors:
+            g = node.g + (1 if cost is None else cost(node.state, neighbor))
+            # a state in memory at the same or a lower cost is not added
+            # again; the branch holding it backs up its f when forgotten
+            other = resident.get(neighbor)
+            if other is not None and other.g <= g:
+                continue
+            if table is not None:
+                best = table.lookup(neighbor)
+                if best < g:
+                    continue
+                if g < best:
+                    table.store(neighbor, g)
+            if estimate is None:
+                estimate = h(neighbor)
+                # states of the shortest path through it: the ones down to
+                # it, then at least one more unless it is the goal, at least
+                # its heuristic more under unit costs
+                remaining = 0 if neighbor == goal else max(1, estimate) if cost is None else 1
+                if node.depth + 2 + remaining > max_nodes:
+                    # no room left for a path through it
+                    estimate = math.inf
+                else:
+                    estimate = max(node.f, g + estimate)
+            child = _Node(neighbor, node, g, estimate, node.depth + 1)
+            node.children.append(child)
+            resident[neighbor] = child
+            nodes += 1
+            heapq.heappush(open_list, (estimate, -child.depth, next(order), child))
+            heapq.heappush(leaves, (-estimate, child.depth, next(order), child))
+            if tracer is not None:
+                tracer.push(neighbor, estimate)
+
+        # back the lowest f of the children up towards the root; a dead end
+        # gets f = inf and is the first leaf to be forgotten
+        current = node
+        while current is not None:
+            forgotten = min(current.forgotten.values()) if current.forgotten else math.inf
+            backed_up = min(min((child.f for child in current.children), default=math.inf), forgotten)
+            if current is not node and backed_up == current.f:
+                break
+            current.f = backed_up
+            if current.forgotten:
+                heapq.heappush(open_list, (backed_up, -current.depth, next(order), current))
+            if not current.children:
+                heapq.heappush(leaves, (-backed_up, current.depth, next(order), current))
+            current = current.parent
+
+        while nodes > max_nodes:
+            priority, _, _, leaf = heapq.heappop(leaves)
+            if not leaf.alive or leaf.children or leaf is root or -priority != leaf.f:
+                continue
+            parent = leaf.parent
+            leaf.alive = False
+            nodes -= 1
+            if resident.get(leaf.state) is leaf:
+                del resident[leaf.state]
+            parent.children.remove(leaf)
+            if parent.forgotten is None:
+                parent.forgotten = {}
+            parent.forgotten[leaf.state] = leaf.f
+            heapq.heappush(open_list, (parent.f, -parent.depth, next(order), parent))
+            if not parent.children:
+                heapq.heappush(leaves, (-parent.f, parent.depth, next(order), parent))
+        # outdated heap entries keep forgotten nodes alive, drop them before
+        # they outnumber the nodes in memory
+        if len(open_list) + len(leaves) > 2 * nodes + 64:
+            open_list = [entry for entry in open_list if entry[3].alive and entry[0] == entry[3].f
+                         and (not entry[3].expanded or entry[3].forgotten)]
+            leaves = [entry for entry in leaves if entry[3].alive and -entry[0] == entry[3].f
+                      and not entry[3].children]
+            heapq.heapify(open_list)
+            heapq.heapify(leaves)
+        if tracer is not None:
+            tracer.frontier(open_list)
+    return finish(tracer, None)
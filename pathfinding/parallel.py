@@ -0,0 +1,34 @@
+# Process pools whose workers share one graph.
+# The pool initializer hands every worker its pool's graph. Where the fork
+# start method exists the initializer's arguments are inherited from the
+# parent process copy-on-write, so the graph is never pickled; elsewhere it
+# is pickled once per worker, never once per task. Either way each pool's
+# workers get the graph of their own pool, however many pools exist and
+# whenever their workers start, and the parent keeps no reference to it
+# once the pool is gone. Task functions read the graph with shared_graph()
+# and the optional `context` object given to graph_pool() with
+# shared_context().
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+_graph = None
+_context = None
+
+
+def _set_graph(graph, context=None):
+    global _graph, _context
+    _graph = graph
+    _context = context
+
+
+def shared_graph():
+    return _graph
+
+
+def shared_context():
+    return _context
+
+
+def graph_pool(graph, workers=None, context=None):
+    start_method = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(workers, mp_context=start_method, initializer=_set_graph, initargs=(graph, context))
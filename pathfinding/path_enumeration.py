@@ -0,0 +1,191 @@
+# Streaming enumeration of simple paths between two nodes.
+# Works on the adjacency-list graphs of lab2_codev1/2 ({node: [neighbors]},
+# every edge costs 1) and on weighted dict-of-dicts ({node: {neighbor: cost}},
+# e.g. Graph.vertices from dorian.py). Paths are yielded lazily as tuples.
+#
+#   for path in all_paths(graph, 'A', 'I', max_depth=6):
+#       ...
+#
+# order="dfs": depth-first with a single mutable path and an on-path set,
+#   backtracking instead of copying `path + [neighbor]` on every push, so
+#   memory is O(depth) however many paths are consumed
+# order="bfs": paths in order of their number of edges; the frontier is a
+#   trie of parent pointers, so paths sharing a prefix share its storage
+# order="shortest": paths in order of total cost (Yen's k shortest paths)
+#
+# max_depth limits the number of edges of a path, max_paths the number of
+# paths yielded.
+import heapq
+from array import array
+from collections import deque
+from itertools import count, islice
+
+
+def all_paths(graph, start, goal, order="dfs", max_depth=None, max_paths=None):
+    if order == "dfs":
+        paths = _dfs_paths(graph, start, goal, max_depth)
+    elif order == "bfs":
+        paths = _bfs_paths(graph, start, goal, max_depth)
+    elif order == "shortest":
+        paths = _shortest_paths(graph, start, goal, max_depth)
+    else:
+        raise ValueError("unknown order %r" % (order,))
+    if max_paths is not None:
+        paths = islice(paths, max_paths)
+    return paths
+
+
+# the k cheapest simple paths, cheapest first
+def k_shortest_paths(graph, start, goal, k, max_depth=None):
+    return all_paths(graph, start, goal, "shortest", max_depth, k)
+
+
+def _dfs_paths(graph, start, goal, max_depth):
+    if start == goal:
+        yield (start,)
+        return
+    path = [start]
+    on_path = {start}
+    # neighbors are tried last to first, the order of dfs_paths in lab2_codev2
+    stack = [reversed(list(graph[start]))]
+    while stack:
+        for neighbor in stack[-1]:
+            if neighbor in on_path:
+                continue
+            if neighbor == goal:
+                if max_depth is None or len(path) <= max_depth:
+                    yield tuple(path) + (neighbor,)
+                continue
+            if max_depth is not None and len(path) >= max_depth:
+                continue
+            path.append(neighbor)
+            on_path.add(neighbor)
+            stack.append(reversed(list(graph[neighbor])))
+            break
+        else:
+            stack.pop()
+            on_path.discard(path.pop())
+
+
+def _bfs_paths(graph, start, goal, max_depth):
+    if start == goal:
+        yield (start,)
+        return
+    # trie of partial paths: node i holds vertices[i], its parent node and
+    # its number of edges from the start
+    vertices = [start]
+    parents = array('q', [-1])
+    depths = array('q', [0])
+
+    def path_to(node):
+        path = []
+        while node >= 0:
+            path.append(vertices[node])
+            node = parents[node]
+        path.reverse()
+        return path
+
+    def on_path(node, vertex):
+        while node >= 0:
+            if vertices[node] == vertex:
+                return True
+            node = parents[node]
+        return False
+
+    queue = deque([0])
+    while queue:
+        node = queue.popleft()
+        depth = depths[node] + 1
+        for neighbor in graph[vertices[node]]:
+            if on_path(node, neighbor):
+                continue
+            if neighbor == goal:
+                if max_depth is None or depth <= max_depth:
+                    yield tuple(path_to(node)) + (neighbor,)
+                continue
+            if max_depth is not None and depth >= max_depth:
+                continue
+            vertices.append(neighbor)
+            parents.append(node)
+            depths.append(depth)
+            queue.append(len(vertices) - 1)
+
+
+# (neighbor, cost) pairs for weighted and unweighted graphs
+def _edges(graph, node):
+    neighbors = graph[node]
+    if isinstance(neighbors, dict):
+        return neighbors.items()
+    return ((neighbor, 1) for neighbor in neighbors)
+
+
+def _path_cost(graph, path):
+    cost = 0
+    for a, b in zip(path, path[1:]):
+        neighbors = graph[a]
+        cost += neighbors[b] if isinstance(neighbors, dict) else 1
+    return cost
+
+
+# Dijkstra avoiding some nodes and edges; returns (cost, path) or None
+def _shortest_path(graph, start, goal, removed_nodes, removed_edges):
+    tie = count()
+    queue = [(0, next(tie), start)]
+    distances = {start: 0}
+    parents = {start: None}
+    settled = set()
+    while queue:
+        distance, _, node = heapq.heappop(queue)
+        if node in settled:
+            continue
+        if node == goal:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = parents[node]
+            return distance, tuple(reversed(path))
+        settled.add(node)
+        for neighbor, cost in _edges(graph, node):
+            if neighbor in removed_nodes or neighbor in settled or (node, neighbor) in removed_edges:
+                continue
+            candidate = distance + cost
+            if neighbor not in distances or candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                parents[neighbor] = node
+                heapq.heappush(queue, (candidate, next(tie), neighbor))
+    return None
+
+
+# Yen's algorithm: every next path deviates from an earlier one at some
+# spur node, with the edges used by earlier paths sharing that prefix removed.
+def _shortest_paths(graph, start, goal, max_depth):
+    first = _shortest_path(graph, start, goal, set(), set())
+    if first is None:
+        return
+    accepted = [first[1]]
+    candidates = []
+    seen = {first[1]}
+    tie = count()
+    if max_depth is None or len(first[1]) - 1 <= max_depth:
+        yield first[1]
+
+    while True:
+        previous = accepted[-1]
+        for i in range(len(previous) - 1):
+            root = previous[:i + 1]
+            removed_edges = {(path[i], path[i + 1]) for path in accepted
+                             if len(path) > i + 1 and path[:i + 1] == root}
+            removed_nodes = set(root[:-1])
+            spur = _shortest_path(graph, root[-1], goal, removed_nodes, removed_edges)
+            if spur is None:
+                continue
+            path = root[:-1] + spur[1]
+            if path not in seen:
+                seen.add(path)
+                heapq.heappush(candidates, (_path_cost(graph, path), next(tie), path))
+        if not candidates:
+            return
+        _, _, path = heapq.heappop(candidates)
+        accepted.append(path)
+        if max_depth is None or len(path) - 1 <= max_depth:
+            yield path
@@ -0,0 +1,139 @@
+# Opt-in result cache for Graph searches.
+#
+#   graph.enable_cache(maxsize=10000, max_trees=64)
+#   graph.a_star_search(start, goal, heuristic)   # searched
+#   graph.a_star_search(start, goal, heuristic)   # from the cache
+#   graph.cache.stats()
+#
+# Results are keyed by (algorithm, start, goal, heuristic and weight
+# identity) and evicted least recently used first. Graph bumps its `version`
+# on every mutation (add_vertex, add_edge, remove_edge, remove_vertex,
+# set_edge_attributes); a cache that sees a new version drops everything it
+# holds.
+#
+# Heuristics are compared by identity, and the cache keeps a reference to
+# them so the identity cannot be reused; a heuristic dict that is changed in
+# place after a search is not noticed.
+#
+# Shortest path trees from Graph.shortest_path_tree() are cached as well,
+# and optimal searches (a_star_search, bidirectional_dijkstra,
+# bidirectional_a_star_search) from a source with a cached tree are answered
+# by construct_path alone.
+import functools
+from collections import OrderedDict
+
+
+class QueryCache:
+    def __init__(self, maxsize=1024, max_trees=16):
+        self.maxsize = maxsize
+        self.max_trees = max_trees
+        self.results = OrderedDict()
+        self.trees = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.tree_hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def clear(self):
+        self.results.clear()
+        self.trees.clear()
+
+    def check_version(self, version):
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    # returns (found, result)
+    def get(self, key, heuristics):
+        entry = self.results.get(key)
+        if entry is None or any(a is not b for a, b in zip(entry[0], heuristics)):
+            self.misses += 1
+            return False, None
+        self.results.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def put(self, key, heuristics, result):
+        self.results[key] = (heuristics, result)
+        self.results.move_to_end(key)
+        while len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def get_tree(self, source):
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.trees.move_to_end(source)
+        return tree
+
+    def put_tree(self, source, tree):
+        self.trees[source] = tree
+        self.trees.move_to_end(source)
+        while len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "tree_hits": self.tree_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.tree_hits) / (lookups + self.tree_hits) if lookups + self.tree_hits else 0.0,
+            "evictions": self.evictions,
+            "results": len(self.results),
+            "trees": len(self.trees),
+        }
+
+
+def _copy(result):
+    if result is None:
+        return None
+    path, total_cost = result
+    return list(path), total_cost
+
+
+# Decorator for Graph search methods taking (start_vertex, goal_vertex,
+# <heuristics heuristic arguments>, tracer=None, weight=None). Searches with
+# a tracer always run, so the tracer sees them. The weight selector is part
+# of the key like the heuristics. With optimal=True a cached shortest path
+# tree of the start vertex answers queries on the default weight.
+def cached(algorithm, heuristics=0, optimal=False):
+    def decorator(search):
+        @functools.wraps(search)
+        def wrapper(graph, start_vertex, goal_vertex, *arguments, tracer=None, weight=None):
+            # tracer and weight may come positionally after the heuristics
+            if len(arguments) > heuristics + 2:
+                raise TypeError("%s() takes at most %d positional arguments (%d given)" % (
+                    search.__name__, heuristics + 4, len(arguments) + 2))
+            if len(arguments) > heuristics + 1:
+                weight = arguments[heuristics + 1]
+            if len(arguments) > heuristics:
+                arguments, tracer = arguments[:heuristics], arguments[heuristics]
+            cache = graph.cache
+            if cache is None or tracer is not None:
+                return search(graph, start_vertex, goal_vertex, *arguments, tracer=tracer, weight=weight)
+            cache.check_version(graph.version)
+
+            if optimal and weight is None:
+                tree = cache.get_tree(start_vertex)
+                if tree is not None:
+                    cache.tree_hits += 1
+                    distances, parents = tree
+                    if goal_vertex not in distances:
+                        return None
+                    return graph.construct_path(start_vertex, goal_vertex, parents)
+
+            keyed = arguments + (weight,)
+            key = (algorithm, start_vertex, goal_vertex) + tuple(id(argument) for argument in keyed)
+            found, result = cache.get(key, keyed)
+            if not found:
+                result = search(graph, start_vertex, goal_vertex, *arguments, weight=weight)
+                cache.put(key, keyed, result)
+            return _copy(result)
+        return wrapper
+    return decorator
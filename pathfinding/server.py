@@ -0,0 +1,493 @@
+# Asynchronous route service over one graph held in memory.
+#
+#   server = QueryServer(graph, heuristic=Landmarks.build(graph).heuristic)
+#   await server.start("127.0.0.1", 8080)
+#   path, total_cost = await server.route(start, goal)      # or over HTTP
+#
+# The event loop never searches. Route requests are queued, and a dispatcher
+# hands them to a process pool whose workers share the graph (see
+# parallel.py). At most `workers` batches are in flight: while they run the
+# queue fills up, and the next free worker gets everything queued by then
+# (at most `batch_size` requests) as one task, so a burst of requests costs
+# one pickle round trip per batch instead of one per request while a lone
+# request is dispatched at once. A `batch_delay` in seconds makes the
+# dispatcher also wait that long for more requests before each batch.
+#
+# Every request has a deadline (its timeout, `timeout` by default). Workers
+# run searches with a DeadlineTracer, so a search that passes its deadline
+# or is cancelled stops inside the worker instead of running to the end.
+# Cancellation reaches the workers through a shared array of flags, one slot
+# per pending request; a request cancelled before its batch left is dropped.
+#
+# HTTP on localhost (JSON responses, HTTP/1.1 keep-alive):
+#   GET  /route?start=A&goal=B[&algorithm=a_star_search][&timeout=2][&id=x]
+#   POST /route   {"start": ..., "goal": ..., "algorithm": ..., "timeout": ..., "id": ...}
+#   DELETE /route?id=x      cancel the pending request with that id
+#   GET  /metrics           counters, throughput, latency percentiles, batching
+#   GET  /health
+# Statuses: 200 path found, 404 no path, 400 bad request, 409 cancelled,
+# 500 the search failed, 503 too many pending requests, 504 deadline passed. In query strings a
+# vertex name that is not in the graph but looks like an integer is taken as
+# one; JSON bodies keep their types (lists become tuples, for grid cells).
+#
+# usage: python -m pathfinding.server [--edges network.csv | --luxembourg]
+#   [--host 127.0.0.1] [--port 8080] [--workers N] [--landmarks K]
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+from .parallel import graph_pool, shared_context, shared_graph
+from .tracer import DeadlineTracer, SearchCancelled
+
+ALGORITHMS = ("a_star_search", "weighted_a_star_search", "bidirectional_dijkstra", "bfs", "dfs", "greedy_search")
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+               500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class Overloaded(Exception):
+    pass
+
+
+# a search that raised in its worker; the other queries of the batch go on
+class QueryFailed(Exception):
+    pass
+
+
+# heuristic used when the server has none: A* becomes Dijkstra
+class _ZeroHeuristic:
+    def __getitem__(self, vertex):
+        return 0
+
+
+# runs in a worker: (slot, algorithm, start, goal, deadline) queries ->
+# ("ok", result), ("cancelled", reason) or ("error", message) each, so a
+# query that fails does not take the rest of its batch with it
+def _route_batch(queries):
+    graph = shared_graph()
+    heuristic_for, flags = shared_context()
+    results = []
+    for slot, algorithm, start, goal, deadline in queries:
+        tracer = DeadlineTracer(deadline, lambda slot=slot: flags[slot])
+        try:
+            if algorithm in ("a_star_search", "weighted_a_star_search", "greedy_search"):
+                heuristic = heuristic_for(goal) if heuristic_for is not None else _ZeroHeuristic()
+                result = getattr(graph, algorithm)(start, goal, heuristic, tracer=tracer)
+            else:
+                result = getattr(graph, algorithm)(start, goal, tracer=tracer)
+            results.append(("ok", result))
+        except SearchCancelled as error:
+            results.append(("cancelled", str(error)))
+        except Exception as error:
+            results.append(("error", "%s: %s" % (type(error).__name__, error)))
+    return results
+
+
+class _Pending:
+    def __init__(self, slot, algorithm, start, goal, deadline, future, request_id):
+        self.slot = slot
+        self.algorithm = algorithm
+        self.start = start
+        self.goal = goal
+        self.deadline = deadline
+        self.future = future
+        self.request_id = request_id
+
+    def query(self):
+        return self.slot, self.algorithm, self.start, self.goal, self.deadline
+
+
+class Metrics:
+    def __init__(self, window=10000):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.found = 0
+        self.not_found = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched = 0
+        self.latencies = deque(maxlen=window)
+        self.completions = deque(maxlen=window)
+
+    def completed(self, latency, found):
+        if found:
+            self.found += 1
+        else:
+            self.not_found += 1
+        self.latencies.append(latency)
+        self.completions.append(time.monotonic())
+
+    def snapshot(self, pending, queued):
+        now = time.monotonic()
+        uptime = now - self.started
+        recent = [t for t in self.completions if now - t <= 10]
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1e3
+
+        completed = self.found + self.not_found
+        return {
+            "uptime": uptime,
+            "requests": self.requests,
+            "completed": completed,
+            "found": self.found,
+            "not_found": self.not_found,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "pending": pending,
+            "queued": queued,
+            "throughput": completed / uptime if uptime else 0.0,
+            "throughput_10s": len(recent) / min(10, uptime) if uptime else 0.0,
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99),
+                           "max": latencies[-1] * 1e3 if latencies else None},
+            "batches": self.batches,
+            "mean_batch": self.batched / self.batches if self.batches else 0.0,
+        }
+
+
+class QueryServer:
+    def __init__(self, graph, heuristic=None, workers=None, batch_size=32, batch_delay=0.0, timeout=10.0,
+                 max_pending=4096):
+        self.graph = graph
+        # goal -> heuristic table, e.g. Landmarks.heuristic; must be picklable
+        # where workers are not forked
+        self.heuristic = heuristic
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.timeout = timeout
+        self.flags = multiprocessing.RawArray('b', max_pending)
+        self.free_slots = list(range(max_pending))
+        self.requests = {}
+        self.metrics = Metrics()
+        self.pool = None
+        self.server = None
+        self.queue = None
+        self.dispatcher = None
+        self.host = None
+        self.port = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.pool = graph_pool(self.graph, self.workers, (self.heuristic, self.flags))
+        self.queue = asyncio.Queue()
+        self.dispatcher = asyncio.create_task(self._dispatch())
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        self.host, self.port = self.server.sockets[0].getsockname()[:2]
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+            try:
+                await self.dispatcher
+            except asyncio.CancelledError:
+                pass
+        for flag in range(len(self.flags)):
+            self.flags[flag] = 1
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # (path, total_cost) or None. Raises KeyError for unknown vertices,
+    # ValueError for an unknown algorithm or an unhashable vertex or id, asyncio.TimeoutError when the
+    # deadline passes, SearchCancelled after cancel(request_id), QueryFailed
+    # when the search raised in its worker and Overloaded when max_pending
+    # requests are already waiting.
+    async def route(self, start, goal, algorithm="a_star_search", timeout=None, request_id=None):
+        self.metrics.requests += 1
+        for value in (start, goal, request_id):
+            try:
+                hash(value)
+            except TypeError:
+                self.metrics.errors += 1
+                raise ValueError("%r is not a valid vertex or request id" % (value,)) from None
+        if algorithm not in ALGORITHMS:
+            self.metrics.errors += 1
+            raise ValueError("unknown algorithm %r" % (algorithm,))
+        for vertex in (start, goal):
+            if vertex not in self.graph.vertices:
+                self.metrics.errors += 1
+                raise KeyError(vertex)
+        if not self.free_slots:
+            self.metrics.rejected += 1
+            raise Overloaded("%d requests pending" % len(self.flags))
+
+        timeout = self.timeout if timeout is None else timeout
+        slot = self.free_slots.pop()
+        self.flags[slot] = 0
+        future = asyncio.get_running_loop().create_future()
+        pending = _Pending(slot, algorithm, start, goal, time.time() + timeout, future, request_id)
+        if request_id is not None:
+            self.requests[request_id] = pending
+        self.queue.put_nowait(pending)
+        began = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.flags[slot] = 1
+            future.cancel()
+            self.metrics.timeouts += 1
+            raise
+        except SearchCancelled:
+            self.metrics.cancelled += 1
+            raise
+        except QueryFailed:
+            self.metrics.errors += 1
+            raise
+        except asyncio.CancelledError:
+            # the caller went away
+            self.flags[slot] = 1
+            future.cancel()
+            self.metrics.cancelled += 1
+            raise
+        finally:
+            if request_id is not None and self.requests.get(request_id) is pending:
+                del self.requests[request_id]
+        self.metrics.completed(time.perf_counter() - began, result is not None)
+        return result
+
+    # cancels a pending route() started with this request_id
+    def cancel(self, request_id):
+        pending = self.requests.get(request_id)
+        if pending is None or pending.future.done():
+            return False
+        self.flags[pending.slot] = 1
+        pending.future.set_exception(SearchCancelled("cancelled"))
+        return True
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self.workers)
+        while True:
+            batch = [await self.queue.get()]
+            # while every worker is busy the queue keeps filling up
+            await in_flight.acquire()
+            closes = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                remaining = closes - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            live = []
+            for pending in batch:
+                if pending.future.done():
+                    self.free_slots.append(pending.slot)
+                else:
+                    live.append(pending)
+            if not live:
+                in_flight.release()
+                continue
+            asyncio.create_task(self._run_batch(live, in_flight))
+
+    async def _run_batch(self, batch, in_flight):
+        loop = asyncio.get_running_loop()
+        self.metrics.batches += 1
+        self.metrics.batched += len(batch)
+        try:
+            results = await loop.run_in_executor(self.pool, _route_batch, [pending.query() for pending in batch])
+        except Exception as error:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(error)
+        else:
+            for pending, (status, value) in zip(batch, results):
+                if pending.future.done():
+                    continue
+                if status == "ok":
+                    pending.future.set_result(value)
+                elif status == "cancelled":
+                    pending.future.set_exception(SearchCancelled(value))
+                else:
+                    pending.future.set_exception(QueryFailed(value))
+        finally:
+            for pending in batch:
+                self.free_slots.append(pending.slot)
+            in_flight.release()
+
+    # HTTP
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = await self._respond(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health" and method == "GET":
+            return 200, {"status": "ok", "vertices": len(self.graph.vertices)}
+        if url.path == "/metrics" and method == "GET":
+            return 200, self.metrics.snapshot(len(self.flags) - len(self.free_slots), self.queue.qsize())
+        if url.path != "/route":
+            return 404, {"error": "unknown path %s" % url.path}
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == "DELETE":
+            return 200, {"cancelled": self.cancel(query.get("id"))}
+        if method == "POST":
+            try:
+                query = json.loads(body or b"{}")
+            except ValueError:
+                return 400, {"error": "body is not JSON"}
+            if not isinstance(query, dict):
+                return 400, {"error": "body is not a JSON object"}
+            start, goal = _from_json(query.get("start")), _from_json(query.get("goal"))
+        elif method == "GET":
+            start, goal = self._vertex(query.get("start")), self._vertex(query.get("goal"))
+        else:
+            return 405, {"error": "method %s not allowed" % method}
+
+        try:
+            timeout = float(query["timeout"]) if query.get("timeout") is not None else None
+            began = time.perf_counter()
+            result = await self.route(start, goal, query.get("algorithm", "a_star_search"), timeout,
+                                      query.get("id"))
+        except KeyError as error:
+            return 400, {"error": "unknown vertex %r" % (error.args[0],)}
+        except (TypeError, ValueError) as error:
+            # a timeout that is not a number also ends up here
+            return 400, {"error": str(error)}
+        except asyncio.TimeoutError:
+            return 504, {"error": "deadline passed"}
+        except SearchCancelled as error:
+            return 409, {"error": str(error)}
+        except QueryFailed as error:
+            return 500, {"error": str(error)}
+        except Overloaded as error:
+            return 503, {"error": str(error)}
+        if result is None:
+            return 404, {"error": "no path"}
+        path, total_cost = result
+        return 200, {"path": path, "cost": total_cost, "ms": (time.perf_counter() - began) * 1e3}
+
+    def _vertex(self, name):
+        if name is not None and name not in self.graph.vertices and name.lstrip("-").isdigit():
+            return int(name)
+        return name
+
+
+def _from_json(value):
+    return tuple(_from_json(item) for item in value) if isinstance(value, list) else value
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(("HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                  "Connection: %s\r\n\r\n" % (status, STATUS_TEXT.get(status, ""), len(body),
+                                               "keep-alive" if keep_alive else "close")).encode("latin-1"))
+    writer.write(body)
+
+
+# Minimal client for tests and benchmarks: one request over a connection
+# (reader, writer) from asyncio.open_connection, returns (status, payload).
+async def fetch(reader, writer, method, target, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(("%s %s HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n"
+                  % (method, target, len(body))).encode("latin-1") + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog="python -m pathfinding.server", description="Serve route queries.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--edges", help="CSV/TSV edge list to load")
+    source.add_argument("--luxembourg", action="store_true", help="serve luxembourg_railway() (default)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--landmarks", type=int, default=0, help="use an ALT heuristic with this many landmarks")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    options = parser.parse_args(arguments)
+
+    from .dorian import Graph, luxembourg_railway
+    if options.edges:
+        graph = Graph.from_edge_list(options.edges)
+    else:
+        graph = luxembourg_railway()[0]
+    heuristic = None
+    if options.landmarks:
+        from .landmarks import Landmarks
+        heuristic = Landmarks.build(graph, k=options.landmarks).heuristic
+
+    async def serve():
+        server = await QueryServer(graph, heuristic, options.workers, timeout=options.timeout).start(
+            options.host, options.port)
+        print("serving %d vertices on http://%s:%d" % (len(graph.vertices), server.host, server.port))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+# Snapshots: a graph and what was computed from it, saved to one binary file
+# that later processes map with mmap and use in place.
+#
+#   save_snapshot(graph, "railway.snap", heuristics={"Troisvierges": heuristics},
+#                 trees={"Luxembourg": graph.shortest_path_tree("Luxembourg")},
+#                 landmarks=Landmarks.build(graph), arrays={"field": engine.distance_field(goal)})
+#
+#   snapshot = load_snapshot("railway.snap")
+#   snapshot.graph                          # CSRGraph over the mapped arrays
+#   snapshot.heuristics["Troisvierges"]     # read-only mapping vertex -> estimate
+#   snapshot.trees["Luxembourg"]            # (distances, parents) mappings
+#   snapshot.landmarks                      # Landmarks
+#   snapshot.arrays["field"]                # the NumPy array (or memoryview)
+#   graph = snapshot.to_graph()             # mutable Graph, trees in its cache
+#
+# Layout, little-endian like the binary CSR files of graph_io.py: a fixed
+# header, every section as a raw array starting on an 8 byte boundary, then
+# a JSON table of contents listing each section with its offset, size,
+# format and crc32; the header holds the format version, the file size and
+# the size and crc32 of the table of contents.
+# load_snapshot() checks the header and the table of contents and, with
+# verify=True, the checksum of every section (one pass over the file). The
+# arrays are then used where they lie: vertex names are looked up through a
+# hash index stored in the file, not a dict built at start-up, so loading
+# takes the same milliseconds whatever the size of the graph, and processes
+# mapping the same file share one copy of it in the page cache.
+#
+# A snapshot is pickled as its path, so handing it (or its graph) to a
+# spawned worker process maps the file there instead of copying the graph.
+#
+# Vertex names must be JSON values (strings, numbers, booleans, None) or
+# tuples of them; names 0..n-1 are not stored at all. Heuristic tables hold
+# a float per vertex, trees keep integral distances integral. Edge attribute
+# columns are not part of a snapshot.
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping
+
+from .csr_graph import CSRGraph
+from .graph_io import IdentityIds, _little_endian, _tuples, _typecode
+from .landmarks import Landmarks
+
+MAGIC = b"PFSN"
+FORMAT_VERSION = 1
+# magic, version, table of contents crc32, file size, table of contents bytes
+HEADER = struct.Struct("<4sIIxxxxqq")
+# parents entries of a tree: the root, and vertices the tree does not reach
+ROOT = -1
+UNREACHED = -2
+
+
+def _encode(name):
+    return json.dumps(name, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _decode(data):
+    return _tuples(json.loads(data))
+
+
+# the vertex names of a snapshot: names[i] decodes entry i of `data`, once
+# per process, the names searches touch are kept decoded
+class SnapshotNames:
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+        self.decoded = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        decoded = self.decoded
+        if decoded is None:
+            decoded = self.decoded = [None] * (len(self.offsets) - 1)
+        name = decoded[i] if 0 <= i < len(decoded) else None
+        if name is None:
+            if not 0 <= i < len(decoded):
+                raise IndexError(i)
+            name = decoded[i] = _decode(bytes(self.data[self.offsets[i]:self.offsets[i + 1]]))
+        return name
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def encoded(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+
+# name -> id through an open addressing table of ids (-1 for an empty slot),
+# probed linearly from the crc32 of the encoded name
+class SnapshotIds:
+    def __init__(self, names, index):
+        self.names = names
+        self.index = index
+        self.mask = len(index) - 1
+
+    def __len__(self):
+        return len(self.names)
+
+    def get(self, vertex, default=None):
+        try:
+            key = _encode(vertex)
+        except (TypeError, ValueError):
+            return default
+        index, mask, names = self.index, self.mask, self.names
+        slot = zlib.crc32(key) & mask
+        while index[slot] != -1:
+            i = index[slot]
+            if names.encoded(i) == key:
+                return i
+            slot = (slot + 1) & mask
+        return default
+
+    def __getitem__(self, vertex):
+        i = self.get(vertex)
+        if i is None:
+            raise KeyError(vertex)
+        return i
+
+    def __contains__(self, vertex):
+        return self.get(vertex) is not None
+
+
+def _name_index(encoded):
+    size = 8
+    while size < 2 * len(encoded):
+        size *= 2
+    index = array('q', [-1]) * size
+    mask = size - 1
+    for i, key in enumerate(encoded):
+        slot = zlib.crc32(key) & mask
+        while index[slot] != -1:
+            slot = (slot + 1) & mask
+        index[slot] = i
+    return index
+
+
+# Read-only mapping vertex -> data[id] over the vertices that have a value:
+# the ones not NaN, or for the distances of a tree the ones it reaches
+class VertexValues(Mapping):
+    def __init__(self, names, ids, data, parents=None):
+        self.names = names
+        self.ids = ids
+        self.data = data
+        self.parents = parents
+        self.size = None
+
+    def _has(self, i):
+        if self.parents is not None:
+            return self.parents[i] != UNREACHED
+        return not math.isnan(self.data[i])
+
+    def __getitem__(self, vertex):
+        i = self.ids[vertex]
+        if not self._has(i):
+            raise KeyError(vertex)
+        return self.data[i]
+
+    def __contains__(self, vertex):
+        i = self.ids.get(vertex)
+        return i is not None and self._has(i)
+
+    def __iter__(self):
+        names = self.names
+        for i in range(len(names)):
+            if self._has(i):
+                yield names[i]
+
+    def __len__(self):
+        if self.size is None:
+            self.size = sum(1 for i in range(len(self.names)) if self._has(i))
+        return self.size
+
+
+# the parents of a tree: vertex -> parent vertex, None for the root
+class TreeParents(Mapping):
+    def __init__(self, names, ids, parents):
+        self.names = names
+        self.ids = ids
+        self.parents = parents
+        self.size = None
+
+    def __getitem__(self, vertex):
+        parent = self.parents[self.ids[vertex]]
+        if parent == UNREACHED:
+            raise KeyError(vertex)
+        return None if parent == ROOT else self.names[parent]
+
+    def __contains__(self, vertex):
+        i = self.ids.get(vertex)
+        return i is not None and self.parents[i] != UNREACHED
+
+    def __iter__(self):
+        names, parents = self.names, self.parents
+        for i in range(len(names)):
+            if parents[i] != UNREACHED:
+                yield names[i]
+
+    def __len__(self):
+        if self.size is None:
+            self.size = sum(1 for parent in self.parents if parent != UNREACHED)
+        return self.size
+
+
+# a CSRGraph on the arrays of a snapshot, pickled as the snapshot's path
+class SnapshotGraph(CSRGraph):
+    def __init__(self, names, offsets, targets, weights, ids, path, directed):
+        super().__init__(names, offsets, targets, weights, ids, directed)
+        self.path = path
+
+    def __reduce__(self):
+        return _mapped_graph, (self.path,)
+
+
+def _mapped_graph(path):
+    return load_snapshot(path, verify=False).graph
+
+
+class Snapshot:
+    def __init__(self, path, graph, heuristics, trees, landmarks, arrays):
+        self.path = path
+        self.graph = graph
+        self.heuristics = heuristics
+        self.trees = trees
+        self.landmarks = landmarks
+        self.arrays = arrays
+
+    def __reduce__(self):
+        return load_snapshot, (self.path, False)
+
+    # a mutable Graph with the snapshot's edges; its query cache starts
+    # with the stored shortest path trees
+    def to_graph(self):
+        from .dorian import Graph
+        graph = self.graph
+        names, offsets, targets, weights = graph.names, graph.offsets, graph.targets, graph.weights
+        edges = ((names[u], names[targets[k]], weights[k])
+                 for u in range(len(names)) for k in range(offsets[u], offsets[u + 1]))
+        result = Graph.from_edges(edges, vertices=names, directed=graph.directed)
+        if self.trees:
+            cache = result.enable_cache(max_trees=max(16, len(self.trees)))
+            cache.check_version(result.version)
+            for source, tree in self.trees.items():
+                cache.put_tree(source, tree)
+        return result
+
+
+class _Writer:
+    def __init__(self, file):
+        self.file = file
+        self.position = 0
+        self.sections = []
+
+    def section(self, name, buffer, **layout):
+        data = memoryview(buffer if sys.byteorder == "little" else _little_endian(buffer)).cast('B')
+        self.file.write(data)
+        self.sections.append(dict(layout, name=name, offset=self.position, size=len(data),
+                                  crc=zlib.crc32(data)))
+        self.position += len(data)
+        padding = -self.position % 8
+        self.file.write(b"\0" * padding)
+        self.position += padding
+
+    def buffer(self, name, buffer, shape=None):
+        if shape is None:
+            self.section(name, buffer, typecode=_typecode(buffer))
+        else:
+            self.section(name, buffer, typecode=_typecode(buffer), shape=list(shape))
+
+    def ndarray(self, name, values):
+        import numpy
+        values = numpy.ascontiguousarray(values, dtype=numpy.asarray(values).dtype.newbyteorder("<"))
+        self.section(name, values.reshape(-1).view(numpy.uint8), dtype=values.dtype.str,
+                     shape=list(values.shape))
+
+
+def _value(table, vertex):
+    try:
+        return table[vertex]
+    except KeyError:
+        return math.nan
+
+
+# heuristics: {label: heuristic table}; trees: {source: (distances, parents)};
+# arrays: {label: NumPy array, array or memoryview}; directed is taken from
+# the graph, a CSRGraph read by load_binary() does not know it
+def save_snapshot(graph, path, heuristics=None, trees=None, landmarks=None, arrays=None, directed=None):
+    if directed is None:
+        directed = graph.directed
+    if directed is None:
+        raise ValueError("the graph does not say whether it is directed, pass directed=True or False")
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_graph(graph)
+    names, ids = graph.names, graph.ids
+    n = len(names)
+    identity = all(name == i and isinstance(name, int) for i, name in enumerate(names))
+    contents = {"vertices": n, "edges": len(graph.targets), "directed": directed, "identity": identity,
+                "heuristics": [], "trees": [], "landmarks": None, "arrays": []}
+
+    temporary = os.fspath(path) + ".tmp"
+    with open(temporary, "wb") as file:
+        # the table of contents is written last, over this placeholder
+        file.write(b"\0" * HEADER.size)
+        writer = _Writer(file)
+        writer.position = HEADER.size
+
+        if not identity:
+            encoded = []
+            for name in names:
+                key = _encode(name)
+                if _decode(key) != name:
+                    raise ValueError("vertex name %r cannot be stored in a snapshot" % (name,))
+                encoded.append(key)
+            name_offsets = array('q', [0])
+            for key in encoded:
+                name_offsets.append(name_offsets[-1] + len(key))
+            writer.buffer("names.offsets", name_offsets)
+            writer.buffer("names.data", array('B', b"".join(encoded)))
+            writer.buffer("names.index", _name_index(encoded))
+        writer.buffer("offsets", graph.offsets)
+        writer.buffer("targets", graph.targets)
+        writer.buffer("weights", graph.weights)
+
+        for label, table in (heuristics or {}).items():
+            contents["heuristics"].append(label)
+            writer.buffer("heuristic/%d" % (len(contents["heuristics"]) - 1),
+                          array('d', [_value(table, name) for name in names]))
+
+        for source, (distances, parents) in (trees or {}).items():
+            typecode = 'q' if all(isinstance(distance, int) for distance in distances.values()) else 'd'
+            values = array(typecode, [0]) * n
+            tree_parents = array('q', [UNREACHED]) * n
+            for vertex, distance in distances.items():
+                i = ids[vertex]
+                values[i] = distance
+                parent = parents[vertex]
+                tree_parents[i] = ROOT if parent is None else ids[parent]
+            contents["trees"].append(ids[source])
+            number = len(contents["trees"]) - 1
+            writer.buffer("tree/%d/distances" % number, values)
+            writer.buffer("tree/%d/parents" % number, tree_parents)
+
+        if landmarks is not None:
+            if list(landmarks.names) == list(names):
+                distances = landmarks.distances
+            else:
+                positions = [landmarks.ids[name] for name in names]
+                m = len(landmarks.names)
+                distances = array('d', [landmarks.distances[l * m + i]
+                                        for l in range(len(landmarks.landmarks)) for i in positions])
+            contents["landmarks"] = [ids[landmark] for landmark in landmarks.landmarks]
+            writer.buffer("landmarks", distances)
+
+        for label, values in (arrays or {}).items():
+            contents["arrays"].append(label)
+            number = len(contents["arrays"]) - 1
+            if isinstance(values, array):
+                writer.buffer("array/%d" % number, values)
+            elif isinstance(values, memoryview):
+                writer.buffer("array/%d" % number, values, values.shape)
+            else:
+                writer.ndarray("array/%d" % number, values)
+
+        contents["sections"] = writer.sections
+        table = json.dumps(contents).encode("utf-8")
+        file.write(table)
+        size = writer.position + len(table)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, zlib.crc32(table), size, len(table)))
+    # readers that mapped an older snapshot keep it until they let go
+    os.replace(temporary, path)
+
+
+def load_snapshot(path, verify=True):
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(data) < HEADER.size:
+        raise ValueError("%s is not a snapshot" % (path,))
+    magic, version, table_crc, size, table_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("%s is not a version %d snapshot" % (path, FORMAT_VERSION))
+    if size != len(data):
+        raise ValueError("%s is truncated: %d of %d bytes" % (path, len(data), size))
+    if sys.byteorder != "little":
+        raise ValueError("snapshots can only be mapped on little-endian machines")
+    view = memoryview(data)
+    table = view[size - table_size:size]
+    if zlib.crc32(table) != table_crc:
+        raise ValueError("%s: corrupt table of contents" % (path,))
+    contents = json.loads(bytes(table))
+
+    sections = {}
+    for section in contents["sections"]:
+        raw = view[section["offset"]:section["offset"] + section["size"]]
+        if verify and zlib.crc32(raw) != section["crc"]:
+            raise ValueError("%s: checksum mismatch in section %s" % (path, section["name"]))
+        if "dtype" in section:
+            import numpy
+            sections[section["name"]] = numpy.frombuffer(raw, section["dtype"]).reshape(section["shape"])
+        elif "shape" in section:
+            sections[section["name"]] = raw.cast(section["typecode"], section["shape"])
+        else:
+            sections[section["name"]] = raw.cast(section["typecode"])
+
+    n = contents["vertices"]
+    if contents["identity"]:
+        names, ids = range(n), IdentityIds(n)
+    else:
+        names = SnapshotNames(sections["names.offsets"], sections["names.data"])
+        ids = SnapshotIds(names, sections["names.index"])
+    graph = SnapshotGraph(names, sections["offsets"], sections["targets"], sections["weights"], ids,
+                          path, contents["directed"])
+
+    heuristics = {label: VertexValues(names, ids, sections["heuristic/%d" % number])
+                  for number, label in enumerate(contents["heuristics"])}
+    trees = {}
+    for number, source in enumerate(contents["trees"]):
+        parents = sections["tree/%d/parents" % number]
+        trees[names[source]] = (VertexValues(names, ids, sections["tree/%d/distances" % number], parents),
+                                TreeParents(names, ids, parents))
+    landmarks = None
+    if contents["landmarks"] is not None:
+        landmarks = Landmarks(names, [names[i] for i in contents["landmarks"]], sections["landmarks"], ids)
+    arrays = {label: sections["array/%d" % number] for number, label in enumerate(contents["arrays"])}
+    return Snapshot(path, graph, heuristics, trees, landmarks, arrays)
@@ -0,0 +1,120 @@
+# Observers for the search algorithms.
+# Every search takes an optional `tracer`. With the default (None) the hot
+# loops only pay for an `is not None` check; pass a tracer to see what the
+# search is doing:
+#  - Tracer: no-op base class, subclass it and override what you need
+#  - CountingTracer: counters only (expansions, pushes, peak frontier, time)
+#  - PrintTracer: the step by step trace the searches used to print
+#  - DeadlineTracer: aborts a search with SearchCancelled once a deadline
+#    passes or a cancel flag is set
+import time
+
+
+class Tracer:
+    # called once before the first expansion
+    def start(self, algorithm, start_vertex, goal_vertex):
+        pass
+
+    # a vertex is taken from the frontier and expanded
+    def expand(self, vertex):
+        pass
+
+    # a vertex is added to the frontier (priority is None for dfs/bfs)
+    def push(self, vertex, priority=None):
+        pass
+
+    # the frontier after an expansion
+    def frontier(self, frontier):
+        pass
+
+    # called with the search result, None if the goal was not reached
+    def finish(self, result):
+        pass
+
+
+class CountingTracer(Tracer):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.algorithm = None
+        self.expansions = 0
+        self.pushes = 0
+        self.max_frontier = 0
+        self.elapsed = 0.0
+        self.found = False
+        self._started = None
+
+    def start(self, algorithm, start_vertex, goal_vertex):
+        self.reset()
+        self.algorithm = algorithm
+        self._started = time.perf_counter()
+
+    def expand(self, vertex):
+        self.expansions += 1
+
+    def push(self, vertex, priority=None):
+        self.pushes += 1
+
+    def frontier(self, frontier):
+        if len(frontier) > self.max_frontier:
+            self.max_frontier = len(frontier)
+
+    def finish(self, result):
+        self.elapsed = time.perf_counter() - self._started
+        self.found = result is not None
+
+    def stats(self):
+        return {
+            "algorithm": self.algorithm,
+            "expansions": self.expansions,
+            "pushes": self.pushes,
+            "max_frontier": self.max_frontier,
+            "elapsed": self.elapsed,
+            "found": self.found,
+        }
+
+    def __str__(self):
+        return "%s: %d expansions, %d pushes, max frontier %d, %.6fs" % (
+            self.algorithm, self.expansions, self.pushes, self.max_frontier, self.elapsed)
+
+
+class PrintTracer(Tracer):
+    def start(self, algorithm, start_vertex, goal_vertex):
+        self.i = 0
+        self._started = time.perf_counter()
+
+    def expand(self, vertex):
+        self.i += 1
+        print(self.i, ": ", vertex)
+
+    def frontier(self, frontier):
+        print(frontier)
+
+    def finish(self, result):
+        print("elapsed: %.6fs" % (time.perf_counter() - self._started))
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+# deadline is a time.time() value (so it means the same in every process),
+# cancelled an optional callable polled on each expansion
+class DeadlineTracer(Tracer):
+    def __init__(self, deadline=None, cancelled=None):
+        self.deadline = deadline
+        self.cancelled = cancelled
+
+    def expand(self, vertex):
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchCancelled("deadline passed")
+        if self.cancelled is not None and self.cancelled():
+            raise SearchCancelled("cancelled")
+
+
+# report the result to the tracer and hand it back
+def finish(tracer, result):
+    if tracer is not None:
+        tracer.finish(result)
+    return result